@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Benchmark de bout en bout de l'ingestion contre une API locale.
+
+Démarre un serveur HTTP local qui émule l'API paginée `_page`/`_limit`
+(nombre d'enregistrements, taille des payloads, latence, gigue, taux
+d'erreurs 5xx et de 429 configurables), puis exécute
+`fetch_all_pages` → transformation → `write_parquet` pour chaque
+combinaison taille de page × concurrence. Chaque cellule tourne dans un
+sous-processus : le pic mémoire mesuré est celui de la cellule seule.
+
+Les résultats (configuration, versions, débit enregistrements/s et MB/s,
+pic mémoire, retries) sont enregistrés en JSON pour comparer les runs
+entre versions.
+
+Usage:
+    python benchmarks/bench_ingest.py
+    python benchmarks/bench_ingest.py --records 100000 --page-sizes 100 1000 \\
+        --concurrency 1 8 --latency-ms 20 --jitter-ms 10 --error-rate 0.01
+    python benchmarks/bench_ingest.py --transform records --output results.json
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+
+# =============================================================================
+# API locale
+# =============================================================================
+
+
+class PaginatedAPIHandler(BaseHTTPRequestHandler):
+    """Émule `GET /posts?_page=N&_limit=M` façon jsonplaceholder."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        config = self.server.config
+        delay = config["latency_ms"] + random.uniform(-config["jitter_ms"], config["jitter_ms"])
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        roll = random.random()
+        if roll < config["rate_429"]:
+            self._send(429, b"", {"Retry-After": str(config["retry_after"])})
+            return
+        if roll < config["rate_429"] + config["error_rate"]:
+            self._send(503, b"")
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        page = int(query.get("_page", ["1"])[0])
+        limit = int(query.get("_limit", ["10"])[0])
+        self._send(200, self.server.page_body(page, limit), {"Content-Type": "application/json"})
+
+    def _send(self, status: int, body: bytes, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class PaginatedAPIServer(ThreadingHTTPServer):
+    """Serveur local ; les pages sont sérialisées une fois puis réutilisées."""
+
+    daemon_threads = True
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        super().__init__(("127.0.0.1", 0), PaginatedAPIHandler)
+        self.config = config
+        self._pages: dict[tuple[int, int], bytes] = {}
+        self._lock = threading.Lock()
+
+    def page_body(self, page: int, limit: int) -> bytes:
+        key = (page, limit)
+        with self._lock:
+            body = self._pages.get(key)
+        if body is None:
+            first = (page - 1) * limit + 1
+            last = min(page * limit, self.config["records"])
+            filler = "x" * self.config["body_bytes"]
+            body = json.dumps(
+                [
+                    {"id": i, "userId": i % 10 + 1, "title": f"title {i}", "body": filler}
+                    for i in range(first, last + 1)
+                ]
+            ).encode()
+            with self._lock:
+                self._pages[key] = body
+        return body
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/posts"
+
+
+# =============================================================================
+# Cellule du benchmark (sous-processus)
+# =============================================================================
+
+
+def run_cell(cell: dict[str, Any]) -> dict[str, Any]:
+    """Exécute fetch → transform → write une fois et mesure chaque étape."""
+    import logging
+
+    from ingest_api import (
+        RetryBudget,
+        fetch_all_pages,
+        transform_data,
+        transform_to_table,
+        write_parquet,
+    )
+    from pipeline_metrics import PipelineMetrics, peak_rss_mb
+
+    logging.getLogger("ingest_api").setLevel(logging.WARNING)
+
+    metrics = PipelineMetrics()
+    budget = RetryBudget()
+
+    with metrics.stage("fetch"):
+        data = fetch_all_pages(
+            cell["url"],
+            page_size=cell["page_size"],
+            concurrency=cell["concurrency"],
+            budget=budget,
+            metrics=metrics,
+        )
+    with metrics.stage("transform"):
+        if cell["transform"] == "records":
+            records = transform_data(data)
+        else:
+            records = transform_to_table(data)
+    with metrics.stage("write"):
+        output_file = write_parquet(records, cell["output_dir"], "2024-01-01")
+
+    snapshot = metrics.snapshot()
+    return {
+        "records": len(data),
+        "wall_seconds": snapshot["wall_seconds"],
+        "bytes_downloaded": snapshot["stages"]["fetch"].get("bytes", 0),
+        "bytes_written": Path(output_file).stat().st_size if output_file else 0,
+        "requests": snapshot["stages"]["fetch"].get("requests", 0),
+        "retries": budget.snapshot()["retries"],
+        "stages": {
+            name: {"wall_seconds": values["wall_seconds"], "cpu_seconds": values["cpu_seconds"]}
+            for name, values in snapshot["stages"].items()
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def bench_cell(cell: dict[str, Any]) -> dict[str, Any]:
+    """Lance une cellule dans un sous-processus et calcule les débits."""
+    completed = subprocess.run(
+        [sys.executable, __file__, "--cell", json.dumps(cell)],
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        return {"status": "error", "error": completed.stderr.strip().splitlines()[-1:]}
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    wall = result["wall_seconds"]
+    result["status"] = "success"
+    result["records_per_second"] = round(result["records"] / wall, 1) if wall else None
+    result["mb_per_second"] = (
+        round(result["bytes_downloaded"] / wall / 1024 / 1024, 3) if wall else None
+    )
+    return result
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse les arguments CLI."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=50_000)
+    parser.add_argument("--body-bytes", type=int, default=200, help="Taille du champ body")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--jitter-ms", type=float, default=2.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Part de réponses 503")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Part de réponses 429")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After des 429 (s)")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument(
+        "--transform",
+        choices=["columnar", "records"],
+        default="columnar",
+        help="columnar = transform_to_table (chemin de ingest), records = transform_data",
+    )
+    parser.add_argument(
+        "--output",
+        help=f"Fichier JSON des résultats (default: {DEFAULT_RESULTS_DIR}/bench_ingest_<ts>.json)",
+    )
+    parser.add_argument("--cell", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def git_revision() -> str | None:
+    """Commit courant, pour comparer les résultats entre versions."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.cell:
+        print(json.dumps(run_cell(json.loads(args.cell))))
+        return
+
+    import pyarrow
+
+    server_config = {
+        "records": args.records,
+        "body_bytes": args.body_bytes,
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "rate_429": args.rate_429,
+        "retry_after": args.retry_after,
+    }
+    server = PaginatedAPIServer(server_config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    cells = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for page_size in args.page_sizes:
+                for concurrency in args.concurrency:
+                    cell = {
+                        "url": server.url,
+                        "page_size": page_size,
+                        "concurrency": concurrency,
+                        "transform": args.transform,
+                        "output_dir": str(Path(tmp) / f"{page_size}_{concurrency}"),
+                    }
+                    result = bench_cell(cell)
+                    cells.append({"page_size": page_size, "concurrency": concurrency, **result})
+                    print(
+                        json.dumps(
+                            {
+                                "page_size": page_size,
+                                "concurrency": concurrency,
+                                "records_per_second": result.get("records_per_second"),
+                                "mb_per_second": result.get("mb_per_second"),
+                                "peak_rss_mb": result.get("peak_rss_mb"),
+                                "status": result["status"],
+                            }
+                        ),
+                        file=sys.stderr,
+                    )
+    finally:
+        server.shutdown()
+
+    report = {
+        "benchmark": "bench_ingest",
+        "created_at": datetime.utcnow().isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "pyarrow": pyarrow.__version__,
+        "server": server_config,
+        "transform": args.transform,
+        "cells": cells,
+    }
+
+    output = Path(args.output) if args.output else (
+        DEFAULT_RESULTS_DIR / f"bench_ingest_{datetime.utcnow():%Y%m%d_%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(json.dumps({"output": str(output), "cells": len(cells)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark des profils de layout Parquet.
+
+Écrit le même jeu d'enregistrements avec chaque profil de
+`PARQUET_PROFILES` puis compare la taille du fichier, le temps d'écriture
+et le temps de lecture : scan complet, recherche d'un `id` et filtre sur
+un `userId` (élagage des row groups par les statistiques).
+
+Usage:
+    python benchmarks/bench_parquet_layouts.py
+    python benchmarks/bench_parquet_layouts.py --records 2000000 --users 5000 --lookups 50
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ingest_api import (  # noqa: E402
+    PARQUET_PROFILES,
+    transform_to_table,
+    write_parquet,
+)
+
+
+def make_records(n: int, users: int) -> list[dict]:
+    """Génère n enregistrements, ids croissants et userId aléatoires."""
+    rng = random.Random(42)
+    return [
+        {
+            "id": i,
+            "userId": rng.randint(1, users),
+            "title": f"title {i}",
+            "body": "lorem ipsum dolor sit amet " * 4,
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def timed(func, repeat: int) -> float:
+    """Retourne le meilleur temps (secondes) sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_profile(table, profile: str, output_dir: str, args: argparse.Namespace) -> dict:
+    """Mesure écriture, taille et lectures filtrées pour un profil."""
+    start = time.perf_counter()
+    path = write_parquet(table, output_dir, "2024-01-01", profile)
+    write_seconds = time.perf_counter() - start
+
+    rng = random.Random(7)
+    ids = [rng.randint(1, args.records) for _ in range(args.lookups)]
+    users = [rng.randint(1, args.users) for _ in range(args.lookups)]
+
+    def lookups(column: str, values: list[int]) -> None:
+        for value in values:
+            pq.read_table(path, filters=[(column, "=", value)])
+
+    metadata = pq.ParquetFile(path).metadata
+    return {
+        "size_mb": round(Path(path).stat().st_size / 1024 / 1024, 2),
+        "row_groups": metadata.num_row_groups,
+        "write_seconds": round(write_seconds, 4),
+        "full_scan_seconds": round(timed(lambda: pq.read_table(path), args.repeat), 4),
+        "id_lookup_ms": round(
+            timed(lambda: lookups("id", ids), args.repeat) / args.lookups * 1000, 3
+        ),
+        "user_filter_ms": round(
+            timed(lambda: lookups("userId", users), args.repeat) / args.lookups * 1000, 3
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--lookups", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        choices=sorted(PARQUET_PROFILES),
+        default=list(PARQUET_PROFILES),
+    )
+    args = parser.parse_args()
+
+    table = transform_to_table(make_records(args.records, args.users))
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in args.profiles:
+            results[profile] = bench_profile(table, profile, str(Path(tmp) / profile), args)
+
+    print(json.dumps({"records": args.records, "users": args.users, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
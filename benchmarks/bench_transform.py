@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de la transformation des enregistrements.
+
+Compare le chemin historique (`transform_data` : un dict par
+enregistrement puis DataFrame pandas) au chemin colonnaire
+(`transform_to_table` : colonnes Arrow typées, métadonnées en dictionnaire).
+
+Usage:
+    python benchmarks/bench_transform.py
+    python benchmarks/bench_transform.py --records 1000000 --repeat 3
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ingest_api import transform_data, transform_to_table  # noqa: E402
+
+
+def make_records(n: int) -> list[dict]:
+    """Génère n enregistrements au format de l'API jsonplaceholder."""
+    return [
+        {
+            "id": i,
+            "userId": i % 10 + 1,
+            "title": f"title {i}",
+            "body": "lorem ipsum dolor sit amet " * 4,
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def run_records(data: list[dict]) -> int:
+    """Chemin historique : dicts puis DataFrame (inférence de types pandas)."""
+    return len(pd.DataFrame(transform_data(data)))
+
+
+def run_columnar(data: list[dict]) -> int:
+    """Chemin colonnaire : table Arrow typée."""
+    return transform_to_table(data).num_rows
+
+
+def bench(func, data: list[dict], repeat: int) -> float:
+    """Retourne le meilleur temps (secondes) sur `repeat` exécutions."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = make_records(args.records)
+
+    results = {}
+    for name, func in (("records", run_records), ("columnar", run_columnar)):
+        seconds = bench(func, data, args.repeat)
+        results[name] = {
+            "seconds": round(seconds, 4),
+            "records_per_second": round(args.records / seconds),
+        }
+
+    results["speedup"] = round(
+        results["records"]["seconds"] / results["columnar"]["seconds"], 2
+    )
+    print(json.dumps({"records": args.records, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
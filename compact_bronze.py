@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Compaction des petits fichiers Parquet de la couche bronze.
+
+Chaque run d'ingestion ajoute un fichier `data_<timestamp>.parquet` dans
+la partition : les relances et les plannings fréquents multiplient les
+petits fichiers, ce qui ralentit tous les lecteurs (validation, dbt/DuckDB).
+Ce script fusionne les fichiers d'une partition en fichiers de taille
+cible, déduplique par `id` (la ligne au `_ingested_at` le plus récent est
+conservée) et remplace la partition de façon atomique.
+
+Usage:
+    python compact_bronze.py --date 2024-01-01
+    python compact_bronze.py --start-date 2024-01-01 --end-date 2024-01-31 --target-size-mb 256
+    python compact_bronze.py --all --dry-run
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from ingest_api import (
+    DEFAULT_PARQUET_PROFILE,
+    OUTPUT_SCHEMA,
+    PARQUET_PROFILES,
+    apply_layout,
+    expand_dates,
+    parquet_write_options,
+)
+from pipeline_logging import setup_logging
+
+# =============================================================================
+# Configuration du logging
+# =============================================================================
+
+logger = setup_logging("compact_bronze")
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+DEFAULT_INPUT_DIR = "./data/bronze"
+DEFAULT_TARGET_SIZE_MB = 128
+PARTITION_PREFIX = "partition_date="
+
+
+# =============================================================================
+# Fonctions de compaction
+# =============================================================================
+
+
+def list_data_files(partition_dir: Path) -> list[Path]:
+    """Fichiers Parquet visibles d'une partition (hors fichiers cachés/temporaires)."""
+    return sorted(
+        path
+        for path in partition_dir.glob("*.parquet")
+        if not path.name.startswith((".", "_"))
+    )
+
+
+def read_partition(files: list[Path]) -> pa.Table:
+    """
+    Lit et concatène les fichiers d'une partition.
+
+    Les schémas sont unifiés : un ancien fichier écrit par pandas (id en
+    float à cause d'un null, colonne absente...) reste lisible avec les
+    fichiers plus récents. Les colonnes connues reprennent les types de
+    `OUTPUT_SCHEMA`.
+    """
+    tables = [pq.read_table(path) for path in files]
+    schema = pa.unify_schemas([table.schema for table in tables], promote_options="permissive")
+    schema = pa.schema(
+        [
+            OUTPUT_SCHEMA.field(field.name) if field.name in OUTPUT_SCHEMA.names else field
+            for field in schema
+        ]
+    )
+    aligned = []
+    for table in tables:
+        for field in schema:
+            if field.name not in table.column_names:
+                table = table.append_column(field, pa.nulls(table.num_rows, field.type))
+        aligned.append(table.select(schema.names).cast(schema))
+    return pa.concat_tables(aligned)
+
+
+def deduplicate(table: pa.Table, key: str = "id", order_by: str = "_ingested_at") -> pa.Table:
+    """
+    Garde une ligne par `key`, celle dont `order_by` est le plus récent.
+
+    Le résultat est trié par `key`. Les lignes sans `key` sont toutes
+    conservées (elles ne peuvent pas être rapprochées).
+    """
+    if key not in table.column_names or table.num_rows < 2:
+        return table
+
+    sort_keys = [(key, "ascending")]
+    if order_by in table.column_names:
+        sort_keys.append((order_by, "descending"))
+    table = table.sort_by(sort_keys)
+
+    ids = table[key].combine_chunks()
+    # Première ligne de chaque groupe d'id (les nulls, triés en fin, sont gardés)
+    is_new = pc.fill_null(pc.not_equal(ids.slice(1), ids.slice(0, len(ids) - 1)), True)
+    mask = pa.concat_arrays([pa.array([True]), is_new])
+    return table.filter(mask)
+
+
+def write_compacted(
+    table: pa.Table,
+    output_dir: Path,
+    rows_per_file: int,
+    timestamp: str,
+    profile: str = DEFAULT_PARQUET_PROFILE,
+) -> list[Path]:
+    """Écrit la table en fichiers d'au plus `rows_per_file` lignes."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    table = apply_layout(table, profile)
+    options = parquet_write_options(table.schema, profile)
+    files = []
+    for index, offset in enumerate(range(0, max(table.num_rows, 1), rows_per_file)):
+        path = output_dir / f"data_{timestamp}_part{index:05d}.parquet"
+        pq.write_table(
+            table.slice(offset, rows_per_file),
+            path,
+            row_group_size=PARQUET_PROFILES[profile].get("row_group_size"),
+            **options,
+        )
+        files.append(path)
+    return files
+
+
+def carry_over(source: Path, target: Path, known: set[str]) -> None:
+    """Déplace dans `target` les fichiers de données de `source` absents de `known`."""
+    for path in list_data_files(source):
+        if path.name not in known:
+            logger.warning("Carrying over file written during compaction: %s", path.name)
+            os.rename(path, target / path.name)
+
+
+def swap_partition(partition_dir: Path, staging_dir: Path, input_files: list[Path]) -> None:
+    """
+    Remplace la partition par le répertoire compacté.
+
+    Deux renommages dans le même répertoire parent. Entre les deux, la
+    partition est brièvement absente : un lecteur peut recevoir
+    FileNotFoundError (et doit réessayer), une écriture d'ingestion échoue
+    sans avancer son watermark. Les fichiers arrivés dans l'ancienne
+    partition pendant la compaction, échange compris, sont déplacés dans
+    la nouvelle avant la suppression de l'ancienne.
+    """
+    known = {path.name for path in input_files}
+    backup_dir = partition_dir.with_name(f".{partition_dir.name}.old")
+    if backup_dir.exists():
+        shutil.rmtree(backup_dir)
+
+    os.rename(partition_dir, backup_dir)
+    try:
+        # Partition recréée entre les deux renommages (mkdir d'une ingestion)
+        if partition_dir.exists():
+            for path in partition_dir.iterdir():
+                os.rename(path, staging_dir / path.name)
+            partition_dir.rmdir()
+        os.rename(staging_dir, partition_dir)
+    except BaseException:
+        os.rename(backup_dir, partition_dir)
+        raise
+
+    # Relu après l'échange : les chemins de la partition désignent la nouvelle
+    carry_over(backup_dir, partition_dir, known)
+    shutil.rmtree(backup_dir)
+
+
+def compact_partition(
+    partition_dir: Path,
+    target_size_mb: float = DEFAULT_TARGET_SIZE_MB,
+    dry_run: bool = False,
+    force: bool = False,
+    profile: str = DEFAULT_PARQUET_PROFILE,
+) -> dict[str, Any]:
+    """
+    Compacte une partition Hive `partition_date=YYYY-MM-DD`.
+
+    Args:
+        partition_dir: Répertoire de la partition
+        target_size_mb: Taille cible des fichiers compactés
+        dry_run: Calcule le résultat sans rien écrire
+        force: Compacte même une partition d'un seul fichier
+        profile: Profil de layout Parquet des fichiers compactés
+
+    Returns:
+        Dict avec les statistiques de compaction de la partition
+    """
+    files = list_data_files(partition_dir)
+    bytes_in = sum(path.stat().st_size for path in files)
+    result: dict[str, Any] = {
+        "partition": partition_dir.name,
+        "input_files": len(files),
+        "bytes_in": bytes_in,
+    }
+
+    if not files or (len(files) == 1 and not force):
+        result["status"] = "skipped"
+        return result
+
+    table = read_partition(files)
+    compacted = deduplicate(table)
+
+    # Taille compressée moyenne d'une ligne, mesurée sur les fichiers d'entrée
+    bytes_per_row = bytes_in / max(table.num_rows, 1)
+    rows_per_file = max(1, int(target_size_mb * 1024 * 1024 / max(bytes_per_row, 1)))
+
+    result.update(
+        {
+            "rows_in": table.num_rows,
+            "rows_out": compacted.num_rows,
+            "duplicates_removed": table.num_rows - compacted.num_rows,
+            "output_files": max(1, -(-compacted.num_rows // rows_per_file)),
+        }
+    )
+
+    if dry_run:
+        result["status"] = "dry_run"
+        return result
+
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    staging_dir = partition_dir.with_name(f".{partition_dir.name}.compact")
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir)
+
+    try:
+        written = write_compacted(compacted, staging_dir, rows_per_file, timestamp, profile)
+        swap_partition(partition_dir, staging_dir, files)
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    result["output_files"] = len(written)
+    result["bytes_out"] = sum(
+        (partition_dir / path.name).stat().st_size for path in written
+    )
+    result["status"] = "compacted"
+
+    logger.info(
+        "Compacted %s: %d -> %d files",
+        partition_dir.name,
+        len(files),
+        len(written),
+        extra={"duplicates_removed": result["duplicates_removed"]},
+    )
+    return result
+
+
+def find_partitions(
+    input_dir: str,
+    dates: list[str] | None = None,
+) -> list[Path]:
+    """Partitions à compacter : toutes, ou celles des dates demandées."""
+    root = Path(input_dir)
+    if dates is None:
+        return sorted(
+            path
+            for path in root.glob(f"{PARTITION_PREFIX}*")
+            if path.is_dir()
+        )
+    return [
+        root / f"{PARTITION_PREFIX}{day}"
+        for day in dates
+        if (root / f"{PARTITION_PREFIX}{day}").is_dir()
+    ]
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse les arguments CLI."""
+    parser = argparse.ArgumentParser(
+        description="Compaction des petits fichiers Parquet de la couche bronze",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemples:
+  python compact_bronze.py --date 2024-01-01
+  python compact_bronze.py --start-date 2024-01-01 --end-date 2024-01-31
+  python compact_bronze.py --all --target-size-mb 256 --dry-run
+  python compact_bronze.py --all --parquet-profile scan-optimized
+
+Ne pas lancer pendant une ingestion de la même partition : planifier la
+compaction après l'ingestion (ex. tâche Airflow en aval).
+        """,
+    )
+
+    parser.add_argument(
+        "--input-dir",
+        default=DEFAULT_INPUT_DIR,
+        help=f"Racine de la couche bronze (default: {DEFAULT_INPUT_DIR})",
+    )
+    parser.add_argument("--date", help="Partition à compacter (YYYY-MM-DD)")
+    parser.add_argument("--start-date", help="Date de début (YYYY-MM-DD)")
+    parser.add_argument("--end-date", help="Date de fin (YYYY-MM-DD)")
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Compacter toutes les partitions",
+    )
+    parser.add_argument(
+        "--target-size-mb",
+        type=float,
+        default=DEFAULT_TARGET_SIZE_MB,
+        help=f"Taille cible des fichiers compactés (default: {DEFAULT_TARGET_SIZE_MB})",
+    )
+    parser.add_argument(
+        "--parquet-profile",
+        choices=sorted(PARQUET_PROFILES),
+        default=DEFAULT_PARQUET_PROFILE,
+        help=f"Layout des fichiers compactés (default: {DEFAULT_PARQUET_PROFILE})",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Compacter aussi les partitions d'un seul fichier (déduplication)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Afficher ce qui serait fait sans rien modifier",
+    )
+
+    args = parser.parse_args()
+
+    if args.all and (args.date or args.start_date or args.end_date):
+        parser.error("--all cannot be combined with --date or --start-date/--end-date")
+    if args.date:
+        if args.start_date or args.end_date:
+            parser.error("--date cannot be combined with --start-date/--end-date")
+        args.start_date = args.end_date = args.date
+    elif not args.all and not (args.start_date and args.end_date):
+        parser.error("one of --date, --start-date/--end-date or --all is required")
+
+    return args
+
+
+def main() -> None:
+    """Point d'entrée principal."""
+    args = parse_args()
+
+    try:
+        dates = None if args.all else expand_dates(args.start_date, args.end_date)
+        partitions = find_partitions(args.input_dir, dates)
+        logger.info("Found %d partitions to inspect", len(partitions))
+
+        results = []
+        for partition_dir in partitions:
+            try:
+                results.append(
+                    compact_partition(
+                        partition_dir,
+                        target_size_mb=args.target_size_mb,
+                        dry_run=args.dry_run,
+                        force=args.force,
+                        profile=args.parquet_profile,
+                    )
+                )
+            except Exception as e:
+                logger.exception("Compaction failed for %s", partition_dir.name)
+                results.append(
+                    {"partition": partition_dir.name, "status": "error", "error": str(e)}
+                )
+
+        failed = [r for r in results if r["status"] == "error"]
+        result = {
+            "status": "error" if failed else "success",
+            "partitions_count": len(results),
+            "compacted_count": sum(r["status"] == "compacted" for r in results),
+            "duplicates_removed": sum(r.get("duplicates_removed", 0) for r in results),
+            "partitions": results,
+            "compacted_at": datetime.utcnow().isoformat(),
+        }
+        print(json.dumps(result))
+
+    except Exception as e:
+        logger.exception("Compaction failed")
+        print(json.dumps({"status": "error", "error": str(e)}))
+        sys.exit(1)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,68 +8,782 @@ et les écrit en format Parquet partitionné par date.
 Usage:
     python ingest_api.py --start-date 2024-01-01 --end-date 2024-01-31
     python ingest_api.py --start-date 2024-01-01 --end-date 2024-01-01 --output-dir ./data/bronze
+    python ingest_api.py --date 2024-01-01 --state-file state.json
+    python ingest_api.py --start-date 2024-01-01 --end-date 2024-01-31 --workers 4
 """
 import argparse
+import email.utils
+import fcntl
+import hashlib
+import inspect
 import json
 import logging
+import os
+import queue
 import sys
-from datetime import datetime
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
+from urllib.parse import quote
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+try:
+    import msgspec
+except ImportError:  # décodage rapide optionnel
+    msgspec = None
 from tenacity import (
+    RetryCallState,
     retry,
-    retry_if_exception_type,
+    retry_if_exception,
     stop_after_attempt,
     wait_exponential,
 )
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError, SSLError
+
+from pipeline_logging import set_sampling, setup_logging
+from pipeline_metrics import PipelineMetrics, merge_metrics, peak_rss_mb, write_prometheus
 
 # =============================================================================
 # Configuration du logging
 # =============================================================================
 
+logger = setup_logging("ingest_api")
+
+# Messages par page : échantillonnés en CLI (--log-page-every)
+page_logger = logging.getLogger("ingest_api.pages")
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+DEFAULT_API_URL = "https://jsonplaceholder.typicode.com/posts"
+DEFAULT_OUTPUT_DIR = "./data/bronze"
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_PAGINATION = "offset"
+PAGINATION_MODES = ("offset", "cursor", "link", "keyset")
+DEFAULT_CONCURRENCY = 1
+DEFAULT_QUEUE_SIZE = 4
+DEFAULT_WORKERS = 1
+DEFAULT_LOG_PAGE_EVERY = 10
+DEFAULT_CACHE_MAX_MB = 512
+DEFAULT_CACHE_MAX_AGE_HOURS = 24 * 7
+MAX_RETRIES = 3
+DEFAULT_RETRY_BUDGET_RATIO = 0.2
+DEFAULT_RETRY_BUDGET_MIN = 10
+MAX_RETRY_AFTER_SECONDS = 60
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+DEFAULT_SOURCE = "jsonplaceholder"
+SCHEMA_VERSION = "1.0"
+
+# Champs conservés depuis le payload de l'API
+RAW_SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("userId", pa.int64()),
+        ("title", pa.string()),
+        ("body", pa.string()),
+    ]
+)
+
+# Schéma de sortie explicite : en mode streaming, chaque row group doit
+# avoir exactement le même schéma, quel que soit le contenu de la page.
+OUTPUT_SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("userId", pa.int64()),
+        ("title", pa.string()),
+        ("body", pa.string()),
+        ("_ingested_at", pa.string()),
+        ("_source", pa.string()),
+        ("_schema_version", pa.string()),
+        ("_partition_date", pa.string()),
+    ]
+)
 
-class JsonFormatter(logging.Formatter):
-    """Formateur JSON pour logs structurés."""
+# Colonnes à faible cardinalité : encodage dictionnaire utile
+LOW_CARDINALITY_COLUMNS = ["userId", "_ingested_at", "_source", "_schema_version", "_partition_date"]
+
+# Profils de layout Parquet. "default" reproduit l'écriture historique
+# (snappy, ordre d'arrivée, row groups par défaut).
+DEFAULT_PARQUET_PROFILE = "default"
+PARQUET_PROFILES: dict[str, dict[str, Any]] = {
+    "default": {
+        "compression": "snappy",
+    },
+    # Lectures analytiques (dbt/DuckDB) : gros row groups, zstd, lignes
+    # regroupées par utilisateur pour élaguer sur userId et id.
+    "scan-optimized": {
+        "compression": "zstd",
+        "compression_level": 3,
+        "row_group_size": 128 * 1024,
+        "sort_by": [("userId", "ascending"), ("id", "ascending")],
+        "dictionary_columns": LOW_CARDINALITY_COLUMNS,
+    },
+    # Recherches ponctuelles par id : petits row groups triés, index de
+    # pages et bloom filter sur id.
+    "lookup-optimized": {
+        "compression": "zstd",
+        "compression_level": 1,
+        "row_group_size": 16 * 1024,
+        "sort_by": [("id", "ascending")],
+        "dictionary_columns": LOW_CARDINALITY_COLUMNS,
+        "bloom_filter_columns": ["id"],
+        "write_page_index": True,
+    },
+    # Stockage froid : taille minimale, débit de lecture secondaire.
+    "archive": {
+        "compression": "zstd",
+        "compression_level": 9,
+        "row_group_size": 1024 * 1024,
+        "sort_by": [("id", "ascending")],
+        "dictionary_columns": LOW_CARDINALITY_COLUMNS,
+    },
+}
+
+# Les bloom filters ne sont écrits que par les versions récentes de pyarrow
+SUPPORTS_BLOOM_FILTERS = "bloom_filter_options" in inspect.signature(pq.write_table).parameters
 
-    def format(self, record: logging.LogRecord) -> str:
-        log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "level": record.levelname,
-            "logger": record.name,
-            "message": record.getMessage(),
-            "module": record.module,
-            "function": record.funcName,
+
+# =============================================================================
+# Session HTTP
+# =============================================================================
+
+
+class CircuitOpenError(RuntimeError):
+    """Levée quand le budget de retries du run est épuisé (fail fast)."""
+
+
+class RetryBudget:
+    """
+    Budget de retries partagé par toutes les requêtes d'un run.
+
+    Un retry n'est accordé que tant que le nombre total de retries reste
+    sous max(min_retries, ratio * requêtes émises). Une fois le budget
+    épuisé, le disjoncteur s'ouvre : toutes les requêtes suivantes échouent
+    immédiatement au lieu d'enchaîner des backoffs sur une source dégradée.
+    """
+
+    def __init__(
+        self,
+        ratio: float = DEFAULT_RETRY_BUDGET_RATIO,
+        min_retries: int = DEFAULT_RETRY_BUDGET_MIN,
+    ) -> None:
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+        self.open = False
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        """Compte une tentative ; lève CircuitOpenError si le disjoncteur est ouvert."""
+        with self._lock:
+            if self.open:
+                raise CircuitOpenError(
+                    f"Retry budget exhausted after {self.retries} retries "
+                    f"for {self.requests} requests"
+                )
+            self.requests += 1
+
+    def allow_retry(self) -> bool:
+        """Consomme un retry si le budget le permet, sinon ouvre le disjoncteur."""
+        with self._lock:
+            if self.open:
+                return False
+            if self.retries < max(self.min_retries, self.ratio * self.requests):
+                self.retries += 1
+                return True
+            self.open = True
+        logger.error(
+            "Retry budget exhausted, failing fast",
+            extra={"requests": self.requests, "retries": self.retries},
+        )
+        return False
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "circuit_open": self.open,
+            }
+
+
+class AdaptiveLimiter:
+    """
+    Limiteur client : token bucket + fenêtre de concurrence AIMD.
+
+    - le token bucket plafonne le débit à `rate` requêtes/s (si défini) ;
+    - la fenêtre de concurrence augmente d'environ 1 par fenêtre de
+      succès (additive increase) et est divisée par 2 sur 429/5xx, erreur
+      réseau ou latence au-dessus de `latency_target` (multiplicative
+      decrease, au plus une fois par latence observée) ;
+    - un `Retry-After` suspend toutes les requêtes jusqu'à l'échéance.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        rate: float | None = None,
+        latency_target: float | None = None,
+        min_concurrency: int = 1,
+    ) -> None:
+        self.max_concurrency = max(max_concurrency, 1)
+        self.min_concurrency = min(min_concurrency, self.max_concurrency)
+        self.limit = float(self.max_concurrency)
+        self.rate = rate
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self.throttled = 0
+        self._tokens = float(max(rate or 1, 1))
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._decreased_at = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Bloque jusqu'à obtenir une place de concurrence et un jeton."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    self._cond.wait(self._paused_until - now)
+                    continue
+                if self.in_flight >= int(self.limit):
+                    self._cond.wait()
+                    continue
+                if self.rate:
+                    burst = max(self.rate, 1)
+                    self._tokens = min(
+                        burst, self._tokens + (now - self._refilled_at) * self.rate
+                    )
+                    self._refilled_at = now
+                    if self._tokens < 1:
+                        self._cond.wait((1 - self._tokens) / self.rate)
+                        continue
+                    self._tokens -= 1
+                self.in_flight += 1
+                return
+
+    def release(
+        self,
+        status: int | None,
+        latency: float,
+        retry_after: float | None = None,
+    ) -> None:
+        """Libère la place et ajuste la fenêtre selon le résultat de la requête."""
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            congested = (
+                status is None
+                or status == 429
+                or status >= 500
+                or (self.latency_target is not None and latency > self.latency_target)
+            )
+            if congested:
+                self.throttled += 1
+                if now - self._decreased_at > latency:
+                    self.limit = max(self.min_concurrency, self.limit / 2)
+                    self._decreased_at = now
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._cond:
+            return {"concurrency_limit": round(self.limit, 2), "throttled": self.throttled}
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Convertit un en-tête Retry-After (secondes ou date HTTP) en secondes."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = when.timestamp() - time.time()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
+class ThrottledAdapter(HTTPAdapter):
+    """Adaptateur requests qui fait passer chaque requête réseau par un limiteur."""
+
+    def __init__(self, limiter: AdaptiveLimiter | None = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.limiter = limiter
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        if self.limiter is None:
+            return super().send(request, **kwargs)
+
+        self.limiter.acquire()
+        started = time.monotonic()
+        status = None
+        retry_after = None
+        try:
+            response = super().send(request, **kwargs)
+            status = response.status_code
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            return response
+        finally:
+            self.limiter.release(status, time.monotonic() - started, retry_after)
+
+    def build_response(self, req: requests.PreparedRequest, resp: Any) -> requests.Response:
+        """
+        Lit le corps et note sa taille sur le réseau (`wire_bytes`).
+
+        `len(response.content)` est la taille décompressée (gzip, br) ;
+        `read()` d'urllib3 compte les octets reçus avant décodage, réponses
+        chunked comprises (ce que ne fait pas la lecture par `iter_content`).
+        Les erreurs de lecture sont converties comme le fait `iter_content`
+        pour rester des `RequestException` (retries).
+        """
+        response = super().build_response(req, resp)
+        try:
+            response._content = resp.read(decode_content=True) or b""
+        except ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e, response=response)
+        except DecodeError as e:
+            raise requests.exceptions.ContentDecodingError(e, response=response)
+        except ReadTimeoutError as e:
+            raise requests.ConnectionError(e, response=response)
+        except SSLError as e:
+            raise requests.exceptions.SSLError(e, response=response)
+        response._content_consumed = True
+        response.wire_bytes = resp.tell()
+        return response
+
+
+class ResponseCache:
+    """
+    Cache disque des réponses HTTP GET, indexé par URL.
+
+    Chaque entrée est un couple `<sha256(url)>.body` / `<sha256(url)>.json`
+    (métadonnées : ETag, Last-Modified, Cache-Control, en-têtes utiles).
+    La date de modification du fichier body sert d'horodatage de dernier
+    accès pour l'éviction LRU.
+
+    Les écritures passent par un fichier temporaire + rename : plusieurs
+    threads ou processus peuvent partager le même répertoire.
+    """
+
+    # En-têtes conservés pour reconstruire une réponse servie depuis le disque
+    KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control", "Link")
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024,
+        max_age_seconds: float = DEFAULT_CACHE_MAX_AGE_HOURS * 3600,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stored": 0}
+        self._lock = threading.Lock()
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def record(self, stat: str) -> None:
+        """Incrémente un compteur de `stats` (thread-safe)."""
+        with self._lock:
+            self.stats[stat] += 1
+
+    def lookup(self, url: str) -> dict[str, Any] | None:
+        """Retourne les métadonnées de l'entrée, ou None si absente."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not body_path.exists():
+            return None
+        return meta
+
+    def is_fresh(self, meta: dict[str, Any]) -> bool:
+        """Vrai si `Cache-Control: max-age` autorise à servir sans revalider."""
+        max_age = _max_age(meta["headers"].get("Cache-Control", ""))
+        return max_age is not None and time.time() - meta["stored_at"] < max_age
+
+    @staticmethod
+    def conditional_headers(meta: dict[str, Any]) -> dict[str, str]:
+        """En-têtes If-None-Match / If-Modified-Since pour revalider l'entrée."""
+        headers = {}
+        if meta["headers"].get("ETag"):
+            headers["If-None-Match"] = meta["headers"]["ETag"]
+        if meta["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+        return headers
+
+    def read(self, url: str) -> bytes:
+        """Lit le corps d'une entrée et la marque comme récemment utilisée."""
+        _, body_path = self._paths(url)
+        body = body_path.read_bytes()
+        os.utime(body_path)
+        return body
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """Enregistre une réponse 200 si elle porte un validateur ou un max-age."""
+        headers = {
+            name: response.headers[name]
+            for name in self.KEPT_HEADERS
+            if name in response.headers
+        }
+        cacheable = (
+            "ETag" in headers
+            or "Last-Modified" in headers
+            or _max_age(headers.get("Cache-Control", "")) is not None
+        )
+        if not cacheable or "no-store" in headers.get("Cache-Control", ""):
+            return
+
+        meta_path, body_path = self._paths(url)
+        meta = {
+            "url": url,
+            "headers": headers,
+            "stored_at": time.time(),
+            "size": len(response.content),
         }
-        if record.exc_info:
-            log_entry["exception"] = self.formatException(record.exc_info)
-        return json.dumps(log_entry)
+        _atomic_write_bytes(body_path, response.content)
+        _atomic_write_bytes(meta_path, json.dumps(meta).encode())
+        self.record("stored")
+
+    def refresh(self, url: str, meta: dict[str, Any], response: requests.Response) -> None:
+        """Met à jour les métadonnées après une revalidation 304."""
+        for name in self.KEPT_HEADERS:
+            if name in response.headers:
+                meta["headers"][name] = response.headers[name]
+        meta["stored_at"] = time.time()
+        meta_path, _ = self._paths(url)
+        _atomic_write_bytes(meta_path, json.dumps(meta).encode())
+
+    def evict(self) -> int:
+        """
+        Supprime les entrées inutilisées depuis plus de `max_age_seconds`,
+        puis les moins récemment utilisées jusqu'à repasser sous `max_bytes`.
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        now = time.time()
+        entries = []
+        for body_path in self.cache_dir.glob("*.body"):
+            try:
+                st = body_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, body_path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, body_path in entries:
+            if now - mtime <= self.max_age_seconds and total <= self.max_bytes:
+                break
+            body_path.with_suffix(".json").unlink(missing_ok=True)
+            body_path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+
+def _max_age(cache_control: str) -> int | None:
+    """Extrait max-age d'un en-tête Cache-Control (None si absent ou no-cache)."""
+    directives = [d.strip().lower() for d in cache_control.split(",")]
+    if "no-cache" in directives or "no-store" in directives:
+        return None
+    for directive in directives:
+        if directive.startswith("max-age="):
+            try:
+                return int(directive.split("=", 1)[1])
+            except ValueError:
+                return None
+    return None
 
 
-def setup_logging(level: str = "INFO") -> logging.Logger:
-    """Configure le logging."""
-    logger = logging.getLogger("ingest_api")
-    logger.setLevel(level)
+def _atomic_write_bytes(path: Path, content: bytes) -> None:
+    """Écrit un fichier via un fichier temporaire unique puis rename."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
 
-    handler = logging.StreamHandler(sys.stderr)
-    handler.setFormatter(JsonFormatter())
-    logger.addHandler(handler)
 
-    return logger
+class CachingAdapter(ThrottledAdapter):
+    """
+    Adaptateur requests qui sert les GET depuis un `ResponseCache`.
+
+    - entrée fraîche (max-age) : servie depuis le disque sans requête ;
+    - entrée périmée avec validateur : requête conditionnelle, un 304 est
+      servi depuis le disque ;
+    - sinon : requête normale, la réponse 200 est mise en cache.
 
+    Seules les requêtes réellement émises passent par le limiteur.
+    """
+
+    def __init__(
+        self,
+        cache: ResponseCache,
+        limiter: AdaptiveLimiter | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(limiter, **kwargs)
+        self.cache = cache
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+
+        url = request.url
+        meta = self.cache.lookup(url)
+        if meta is not None and self.cache.is_fresh(meta):
+            self.cache.record("hits")
+            return self._cached_response(request, meta, "hit")
+
+        if meta is not None:
+            request.headers.update(self.cache.conditional_headers(meta))
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and meta is not None:
+            self.cache.record("revalidated")
+            self.cache.refresh(url, meta, response)
+            response.close()
+            return self._cached_response(request, meta, "revalidated")
+
+        self.cache.record("misses")
+        if response.status_code == 200:
+            self.cache.store(url, response)
+        return response
+
+    def _cached_response(
+        self, request: requests.PreparedRequest, meta: dict[str, Any], cache_status: str
+    ) -> requests.Response:
+        """Réponse 200 reconstruite depuis le disque (`cache_status` : hit ou revalidated)."""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = request.url
+        response.request = request
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.headers.setdefault("Date", email.utils.formatdate(usegmt=True))
+        response._content = self.cache.read(request.url)
+        response.encoding = "utf-8"
+        response.cache_status = cache_status
+        return response
+
+
+def create_session(
+    pool_size: int = DEFAULT_CONCURRENCY,
+    cache: ResponseCache | None = None,
+    limiter: AdaptiveLimiter | None = None,
+    metrics: PipelineMetrics | None = None,
+) -> requests.Session:
+    """
+    Crée une session HTTP avec un pool de connexions keep-alive.
+
+    La session est partagée entre les pages (et entre les threads en mode
+    concurrent) : chaque connexion TCP/TLS est ouverte une seule fois puis
+    réutilisée.
+
+    Args:
+        pool_size: Nombre de connexions conservées par hôte
+        cache: Cache disque optionnel des réponses (requêtes conditionnelles)
+        limiter: Limiteur adaptatif optionnel (débit, concurrence, Retry-After)
+        metrics: Métriques du run : requêtes et octets reçus du réseau
+            (compressés), octets servis par le cache (étape "fetch")
+
+    Returns:
+        Session configurée
+    """
+    session = requests.Session()
+    pool_kwargs = {"pool_connections": 1, "pool_maxsize": max(pool_size, 1)}
+    if cache is not None:
+        adapter = CachingAdapter(cache, limiter, **pool_kwargs)
+    else:
+        adapter = ThrottledAdapter(limiter, **pool_kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    if metrics is not None:
+        def count_response(response: requests.Response, *args: Any, **kwargs: Any) -> None:
+            # Corps lu depuis le disque : ni requête (hit) ni octets réseau (hit, 304)
+            cache_status = getattr(response, "cache_status", None)
+            if cache_status is None:
+                metrics.add("fetch", requests=1, bytes=response.wire_bytes)
+            else:
+                metrics.add(
+                    "fetch",
+                    requests=int(cache_status == "revalidated"),
+                    bytes=0,
+                    cached_bytes=len(response.content),
+                )
+
+        session.hooks["response"].append(count_response)
+    return session
 
-logger = setup_logging()
 
 # =============================================================================
-# Configuration
+# Décodage des pages
 # =============================================================================
 
-DEFAULT_API_URL = "https://jsonplaceholder.typicode.com/posts"
-DEFAULT_OUTPUT_DIR = "./data/bronze"
-DEFAULT_PAGE_SIZE = 100
-MAX_RETRIES = 3
+# Schéma déclaré des enregistrements source : (champ, type, obligatoire)
+RECORD_FIELDS: tuple[tuple[str, type, bool], ...] = (
+    ("id", int, True),
+    ("userId", int, False),
+    ("title", str, False),
+    ("body", str, False),
+)
+
+if msgspec is not None:
+
+    class SourceRecord(msgspec.Struct):
+        """Enregistrement source typé (miroir de RECORD_FIELDS)."""
+
+        id: int
+        userId: int | None = None
+        title: str | None = None
+        body: str | None = None
+
+
+class RecordDecoder:
+    """
+    Décode le corps d'une page en liste d'enregistrements.
+
+    - mode générique (défaut) : `json.loads`, les enregistrements sont
+      conservés tels quels ;
+    - mode typé (`typed=True`) : chaque enregistrement est validé contre
+      RECORD_FIELDS ; les enregistrements invalides sont écartés et comptés
+      dans `malformed`. Le décodage passe directement des octets au schéma
+      avec msgspec s'il est installé, sinon par la stdlib.
+
+    Si la réponse est un objet, les enregistrements sont lus dans
+    `data_field` (défaut: "data") ; les autres champs restent disponibles
+    dans 'payload' pour la pagination (curseur).
+    """
+
+    def __init__(self, typed: bool = False, data_field: str | None = None) -> None:
+        self.typed = typed
+        self.data_field = data_field or "data"
+        self.fast = typed and msgspec is not None
+        self.malformed = 0
+        self._lock = threading.Lock()
+        if self.fast:
+            self._list_decoder = msgspec.json.Decoder(list[SourceRecord])
+            self._raw_list_decoder = msgspec.json.Decoder(list[msgspec.Raw])
+            self._envelope_decoder = msgspec.json.Decoder(dict[str, msgspec.Raw])
+            self._record_decoder = msgspec.json.Decoder(SourceRecord)
+
+    def decode(self, body: bytes) -> dict[str, Any]:
+        """
+        Returns:
+            Dict avec 'data' (enregistrements retenus), 'payload' (réponse
+            décodée ; en mode rapide, enveloppe sans les enregistrements),
+            'count' (éléments reçus, valides ou non) et 'malformed'
+        """
+        if self.fast:
+            payload, items = self._split_fast(body)
+            data, count = self._validate_fast(items)
+        else:
+            payload = json.loads(body)
+            items = payload if isinstance(payload, list) else (
+                _get_path(payload, self.data_field) or []
+            )
+            count = len(items)
+            if self.typed:
+                data = [record for record in map(_coerce_record, items) if record is not None]
+            else:
+                data = items
+
+        malformed = count - len(data)
+        if malformed:
+            with self._lock:
+                self.malformed += malformed
+            logger.warning("Dropped %d malformed records", malformed)
+
+        return {"data": data, "payload": payload, "count": count, "malformed": malformed}
+
+    def _split_fast(self, body: bytes) -> tuple[Any, Any]:
+        """
+        Sépare l'enveloppe éventuelle du tableau d'enregistrements, laissé
+        sous forme d'octets JSON bruts pour un décodage typé en une passe.
+        """
+        if body.lstrip()[:1] == b"[":
+            return None, body
+
+        fields = self._envelope_decoder.decode(body)
+        root, _, rest = self.data_field.partition(".")
+        payload = {
+            key: msgspec.json.decode(value)
+            for key, value in fields.items()
+            if key != root or rest
+        }
+        if rest:
+            return payload, _get_path(payload, self.data_field) or []
+        raw = fields.get(root)
+        return payload, raw if raw is not None else []
+
+    def _validate_fast(self, items: Any) -> tuple[list[dict[str, Any]], int]:
+        """Décode les enregistrements dans SourceRecord ; écarte les invalides."""
+        if not isinstance(items, list):
+            try:
+                # Cas nominal : toute la page est valide, une seule passe
+                records = self._list_decoder.decode(items)
+                return msgspec.to_builtins(records), len(records)
+            except msgspec.ValidationError:
+                items = self._raw_list_decoder.decode(items)
+
+        records = []
+        for item in items:
+            try:
+                if isinstance(item, msgspec.Raw):
+                    records.append(self._record_decoder.decode(item))
+                else:
+                    records.append(msgspec.convert(item, SourceRecord))
+            except msgspec.ValidationError:
+                continue
+        return msgspec.to_builtins(records), len(items)
+
+
+def _coerce_record(item: Any) -> dict[str, Any] | None:
+    """Valide un enregistrement contre RECORD_FIELDS (None si invalide)."""
+    if not isinstance(item, dict):
+        return None
+    record = {}
+    for name, kind, required in RECORD_FIELDS:
+        value = item.get(name)
+        if value is None:
+            if required:
+                return None
+        elif not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+            return None
+        record[name] = value
+    return record
 
 
 # =============================================================================
@@ -77,89 +791,527 @@ MAX_RETRIES = 3
 # =============================================================================
 
 
+def _is_retryable(exc: BaseException) -> bool:
+    """Erreurs réseau et statuts HTTP transitoires (429, 5xx...) uniquement."""
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code in RETRYABLE_STATUS
+    return isinstance(exc, requests.RequestException)
+
+
+def _stop_when_budget_exhausted(retry_state: RetryCallState) -> bool:
+    """Arrête les retries quand le budget du run (kwarg `budget`) est épuisé."""
+    budget = retry_state.kwargs.get("budget")
+    return budget is not None and not budget.allow_retry()
+
+
+_backoff = wait_exponential(multiplier=1, min=2, max=10)
+
+
+def _wait_retry_after(retry_state: RetryCallState) -> float:
+    """Backoff exponentiel, allongé jusqu'au Retry-After renvoyé par l'API."""
+    delay = _backoff(retry_state)
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        retry_after = _parse_retry_after(exc.response.headers.get("Retry-After"))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+    return delay
+
+
 @retry(
-    stop=stop_after_attempt(MAX_RETRIES),
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    retry=retry_if_exception_type((requests.RequestException, requests.Timeout)),
+    stop=stop_after_attempt(MAX_RETRIES) | _stop_when_budget_exhausted,
+    wait=_wait_retry_after,
+    retry=retry_if_exception(_is_retryable),
 )
+def fetch_response(
+    url: str,
+    timeout: int = 30,
+    session: requests.Session | None = None,
+    budget: RetryBudget | None = None,
+) -> requests.Response:
+    """
+    Exécute un GET avec retry exponentiel.
+
+    Seules les erreurs transitoires sont retentées (réseau, 408, 429, 5xx),
+    en respectant `Retry-After`. Avec `budget`, chaque retry est prélevé sur
+    le budget du run ; une fois épuisé, les appels échouent immédiatement.
+
+    Args:
+        url: URL complète à récupérer
+        timeout: Timeout en secondes
+        session: Session HTTP partagée (sinon une connexion par appel)
+        budget: Budget de retries partagé par le run (à passer par mot-clé)
+
+    Returns:
+        Réponse HTTP 2xx
+
+    Raises:
+        requests.RequestException: En cas d'erreur après tous les retries
+        CircuitOpenError: Si le budget de retries du run est épuisé
+    """
+    if budget is not None:
+        budget.record_request()
+
+    http = session if session is not None else requests
+    response = http.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response
+
+
 def fetch_page(
     base_url: str,
     page: int = 1,
     page_size: int = DEFAULT_PAGE_SIZE,
     timeout: int = 30,
+    session: requests.Session | None = None,
+    budget: RetryBudget | None = None,
+    decoder: RecordDecoder | None = None,
 ) -> dict[str, Any]:
     """
-    Récupère une page de données depuis l'API avec retry exponentiel.
+    Récupère une page de données (pagination offset) avec retry exponentiel.
 
     Args:
         base_url: URL de base de l'API
         page: Numéro de page (1-indexed)
         page_size: Nombre d'éléments par page
         timeout: Timeout en secondes
+        session: Session HTTP partagée (sinon une connexion par appel)
+        budget: Budget de retries partagé par le run
+        decoder: Décodeur des pages (défaut: JSON générique)
 
     Returns:
-        Dict avec 'data', 'page', 'has_more'
+        Dict avec 'data', 'page', 'has_more', 'url', 'count', 'malformed'
 
     Raises:
         requests.RequestException: En cas d'erreur après tous les retries
+        CircuitOpenError: Si le budget de retries du run est épuisé
     """
-    url = f"{base_url}?_page={page}&_limit={page_size}"
-    logger.info(f"Fetching page {page}", extra={"url": url})
-
-    response = requests.get(url, timeout=timeout)
-    response.raise_for_status()
+    url = _with_params(base_url, _page=page, _limit=page_size)
+    page_logger.info("Fetching page %d", page, extra={"url": url})
 
-    data = response.json()
+    response = fetch_response(url, timeout=timeout, session=session, budget=budget)
+    decoded = (decoder or RecordDecoder()).decode(response.content)
 
     return {
-        "data": data,
+        **decoded,
         "page": page,
-        "has_more": len(data) == page_size,
+        "has_more": decoded["count"] == page_size,
+        "url": url,
     }
 
 
+def _with_params(base_url: str, **params: Any) -> str:
+    """Ajoute des paramètres de requête à une URL qui peut déjà en contenir."""
+    query = "&".join(f"{key}={quote(str(value), safe='')}" for key, value in params.items())
+    separator = "&" if "?" in base_url else "?"
+    return f"{base_url}{separator}{query}"
+
+
+# =============================================================================
+# Stratégies de pagination
+# =============================================================================
+
+
+class OffsetPagination:
+    """
+    Pagination par numéro de page (`?_page=N&_limit=M`).
+
+    Seul mode où les pages suivantes sont connues à l'avance : il peut être
+    parallélisé (`--concurrency`). La reprise se fait depuis un offset en
+    nombre d'enregistrements, indépendant de la taille de page.
+    """
+
+    name = "offset"
+    concurrent = True
+
+    def __init__(self, page_size: int = DEFAULT_PAGE_SIZE, start_page: int = 1) -> None:
+        self.page_size = page_size
+        self.start_page = start_page
+
+    def resume_from(self, watermark: dict[str, Any]) -> None:
+        self.start_page = watermark.get("offset", 0) // self.page_size + 1
+
+    def resume_state(self, fetched_count: int, last_url: str | None = None) -> dict[str, Any]:
+        return {"offset": (self.start_page - 1) * self.page_size + fetched_count}
+
+
+class LinkedPagination:
+    """
+    Base des paginations séquentielles : chaque réponse désigne la suivante.
+
+    Les sous-classes définissent la première URL et la suivante ; la reprise
+    repart de la dernière page récupérée (`resume_url`), les enregistrements
+    déjà écrits étant écartés par le watermark `last_id`.
+    """
+
+    name = ""
+    concurrent = False
+
+    def __init__(self, page_size: int = DEFAULT_PAGE_SIZE) -> None:
+        self.page_size = page_size
+        self.start_url: str | None = None
+        self.last_url: str | None = None
+
+    def first_url(self, base_url: str) -> str:
+        return self.start_url or _with_params(base_url, _limit=self.page_size)
+
+    def next_url(
+        self,
+        base_url: str,
+        response: requests.Response,
+        page: dict[str, Any],
+    ) -> str | None:
+        """URL de la page suivante (None si dernière) depuis la page décodée."""
+        raise NotImplementedError
+
+    def resume_from(self, watermark: dict[str, Any]) -> None:
+        self.start_url = watermark.get("resume_url")
+
+    def resume_state(self, fetched_count: int, last_url: str | None = None) -> dict[str, Any]:
+        return {"resume_url": last_url or self.last_url or self.start_url}
+
+
+class CursorPagination(LinkedPagination):
+    """
+    Pagination par jeton opaque : `{"data": [...], "next_cursor": "abc"}`,
+    page suivante demandée avec `?cursor=abc&_limit=M`.
+    """
+
+    name = "cursor"
+
+    def __init__(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cursor_param: str = "cursor",
+        cursor_field: str = "next_cursor",
+    ) -> None:
+        super().__init__(page_size)
+        self.cursor_param = cursor_param
+        self.cursor_field = cursor_field
+
+    def next_url(
+        self,
+        base_url: str,
+        response: requests.Response,
+        page: dict[str, Any],
+    ) -> str | None:
+        payload = page["payload"]
+        cursor = _get_path(payload, self.cursor_field) if isinstance(payload, dict) else None
+        if not cursor or not page["count"]:
+            return None
+        return _with_params(base_url, **{self.cursor_param: cursor, "_limit": self.page_size})
+
+
+class LinkHeaderPagination(LinkedPagination):
+    """
+    Pagination par en-tête `Link: <...>; rel="next"` (GitHub, json-server).
+
+    La première page est demandée avec `?_page=1&_limit=M`, forme attendue
+    par json-server pour émettre l'en-tête.
+    """
+
+    name = "link"
+
+    def first_url(self, base_url: str) -> str:
+        return self.start_url or _with_params(base_url, _page=1, _limit=self.page_size)
+
+    def next_url(
+        self,
+        base_url: str,
+        response: requests.Response,
+        page: dict[str, Any],
+    ) -> str | None:
+        if not page["count"]:
+            return None
+        return response.links.get("next", {}).get("url")
+
+
+class KeysetPagination(LinkedPagination):
+    """
+    Pagination keyset : `?id_gt=<dernier id>&_limit=M`.
+
+    L'API doit renvoyer les enregistrements triés par `id` croissant. Le
+    coût serveur ne dépend pas de la profondeur et une insertion pendant le
+    run ne décale pas les pages. La reprise repart directement du watermark
+    `last_id`.
+    """
+
+    name = "keyset"
+
+    def __init__(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        keyset_param: str = "id_gt",
+    ) -> None:
+        super().__init__(page_size)
+        self.keyset_param = keyset_param
+        self.start_id: int | None = None
+
+    def _url(self, base_url: str, after_id: int | None) -> str:
+        if after_id is None:
+            return _with_params(base_url, _limit=self.page_size)
+        return _with_params(base_url, **{self.keyset_param: after_id, "_limit": self.page_size})
+
+    def first_url(self, base_url: str) -> str:
+        return self._url(base_url, self.start_id)
+
+    def next_url(
+        self,
+        base_url: str,
+        response: requests.Response,
+        page: dict[str, Any],
+    ) -> str | None:
+        if page["count"] < self.page_size:
+            return None
+        ids = [record.get("id") for record in page["data"] if record.get("id") is not None]
+        return self._url(base_url, max(ids)) if ids else None
+
+    def resume_from(self, watermark: dict[str, Any]) -> None:
+        self.start_id = watermark.get("last_id")
+
+    def resume_state(self, fetched_count: int, last_url: str | None = None) -> dict[str, Any]:
+        return {}
+
+
+Pagination = OffsetPagination | LinkedPagination
+
+
+def make_pagination(
+    mode: str = DEFAULT_PAGINATION,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    cursor_param: str = "cursor",
+    cursor_field: str = "next_cursor",
+    keyset_param: str = "id_gt",
+) -> Pagination:
+    """Construit la stratégie de pagination correspondant à `mode`."""
+    if mode == "offset":
+        return OffsetPagination(page_size)
+    if mode == "cursor":
+        return CursorPagination(page_size, cursor_param, cursor_field)
+    if mode == "link":
+        return LinkHeaderPagination(page_size)
+    if mode == "keyset":
+        return KeysetPagination(page_size, keyset_param)
+    raise ValueError(f"Unknown pagination mode: {mode} (expected one of {PAGINATION_MODES})")
+
+
+def _get_path(payload: dict[str, Any], path: str) -> Any:
+    """Lit un champ éventuellement imbriqué (`meta.next_cursor`)."""
+    value: Any = payload
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
 def fetch_all_pages(
     base_url: str,
     page_size: int = DEFAULT_PAGE_SIZE,
     max_pages: int | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    session: requests.Session | None = None,
+    start_page: int = 1,
+    cache: ResponseCache | None = None,
+    limiter: AdaptiveLimiter | None = None,
+    budget: RetryBudget | None = None,
+    pagination: Pagination | None = None,
+    decoder: RecordDecoder | None = None,
+    metrics: PipelineMetrics | None = None,
 ) -> list[dict[str, Any]]:
     """
     Récupère toutes les pages de données.
 
+    Avec concurrency > 1, jusqu'à `concurrency` pages sont demandées en
+    parallèle sur une session keep-alive partagée. Les pages sont toujours
+    consommées dans l'ordre, et l'arrêt sur `has_more` / `max_pages` est
+    identique au mode séquentiel. Les paginations cursor/link/keyset sont
+    séquentielles par nature : `concurrency` n'y dimensionne que le pool
+    de connexions.
+
     Args:
         base_url: URL de base de l'API
         page_size: Nombre d'éléments par page
         max_pages: Limite optionnelle du nombre de pages
+        concurrency: Nombre maximum de requêtes simultanées
+        session: Session HTTP à réutiliser (créée si absente)
+        start_page: Première page à récupérer (reprise incrémentale)
+        cache: Cache disque des réponses (ignoré si `session` est fourni)
+        limiter: Limiteur adaptatif (ignoré si `session` est fourni)
+        budget: Budget de retries partagé par le run
+        pagination: Stratégie de pagination (défaut: offset depuis `start_page`)
+        decoder: Décodeur des pages (défaut: JSON générique)
+        metrics: Métriques du run (ignoré si `session` est fourni)
 
     Returns:
         Liste de tous les enregistrements
     """
-    all_data = []
-    page = 1
+    if pagination is None:
+        pagination = OffsetPagination(page_size, start_page)
 
-    while True:
-        result = fetch_page(base_url, page, page_size)
-        all_data.extend(result["data"])
+    own_session = session is None
+    if own_session:
+        session = create_session(concurrency, cache, limiter, metrics)
 
-        logger.info(
-            f"Fetched page {page}",
-            extra={"records": len(result["data"]), "total": len(all_data)},
-        )
+    all_data: list[dict[str, Any]] = []
+    pages = 0
 
-        if not result["has_more"]:
-            break
+    try:
+        for result in iter_pages(
+            base_url, pagination, max_pages, concurrency, session, budget, decoder
+        ):
+            pages += 1
+            all_data.extend(result["data"])
+
+            page_logger.info(
+                "Fetched page %s",
+                result["page"],
+                extra={"records": len(result["data"]), "total": len(all_data)},
+            )
+    finally:
+        if own_session:
+            session.close()
+
+    logger.info("Fetched %d records in %d pages", len(all_data), pages)
+    return all_data
+
+
+def iter_pages(
+    base_url: str,
+    pagination: Pagination,
+    max_pages: int | None,
+    concurrency: int,
+    session: requests.Session,
+    budget: RetryBudget | None = None,
+    decoder: RecordDecoder | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Génère les pages dans l'ordre selon la stratégie de pagination."""
+    if isinstance(pagination, OffsetPagination):
+        return _iter_pages(
+            base_url,
+            pagination.page_size,
+            max_pages,
+            concurrency,
+            session,
+            pagination.start_page,
+            budget,
+            decoder,
+        )
+    return _iter_linked_pages(base_url, pagination, max_pages, session, budget, decoder)
 
-        if max_pages and page >= max_pages:
-            logger.warning(f"Reached max_pages limit: {max_pages}")
-            break
 
+def _iter_linked_pages(
+    base_url: str,
+    pagination: LinkedPagination,
+    max_pages: int | None,
+    session: requests.Session,
+    budget: RetryBudget | None = None,
+    decoder: RecordDecoder | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Suit les pages cursor/link/keyset jusqu'à la dernière ou `max_pages`."""
+    decoder = decoder or RecordDecoder()
+    url: str | None = pagination.first_url(base_url)
+    page = 0
+
+    while url is not None:
         page += 1
+        page_logger.info("Fetching page %d", page, extra={"url": url})
 
-    logger.info(f"Fetched {len(all_data)} records in {page} pages")
-    return all_data
+        response = fetch_response(url, session=session, budget=budget)
+        decoded = decoder.decode(response.content)
+        next_url = pagination.next_url(base_url, response, decoded)
+        pagination.last_url = url
+
+        yield {**decoded, "page": page, "has_more": next_url is not None, "url": url}
+
+        if max_pages and page >= max_pages and next_url is not None:
+            logger.warning("Reached max_pages limit: %d", max_pages)
+            return
+        url = next_url
 
 
-def transform_data(data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def _iter_pages(
+    base_url: str,
+    page_size: int,
+    max_pages: int | None,
+    concurrency: int,
+    session: requests.Session,
+    start_page: int = 1,
+    budget: RetryBudget | None = None,
+    decoder: RecordDecoder | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Génère les pages dans l'ordre jusqu'à la dernière page ou `max_pages`.
+
+    `max_pages` compte les pages récupérées par ce run, à partir de
+    `start_page`.
+
+    En mode concurrent, une fenêtre glissante de `concurrency` requêtes est
+    maintenue en avance sur la page consommée. Les requêtes lancées au-delà
+    de la dernière page sont annulées (ou ignorées si déjà parties).
+    """
+    last_page = start_page + max_pages - 1 if max_pages else None
+
+    if concurrency <= 1:
+        page = start_page
+        while True:
+            result = fetch_page(
+                base_url, page, page_size, session=session, budget=budget, decoder=decoder
+            )
+            yield result
+
+            if not result["has_more"]:
+                return
+            if last_page and page >= last_page:
+                logger.warning("Reached max_pages limit: %d", max_pages)
+                return
+            page += 1
+
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="fetch"
+    ) as executor:
+        pending: deque[Future] = deque()
+        next_page = start_page
+
+        def submit_ahead() -> None:
+            nonlocal next_page
+            while len(pending) < concurrency and (
+                last_page is None or next_page <= last_page
+            ):
+                pending.append(
+                    executor.submit(
+                        fetch_page,
+                        base_url,
+                        next_page,
+                        page_size,
+                        session=session,
+                        budget=budget,
+                        decoder=decoder,
+                    )
+                )
+                next_page += 1
+
+        try:
+            submit_ahead()
+            while pending:
+                result = pending.popleft().result()
+                yield result
+
+                if not result["has_more"]:
+                    return
+                if last_page and result["page"] >= last_page:
+                    logger.warning("Reached max_pages limit: %d", max_pages)
+                    return
+                submit_ahead()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def transform_data(
+    data: list[dict[str, Any]],
+    ingested_at: str | None = None,
+) -> list[dict[str, Any]]:
     """
     Transforme les données brutes.
 
@@ -167,11 +1319,13 @@ def transform_data(data: list[dict[str, Any]]) -> list[dict[str, Any]]:
 
     Args:
         data: Liste des enregistrements bruts
+        ingested_at: Horodatage d'ingestion commun (défaut: maintenant)
 
     Returns:
         Liste des enregistrements transformés
     """
-    ingested_at = datetime.utcnow().isoformat()
+    if ingested_at is None:
+        ingested_at = datetime.utcnow().isoformat()
 
     transformed = []
     for record in data:
@@ -184,57 +1338,781 @@ def transform_data(data: list[dict[str, Any]]) -> list[dict[str, Any]]:
                 "body": record.get("body"),
                 # Métadonnées
                 "_ingested_at": ingested_at,
-                "_source": "jsonplaceholder",
-                "_schema_version": "1.0",
+                "_source": DEFAULT_SOURCE,
+                "_schema_version": SCHEMA_VERSION,
             }
         )
 
     return transformed
 
 
-def write_parquet(
+def transform_to_table(
     data: list[dict[str, Any]],
+    ingested_at: str | None = None,
+    partition_date: str | None = None,
+) -> pa.Table:
+    """
+    Transforme les données brutes en table Arrow colonnaire.
+
+    Équivalent de `transform_data` sans dict intermédiaire par
+    enregistrement : les colonnes typées sont construites directement depuis
+    le payload par Arrow, et les métadonnées constantes sont des colonnes
+    dictionnaire (une seule valeur + index int8) au lieu d'une chaîne
+    Python par ligne.
+
+    Args:
+        data: Liste des enregistrements bruts
+        ingested_at: Horodatage d'ingestion commun (défaut: maintenant)
+        partition_date: Date de partition à ajouter (optionnel)
+
+    Returns:
+        Table Arrow avec les champs originaux et les métadonnées
+    """
+    if ingested_at is None:
+        ingested_at = datetime.utcnow().isoformat()
+
+    table = pa.Table.from_pylist(data, schema=RAW_SCHEMA)
+
+    metadata = {
+        "_ingested_at": ingested_at,
+        "_source": DEFAULT_SOURCE,
+        "_schema_version": SCHEMA_VERSION,
+    }
+    if partition_date is not None:
+        metadata["_partition_date"] = partition_date
+
+    indices = pa.array(np.zeros(table.num_rows, dtype=np.int8))
+    for name, value in metadata.items():
+        column = pa.DictionaryArray.from_arrays(indices, pa.array([value], pa.string()))
+        table = table.append_column(name, column)
+
+    return table
+
+
+def filter_new_records(table: pa.Table, last_id: int | None) -> pa.Table:
+    """
+    Ne garde que les enregistrements plus récents que le watermark.
+
+    Les enregistrements sans `id` sont conservés : ils ne peuvent pas être
+    comparés au watermark et seront signalés par la validation.
+    """
+    if last_id is None or table.num_rows == 0:
+        return table
+    mask = pc.fill_null(pc.greater(table["id"], last_id), True)
+    return table.filter(mask)
+
+
+def write_parquet(
+    data: list[dict[str, Any]] | pa.Table,
     output_dir: str,
     partition_date: str,
+    profile: str = DEFAULT_PARQUET_PROFILE,
 ) -> str | None:
     """
     Écrit les données en Parquet partitionné par date.
 
     Args:
-        data: Liste des enregistrements à écrire
+        data: Enregistrements à écrire (liste de dicts ou table Arrow
+            produite par `transform_to_table`)
         output_dir: Répertoire de sortie
         partition_date: Date de partition (YYYY-MM-DD)
+        profile: Profil de layout Parquet (voir PARQUET_PROFILES)
 
     Returns:
         Chemin du fichier créé, ou None si pas de données
     """
-    if not data:
+    if len(data) == 0:
         logger.warning("No data to write")
         return None
 
-    df = pd.DataFrame(data)
+    filepath = _output_filepath(output_dir, partition_date)
+    tmp_path = filepath.with_name(f".{filepath.name}.tmp")
+
+    if isinstance(data, pa.Table):
+        table = _to_output_table(data, partition_date)
+    else:
+        df = pd.DataFrame(data)
+
+        # Ajouter la colonne de partition
+        df["_partition_date"] = partition_date
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+    # Écrire le Parquet selon le profil de layout
+    table = apply_layout(table, profile)
+    try:
+        pq.write_table(
+            table,
+            tmp_path,
+            row_group_size=PARQUET_PROFILES[profile].get("row_group_size"),
+            **parquet_write_options(table.schema, profile),
+        )
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    _publish(tmp_path, filepath)
+
+    logger.info(
+        "Written %d records",
+        len(data),
+        extra={"filepath": str(filepath), "size_mb": filepath.stat().st_size / 1024 / 1024},
+    )
+
+    return str(filepath)
+
 
-    # Ajouter la colonne de partition
-    df["_partition_date"] = partition_date
+def apply_layout(table: pa.Table, profile: str = DEFAULT_PARQUET_PROFILE) -> pa.Table:
+    """Trie la table selon les clés de clustering du profil."""
+    sort_by = [
+        (name, order)
+        for name, order in PARQUET_PROFILES[profile].get("sort_by", [])
+        if name in table.column_names
+    ]
+    return table.sort_by(sort_by) if sort_by and table.num_rows > 1 else table
 
+
+def parquet_write_options(
+    schema: pa.Schema,
+    profile: str = DEFAULT_PARQUET_PROFILE,
+) -> dict[str, Any]:
+    """
+    Options `pq.write_table` / `pq.ParquetWriter` d'un profil de layout.
+
+    Les colonnes absentes du schéma sont ignorées ; le tri est déclaré dans
+    les métadonnées (`sorting_columns`) pour que les lecteurs puissent
+    s'appuyer dessus. `row_group_size` n'en fait pas partie : il se passe à
+    l'écriture de chaque table.
+    """
+    config = PARQUET_PROFILES[profile]
+    options: dict[str, Any] = {"compression": config.get("compression", "snappy")}
+
+    if "compression_level" in config:
+        options["compression_level"] = config["compression_level"]
+
+    if "dictionary_columns" in config:
+        options["use_dictionary"] = [
+            name for name in config["dictionary_columns"] if name in schema.names
+        ]
+
+    sort_by = [(name, order) for name, order in config.get("sort_by", []) if name in schema.names]
+    if sort_by:
+        options["sorting_columns"] = pq.SortingColumn.from_ordering(schema, sort_by)
+
+    if config.get("write_page_index"):
+        options["write_page_index"] = True
+
+    bloom_columns = [name for name in config.get("bloom_filter_columns", []) if name in schema.names]
+    if bloom_columns:
+        if SUPPORTS_BLOOM_FILTERS:
+            ndv = config.get("row_group_size") or 1024 * 1024
+            options["bloom_filter_options"] = {
+                name: {"ndv": ndv, "fpp": 0.01} for name in bloom_columns
+            }
+        else:
+            logger.warning("pyarrow %s cannot write bloom filters, skipping", pa.__version__)
+
+    return options
+
+
+def _to_output_table(table: pa.Table, partition_date: str) -> pa.Table:
+    """Ajoute la partition si besoin et aligne la table sur OUTPUT_SCHEMA."""
+    if "_partition_date" not in table.column_names:
+        table = table.append_column(
+            "_partition_date",
+            pa.repeat(pa.scalar(partition_date, pa.string()), table.num_rows),
+        )
+    # Les colonnes dictionnaire sont décodées en string pour garder un
+    # schéma stable ; Parquet les ré-encode en dictionnaire à l'écriture.
+    return table.select(OUTPUT_SCHEMA.names).cast(OUTPUT_SCHEMA)
+
+
+def _output_filepath(output_dir: str, partition_date: str) -> Path:
+    """Construit le chemin du fichier de sortie dans la partition Hive."""
     # Créer le répertoire partitionné (style Hive)
     output_path = Path(output_dir) / f"partition_date={partition_date}"
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # Nom de fichier avec timestamp pour idempotence
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    filename = f"data_{timestamp}.parquet"
-    filepath = output_path / filename
+    # Horodatage (tri chronologique) et identifiant de run : deux runs
+    # incrémentaux dans la même seconde écrivent deux fichiers distincts
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
+    return output_path / f"data_{timestamp}_{uuid.uuid4().hex[:8]}.parquet"
 
-    # Écrire le Parquet avec compression
-    df.to_parquet(filepath, index=False, compression="snappy")
 
-    logger.info(
-        f"Written {len(df)} records",
-        extra={"filepath": str(filepath), "size_mb": filepath.stat().st_size / 1024 / 1024},
+def _publish(tmp_path: Path, filepath: Path) -> None:
+    """
+    Publie un fichier écrit sous un nom temporaire, sans jamais écraser.
+
+    `os.link` échoue (FileExistsError) si la cible existe déjà : un delta
+    incrémental ne peut pas remplacer celui d'un autre run, et l'appelant
+    n'avance pas le watermark.
+    """
+    try:
+        os.link(tmp_path, filepath)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+# =============================================================================
+# Ingestion en streaming
+# =============================================================================
+
+_END_OF_STREAM = object()
+
+
+def stream_ingest(
+    base_url: str,
+    output_dir: str,
+    partition_date: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_pages: int | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    start_page: int = 1,
+    last_id: int | None = None,
+    cache: ResponseCache | None = None,
+    limiter: AdaptiveLimiter | None = None,
+    budget: RetryBudget | None = None,
+    pagination: Pagination | None = None,
+    decoder: RecordDecoder | None = None,
+    profile: str = DEFAULT_PARQUET_PROFILE,
+    metrics: PipelineMetrics | None = None,
+    checkpoint_row_groups: int | None = None,
+    on_checkpoint: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Ingère les pages au fil de l'eau, une page = un row group Parquet.
+
+    Un thread de fond récupère les pages et les dépose dans une file
+    bornée ; le thread principal transforme chaque page et l'ajoute au
+    fichier Parquet ouvert. La mémoire reste ainsi bornée à environ
+    `queue_size` pages quel que soit le volume total, et le réseau travaille
+    pendant la transformation et l'écriture.
+
+    Le fichier est écrit sous un nom temporaire caché puis renommé à la
+    fin : un run interrompu ne laisse pas de fichier partiel visible par
+    les lecteurs de la partition.
+
+    Si le profil de layout fixe un `row_group_size`, les pages sont
+    accumulées jusqu'à cette taille puis triées et écrites ensemble : le
+    tri est alors garanti par row group (pas sur le fichier entier) et la
+    mémoire reste bornée à un row group.
+
+    Avec `checkpoint_row_groups`, le fichier est publié tous les N row
+    groups et un nouveau fichier est ouvert ; `on_checkpoint` est appelé
+    après chaque publication avec l'avancement correspondant aux pages
+    déjà écrites. Un crash ne perd alors que la partie en cours.
+
+    Args:
+        base_url: URL de base de l'API
+        output_dir: Répertoire de sortie
+        partition_date: Date de partition (YYYY-MM-DD)
+        page_size: Nombre d'éléments par page
+        max_pages: Limite optionnelle du nombre de pages
+        concurrency: Nombre maximum de requêtes simultanées
+        queue_size: Nombre maximum de pages en attente d'écriture
+        start_page: Première page à récupérer (reprise incrémentale)
+        last_id: Watermark : seuls les `id` supérieurs sont écrits
+        cache: Cache disque des réponses HTTP (optionnel)
+        limiter: Limiteur adaptatif (optionnel)
+        budget: Budget de retries partagé par le run (optionnel)
+        pagination: Stratégie de pagination (défaut: offset depuis `start_page`)
+        decoder: Décodeur des pages (défaut: JSON générique)
+        profile: Profil de layout Parquet (voir PARQUET_PROFILES)
+        metrics: Métriques du run ; étapes fetch, transform et write
+            chronométrées page par page (l'attente de la file n'est pas
+            comptée)
+        checkpoint_row_groups: Publie un fichier tous les N row groups
+            (défaut: un seul fichier en fin de run)
+        on_checkpoint: Appelé après chaque fichier publié en cours de run
+            avec 'output_file', 'fetched_count', 'max_id' et 'last_url'
+            (URL de la dernière page écrite, pagination séquentielle)
+
+    Returns:
+        Dict avec 'output_file' (dernier fichier publié), 'output_files',
+        'records_count', 'fetched_count', 'max_id'
+    """
+    if pagination is None:
+        pagination = OffsetPagination(page_size, start_page)
+    if metrics is None:
+        metrics = PipelineMetrics()
+
+    pages: queue.Queue = queue.Queue(maxsize=max(queue_size, 1))
+    stop = threading.Event()
+
+    def produce() -> None:
+        session = create_session(concurrency, cache, limiter, metrics)
+        try:
+            results = iter_pages(
+                base_url, pagination, max_pages, concurrency, session, budget, decoder
+            )
+            while True:
+                with metrics.stage("fetch"):
+                    result = next(results, _END_OF_STREAM)
+                if result is _END_OF_STREAM:
+                    break
+                metrics.add("fetch", records=result["count"])
+                if not _put(pages, result, stop):
+                    return
+            _put(pages, _END_OF_STREAM, stop)
+        except BaseException as e:  # transmis au consommateur
+            _put(pages, e, stop)
+        finally:
+            session.close()
+
+    producer = threading.Thread(target=produce, name="fetch-producer", daemon=True)
+    producer.start()
+
+    ingested_at = datetime.utcnow().isoformat()
+    writer: pq.ParquetWriter | None = None
+    filepath = tmp_path = None
+    row_group_size = PARQUET_PROFILES[profile].get("row_group_size")
+    pending: list[pa.Table] = []
+    pending_rows = 0
+    part_rows = 0
+    row_groups = 0
+    output_files: list[str] = []
+    total = 0
+    fetched = 0
+    max_id = last_id
+
+    def flush() -> None:
+        nonlocal writer, filepath, tmp_path, pending_rows, part_rows, row_groups
+        if pending_rows:
+            with metrics.stage("write"):
+                if writer is None:
+                    filepath = _output_filepath(output_dir, partition_date)
+                    tmp_path = filepath.with_name(f".{filepath.name}.tmp")
+                    writer = pq.ParquetWriter(
+                        tmp_path, OUTPUT_SCHEMA, **parquet_write_options(OUTPUT_SCHEMA, profile)
+                    )
+                group = apply_layout(pa.concat_tables(pending), profile)
+                writer.write_table(group, row_group_size=row_group_size)
+            metrics.add("write", records=pending_rows)
+            part_rows += pending_rows
+            row_groups += 1
+        pending.clear()
+        pending_rows = 0
+
+    def publish_part() -> None:
+        nonlocal writer, part_rows, row_groups
+        if writer is None:
+            return
+        writer.close()
+        writer = None
+        _publish(tmp_path, filepath)
+        output_files.append(str(filepath))
+        size = filepath.stat().st_size
+        metrics.add("write", bytes=size)
+        logger.info(
+            "Written %d records",
+            part_rows,
+            extra={"filepath": str(filepath), "size_mb": size / 1024 / 1024},
+        )
+        part_rows = 0
+        row_groups = 0
+
+    try:
+        while True:
+            item = pages.get()
+            if item is _END_OF_STREAM:
+                break
+            if isinstance(item, BaseException):
+                raise item
+
+            fetched += item["count"]
+            with metrics.stage("transform"):
+                table = transform_to_table(item["data"], ingested_at, partition_date)
+                table = filter_new_records(table, last_id)
+                max_id = _max_id(table, max_id)
+            metrics.add("transform", records=table.num_rows)
+
+            if table.num_rows:
+                pending.append(_to_output_table(table, partition_date))
+                pending_rows += table.num_rows
+                if row_group_size is None or pending_rows >= row_group_size:
+                    flush()
+            total += table.num_rows
+
+            if checkpoint_row_groups and row_groups >= checkpoint_row_groups:
+                # Tout ce qui a été consommé est écrit : l'avancement
+                # publié correspond exactement au contenu des fichiers
+                publish_part()
+                if on_checkpoint is not None:
+                    on_checkpoint(
+                        {
+                            "output_file": output_files[-1],
+                            "fetched_count": fetched,
+                            "max_id": max_id,
+                            "last_url": item.get("url"),
+                        }
+                    )
+
+            page_logger.info(
+                "Streamed page %s",
+                item["page"],
+                extra={"records": table.num_rows, "total": total},
+            )
+    except BaseException:
+        stop.set()
+        if writer is not None:
+            writer.close()
+            tmp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        producer.join()
+
+    flush()
+    publish_part()
+    if total == 0:
+        logger.warning("No data to write")
+
+    return {
+        "output_file": output_files[-1] if output_files else None,
+        "output_files": output_files,
+        "records_count": total,
+        "fetched_count": fetched,
+        "max_id": max_id,
+    }
+
+
+def _max_id(table: pa.Table, current: int | None) -> int | None:
+    """Plus grand `id` entre la table et le watermark courant."""
+    table_max = pc.max(table["id"]).as_py() if table.num_rows else None
+    if table_max is None:
+        return current
+    return table_max if current is None else max(current, table_max)
+
+
+def _put(q: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Dépose un élément dans la file sauf si le consommateur a abandonné."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+# =============================================================================
+# État incrémental (watermark)
+# =============================================================================
+
+STATE_VERSION = 1
+
+
+def load_state(state_file: str) -> dict[str, Any]:
+    """
+    Charge le fichier d'état, ou un état vide s'il n'existe pas encore.
+
+    Format :
+        {"version": 1, "streams": {"<api_url>": {"offset": 200, "last_id": 200, ...}}}
+
+    `offset` est le nombre d'enregistrements de la source déjà consommés :
+    la reprise se fait à la page qui le contient, et `last_id` écarte les
+    enregistrements de cette page déjà écrits.
+    """
+    path = Path(state_file)
+    if not path.exists():
+        return {"version": STATE_VERSION, "streams": {}}
+
+    with open(path) as f:
+        state = json.load(f)
+    state.setdefault("streams", {})
+    return state
+
+
+def save_state(state_file: str, state: dict[str, Any]) -> None:
+    """Écrit le fichier d'état de façon atomique (fichier temporaire + rename)."""
+    path = Path(state_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def _state_lock(state_file: str) -> Iterator[None]:
+    """Verrou exclusif inter-processus autour d'une mise à jour de l'état."""
+    lock_path = Path(state_file).with_name(f".{Path(state_file).name}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def update_watermark(state_file: str, key: str, watermark: dict[str, Any]) -> None:
+    """
+    Enregistre le watermark d'un flux.
+
+    Lecture-modification-écriture sous verrou : plusieurs partitions
+    ingérées en parallèle peuvent partager le même fichier d'état.
+    """
+    with _state_lock(state_file):
+        state = load_state(state_file)
+        state["streams"][key] = watermark
+        save_state(state_file, state)
+
+
+# =============================================================================
+# Orchestration
+# =============================================================================
+
+
+def ingest(
+    api_url: str,
+    output_dir: str,
+    partition_date: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_pages: int | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    stream: bool = False,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    state_file: str | None = None,
+    cache_dir: str | None = None,
+    cache_max_mb: float = DEFAULT_CACHE_MAX_MB,
+    cache_max_age_hours: float = DEFAULT_CACHE_MAX_AGE_HOURS,
+    rate_limit: float | None = None,
+    latency_target_ms: float | None = None,
+    retry_budget_ratio: float = DEFAULT_RETRY_BUDGET_RATIO,
+    retry_budget_min: int = DEFAULT_RETRY_BUDGET_MIN,
+    pagination: str = DEFAULT_PAGINATION,
+    data_field: str | None = None,
+    cursor_param: str = "cursor",
+    cursor_field: str = "next_cursor",
+    keyset_param: str = "id_gt",
+    fast_decode: bool = False,
+    parquet_profile: str = DEFAULT_PARQUET_PROFILE,
+    checkpoint_row_groups: int | None = None,
+) -> dict[str, Any]:
+    """
+    Exécute récupération, transformation et écriture d'une partition.
+
+    Avec `state_file`, l'ingestion est incrémentale : elle reprend au
+    watermark enregistré pour `api_url` et ne l'avance qu'une fois le
+    fichier Parquet écrit. Un crash avant ce point relance simplement le
+    même delta au run suivant. Par défaut le watermark n'avance qu'en fin
+    de run ; en mode `stream` avec `checkpoint_row_groups`, il avance après
+    chaque fichier publié (tous les N row groups).
+
+    Avec `cache_dir`, les réponses HTTP sont mises en cache sur disque et
+    revalidées par requête conditionnelle ; le cache est purgé (âge, taille)
+    en fin de run.
+
+    Les requêtes passent par un limiteur adaptatif (débit `rate_limit`,
+    concurrence AIMD, Retry-After) et les retries sont prélevés sur un
+    budget commun à la partition.
+
+    `pagination` choisit la stratégie (offset, cursor, link, keyset) ; le
+    point de reprise enregistré dans l'état dépend de la stratégie.
+
+    Avec `fast_decode`, les pages sont décodées directement dans le schéma
+    des enregistrements et les enregistrements invalides sont écartés et
+    comptés ('malformed_records').
+
+    `parquet_profile` choisit le layout du fichier écrit (compression,
+    taille des row groups, tri, dictionnaires, bloom filters).
+
+    Returns:
+        Dict avec 'output_file', 'records_count', 'throttling' et 'metrics'
+        (et 'watermark' en mode incrémental, 'cache' si le cache est actif)
+    """
+    metrics = PipelineMetrics()
+    watermark: dict[str, Any] = {}
+    if state_file:
+        watermark = load_state(state_file)["streams"].get(api_url, {})
+
+    cache = None
+    if cache_dir:
+        cache = ResponseCache(
+            cache_dir,
+            max_bytes=int(cache_max_mb * 1024 * 1024),
+            max_age_seconds=cache_max_age_hours * 3600,
+        )
+
+    limiter = AdaptiveLimiter(
+        concurrency,
+        rate=rate_limit,
+        latency_target=latency_target_ms / 1000 if latency_target_ms else None,
     )
+    budget = RetryBudget(retry_budget_ratio, retry_budget_min)
+
+    paginator = make_pagination(pagination, page_size, cursor_param, cursor_field, keyset_param)
+    decoder = RecordDecoder(typed=fast_decode, data_field=data_field)
+    last_id = watermark.get("last_id")
+    if watermark:
+        if watermark.get("pagination", DEFAULT_PAGINATION) != paginator.name:
+            raise ValueError(
+                f"State for {api_url} was written with "
+                f"--pagination {watermark.get('pagination', DEFAULT_PAGINATION)}"
+            )
+        paginator.resume_from(watermark)
+        logger.info("Resuming from watermark", extra=watermark)
+
+    def checkpoint(progress: dict[str, Any]) -> None:
+        nonlocal watermark
+        watermark = {
+            "pagination": paginator.name,
+            **paginator.resume_state(progress["fetched_count"], progress.get("last_url")),
+            "last_id": progress["max_id"],
+            "partition_date": partition_date,
+            "output_file": progress["output_file"] or watermark.get("output_file"),
+            "updated_at": datetime.utcnow().isoformat(),
+        }
+        update_watermark(state_file, api_url, watermark)
+
+    if stream:
+        # 1-3. Récupérer, transformer et écrire page par page
+        outcome = stream_ingest(
+            api_url,
+            output_dir,
+            partition_date,
+            page_size=page_size,
+            max_pages=max_pages,
+            concurrency=concurrency,
+            queue_size=queue_size,
+            last_id=last_id,
+            cache=cache,
+            limiter=limiter,
+            budget=budget,
+            pagination=paginator,
+            decoder=decoder,
+            profile=parquet_profile,
+            metrics=metrics,
+            checkpoint_row_groups=checkpoint_row_groups,
+            on_checkpoint=checkpoint if state_file else None,
+        )
+    else:
+        # 1. Récupérer les données
+        with metrics.stage("fetch"):
+            raw_data = fetch_all_pages(
+                api_url,
+                page_size=page_size,
+                max_pages=max_pages,
+                concurrency=concurrency,
+                cache=cache,
+                limiter=limiter,
+                budget=budget,
+                pagination=paginator,
+                decoder=decoder,
+                metrics=metrics,
+            )
+        metrics.add("fetch", records=len(raw_data))
+
+        # 2. Transformer (colonnaire) et écarter ce qui est déjà ingéré
+        with metrics.stage("transform"):
+            table = filter_new_records(transform_to_table(raw_data), last_id)
+        metrics.add("transform", records=table.num_rows)
 
-    return str(filepath)
+        # 3. Écrire en Parquet
+        with metrics.stage("write"):
+            output_file = write_parquet(table, output_dir, partition_date, parquet_profile)
+        metrics.add(
+            "write",
+            records=table.num_rows,
+            bytes=Path(output_file).stat().st_size if output_file else 0,
+        )
+        outcome = {
+            "output_file": output_file,
+            "records_count": table.num_rows,
+            "fetched_count": len(raw_data) + decoder.malformed,
+            "max_id": _max_id(table, last_id),
+        }
+
+    throttling = {**limiter.snapshot(), **budget.snapshot()}
+    metrics.add("fetch", retries=throttling["retries"])
+    result = {
+        "output_file": outcome["output_file"],
+        "records_count": outcome["records_count"],
+        "throttling": throttling,
+        "metrics": metrics.snapshot(),
+    }
+
+    if fast_decode:
+        result["malformed_records"] = decoder.malformed
+
+    if cache is not None:
+        result["cache"] = {**cache.stats, "evicted": cache.evict()}
+
+    if state_file:
+        checkpoint(outcome)
+        result["watermark"] = watermark
+
+    return result
+
+
+def expand_dates(start_date: str, end_date: str) -> list[str]:
+    """Liste les dates (YYYY-MM-DD) de start_date à end_date incluses."""
+    start = datetime.strptime(start_date, "%Y-%m-%d").date()
+    end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    if end < start:
+        raise ValueError(f"end date {end_date} is before start date {start_date}")
+    return [
+        (start + timedelta(days=offset)).isoformat()
+        for offset in range((end - start).days + 1)
+    ]
+
+
+def ingest_partition(options: dict[str, Any], partition_date: str) -> dict[str, Any]:
+    """
+    Unité de travail d'une partition journalière (exécutable dans un pool).
+
+    `{date}` dans l'URL de l'API est remplacé par la date de la partition.
+    Les erreurs sont capturées dans le résultat pour que l'échec d'un jour
+    n'interrompe pas les autres.
+
+    Args:
+        options: Arguments nommés de `ingest` (hors partition_date)
+        partition_date: Date de la partition (YYYY-MM-DD)
+
+    Returns:
+        Dict avec 'partition_date', 'status', 'records_count',
+        'output_file', 'duration_seconds' (et 'error' en cas d'échec)
+    """
+    options = dict(options)
+    options["api_url"] = options["api_url"].replace("{date}", partition_date)
+    started = time.perf_counter()
+
+    try:
+        outcome = ingest(partition_date=partition_date, **options)
+        result = {"partition_date": partition_date, "status": "success", **outcome}
+    except Exception as e:
+        logger.exception("Ingestion failed for partition %s", partition_date)
+        result = {
+            "partition_date": partition_date,
+            "status": "error",
+            "records_count": 0,
+            "output_file": None,
+            "error": str(e),
+        }
+
+    result["duration_seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def ingest_range(
+    options: dict[str, Any],
+    dates: list[str],
+    workers: int = DEFAULT_WORKERS,
+) -> list[dict[str, Any]]:
+    """
+    Ingère chaque jour de la plage dans sa propre partition Hive.
+
+    Avec workers > 1, les partitions sont réparties sur un pool de
+    processus ; les résultats sont renvoyés dans l'ordre des dates.
+    """
+    if workers <= 1 or len(dates) <= 1:
+        return [ingest_partition(options, day) for day in dates]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(dates))) as executor:
+        futures = [executor.submit(ingest_partition, options, day) for day in dates]
+        return [future.result() for future in futures]
 
 
 # =============================================================================
@@ -242,28 +2120,104 @@ def write_parquet(
 # =============================================================================
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse les arguments CLI."""
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse les arguments CLI (`argv` par défaut : sys.argv[1:])."""
     parser = argparse.ArgumentParser(
+        prog=Path(__file__).name,
         description="Ingestion incrémentale depuis une API paginée",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Exemples:
   python ingest_api.py --start-date 2024-01-01 --end-date 2024-01-01
   python ingest_api.py --start-date 2024-01-01 --end-date 2024-01-31 --output-dir ./bronze
+  python ingest_api.py --start-date 2024-01-01 --end-date 2024-01-01 --concurrency 8
+  python ingest_api.py --start-date 2024-01-01 --end-date 2024-01-31 --stream --concurrency 4
+  python ingest_api.py --date 2024-01-01 --state-file state.json
+  python ingest_api.py --date 2024-01-01 --state-file state.json --stream --checkpoint-row-groups 50
+  python ingest_api.py --start-date 2024-01-01 --end-date 2024-01-31 --workers 4 \\
+      --api-url "https://api.example.com/events?day={date}"
+  python ingest_api.py --date 2024-01-01 --cache-dir ./.http_cache
+  python ingest_api.py --date 2024-01-01 --concurrency 16 --rate-limit 20
+  python ingest_api.py --date 2024-01-01 --pagination keyset --keyset-param id_gt
+  python ingest_api.py --date 2024-01-01 --parquet-profile scan-optimized
         """,
     )
 
     parser.add_argument(
         "--start-date",
-        required=True,
         help="Date de début (YYYY-MM-DD)",
     )
     parser.add_argument(
         "--end-date",
-        required=True,
         help="Date de fin (YYYY-MM-DD)",
     )
+    parser.add_argument(
+        "--date",
+        help="Raccourci pour --start-date X --end-date X",
+    )
+    parser.add_argument(
+        "--state-file",
+        help=(
+            "Fichier d'état JSON pour l'ingestion incrémentale (watermark). "
+            "Le watermark avance en fin de run, ou après chaque fichier "
+            "publié avec --stream --checkpoint-row-groups"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=(
+            "Nombre de partitions journalières ingérées en parallèle "
+            f"(processus, default: {DEFAULT_WORKERS})"
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Répertoire du cache disque des réponses HTTP (ETag/Last-Modified)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_CACHE_MAX_MB,
+        help=f"Taille maximale du cache en Mo (default: {DEFAULT_CACHE_MAX_MB})",
+    )
+    parser.add_argument(
+        "--cache-max-age-hours",
+        type=float,
+        default=DEFAULT_CACHE_MAX_AGE_HOURS,
+        help=(
+            "Âge maximal d'une entrée non utilisée, en heures "
+            f"(default: {DEFAULT_CACHE_MAX_AGE_HOURS})"
+        ),
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Débit maximal en requêtes/seconde (token bucket, optionnel)",
+    )
+    parser.add_argument(
+        "--latency-target-ms",
+        type=float,
+        default=None,
+        help="Latence au-delà de laquelle la concurrence est réduite (optionnel)",
+    )
+    parser.add_argument(
+        "--retry-budget",
+        type=float,
+        default=DEFAULT_RETRY_BUDGET_RATIO,
+        help=(
+            "Part maximale de retries par rapport aux requêtes émises avant "
+            f"d'ouvrir le disjoncteur (default: {DEFAULT_RETRY_BUDGET_RATIO})"
+        ),
+    )
+    parser.add_argument(
+        "--retry-budget-min",
+        type=int,
+        default=DEFAULT_RETRY_BUDGET_MIN,
+        help=f"Nombre de retries toujours autorisés (default: {DEFAULT_RETRY_BUDGET_MIN})",
+    )
     parser.add_argument(
         "--output-dir",
         default=DEFAULT_OUTPUT_DIR,
@@ -272,7 +2226,10 @@ Exemples:
     parser.add_argument(
         "--api-url",
         default=DEFAULT_API_URL,
-        help=f"URL de l'API (default: {DEFAULT_API_URL})",
+        help=(
+            f"URL de l'API (default: {DEFAULT_API_URL}) ; "
+            "'{date}' est remplacé par la date de chaque partition"
+        ),
     )
     parser.add_argument(
         "--page-size",
@@ -286,13 +2243,135 @@ Exemples:
         default=None,
         help="Limite du nombre de pages (optionnel)",
     )
+    parser.add_argument(
+        "--pagination",
+        choices=PAGINATION_MODES,
+        default=DEFAULT_PAGINATION,
+        help=(
+            "Stratégie de pagination : offset (?_page=N), cursor (jeton dans "
+            "la réponse), link (en-tête Link rel=next), keyset (?id_gt=<id>) "
+            f"(default: {DEFAULT_PAGINATION})"
+        ),
+    )
+    parser.add_argument(
+        "--data-field",
+        help="Champ contenant les enregistrements si la réponse est un objet (default: data)",
+    )
+    parser.add_argument(
+        "--cursor-param",
+        default="cursor",
+        help="Mode cursor : paramètre de requête du jeton (default: cursor)",
+    )
+    parser.add_argument(
+        "--cursor-field",
+        default="next_cursor",
+        help="Mode cursor : champ de la réponse contenant le jeton suivant (default: next_cursor)",
+    )
+    parser.add_argument(
+        "--keyset-param",
+        default="id_gt",
+        help="Mode keyset : paramètre de requête 'id supérieur à' (default: id_gt)",
+    )
+    parser.add_argument(
+        "--fast-decode",
+        action="store_true",
+        help=(
+            "Décode les pages directement dans le schéma (id, userId, title, "
+            "body) avec msgspec si disponible ; écarte et compte les "
+            "enregistrements invalides"
+        ),
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=(
+            "Nombre de pages récupérées en parallèle sur une session "
+            f"keep-alive (default: {DEFAULT_CONCURRENCY})"
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Écrit chaque page en row group Parquet au fil de l'eau (mémoire bornée)",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help=(
+            "Mode --stream : pages en attente entre récupération et écriture "
+            f"(default: {DEFAULT_QUEUE_SIZE})"
+        ),
+    )
+    parser.add_argument(
+        "--checkpoint-row-groups",
+        type=int,
+        help=(
+            "Mode --stream : publie un fichier Parquet tous les N row groups "
+            "et avance le watermark de --state-file après chacun "
+            "(default: un fichier par run)"
+        ),
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help=(
+            "Écrit les métriques du run au format Prometheus "
+            "(textfile collector de node_exporter, ex. /var/lib/node_exporter/ingest.prom)"
+        ),
+    )
+    parser.add_argument(
+        "--log-page-every",
+        type=int,
+        default=DEFAULT_LOG_PAGE_EVERY,
+        help=(
+            "Ne logge qu'un message par page sur N (1 = toutes les pages, "
+            f"default: {DEFAULT_LOG_PAGE_EVERY})"
+        ),
+    )
+    parser.add_argument(
+        "--parquet-profile",
+        choices=sorted(PARQUET_PROFILES),
+        default=DEFAULT_PARQUET_PROFILE,
+        help=(
+            "Layout du fichier Parquet : compression, row groups, tri, "
+            f"dictionnaires, bloom filters (default: {DEFAULT_PARQUET_PROFILE})"
+        ),
+    )
 
-    return parser.parse_args()
+    args = parser.parse_args(argv)
 
+    if args.date:
+        if args.start_date or args.end_date:
+            parser.error("--date cannot be combined with --start-date/--end-date")
+        args.start_date = args.end_date = args.date
+    elif not (args.start_date and args.end_date):
+        parser.error("either --date or both --start-date and --end-date are required")
 
-def main() -> None:
-    """Point d'entrée principal."""
-    args = parse_args()
+    if min(args.concurrency, args.queue_size, args.workers, args.log_page_every) < 1:
+        parser.error("--concurrency, --queue-size, --workers and --log-page-every must be >= 1")
+    if args.checkpoint_row_groups is not None:
+        if not args.stream:
+            parser.error("--checkpoint-row-groups requires --stream")
+        if args.checkpoint_row_groups < 1:
+            parser.error("--checkpoint-row-groups must be >= 1")
+
+    return args
+
+
+def run(argv: list[str] | None = None) -> tuple[dict[str, Any], int]:
+    """
+    Exécute une ingestion avec les arguments de la CLI.
+
+    Utilisé par `main` et par le service de workers (`worker_service.py`),
+    qui garde les modules chargés entre les jobs.
+
+    Returns:
+        (résultat JSON pour l'orchestrateur, code de sortie)
+    """
+    args = parse_args(argv)
+    set_sampling(page_logger.name, args.log_page_every)
+    started = time.perf_counter()
 
     logger.info(
         "Starting ingestion",
@@ -304,35 +2383,73 @@ def main() -> None:
     )
 
     try:
-        # 1. Récupérer les données
-        raw_data = fetch_all_pages(
-            args.api_url,
-            page_size=args.page_size,
-            max_pages=args.max_pages,
-        )
+        dates = expand_dates(args.start_date, args.end_date)
+        if args.state_file and len(dates) > 1 and "{date}" not in args.api_url:
+            raise ValueError(
+                "--state-file with a date range requires '{date}' in --api-url "
+                "(one watermark per partition)"
+            )
+
+        options = {
+            "api_url": args.api_url,
+            "output_dir": args.output_dir,
+            "page_size": args.page_size,
+            "max_pages": args.max_pages,
+            "concurrency": args.concurrency,
+            "stream": args.stream,
+            "queue_size": args.queue_size,
+            "state_file": args.state_file,
+            "cache_dir": args.cache_dir,
+            "cache_max_mb": args.cache_max_mb,
+            "cache_max_age_hours": args.cache_max_age_hours,
+            "rate_limit": args.rate_limit,
+            "latency_target_ms": args.latency_target_ms,
+            "retry_budget_ratio": args.retry_budget,
+            "retry_budget_min": args.retry_budget_min,
+            "pagination": args.pagination,
+            "data_field": args.data_field,
+            "cursor_param": args.cursor_param,
+            "cursor_field": args.cursor_field,
+            "keyset_param": args.keyset_param,
+            "fast_decode": args.fast_decode,
+            "parquet_profile": args.parquet_profile,
+            "checkpoint_row_groups": args.checkpoint_row_groups,
+        }
+        partitions = ingest_range(options, dates, workers=args.workers)
 
-        # 2. Transformer
-        transformed_data = transform_data(raw_data)
+        # Résultat JSON pour orchestrateur (n8n/Airflow)
+        failed = [p for p in partitions if p["status"] != "success"]
+        if not failed:
+            status = "success"
+        elif len(failed) < len(partitions):
+            status = "partial"
+        else:
+            status = "error"
 
-        # 3. Écrire en Parquet
-        output_file = write_parquet(
-            transformed_data,
-            args.output_dir,
-            args.start_date,
-        )
-
-        # 4. Résultat JSON pour orchestrateur (n8n/Airflow)
         result = {
-            "status": "success",
-            "records_count": len(transformed_data),
-            "output_file": output_file,
+            "status": status,
+            "records_count": sum(p["records_count"] for p in partitions),
+            "output_file": partitions[0]["output_file"] if len(partitions) == 1 else None,
             "start_date": args.start_date,
             "end_date": args.end_date,
+            "partitions_count": len(partitions),
+            "failed_partitions": [p["partition_date"] for p in failed],
+            "partitions": partitions,
             "ingestion_timestamp": datetime.utcnow().isoformat(),
         }
+        if len(partitions) == 1 and "watermark" in partitions[0]:
+            result["watermark"] = partitions[0]["watermark"]
 
-        # Sortie standard = JSON pour l'orchestrateur
-        print(json.dumps(result))
+        # Métriques agrégées : étapes cumulées sur les partitions, durée et
+        # pic mémoire du run (processus principal ou worker le plus gros)
+        metrics = merge_metrics([p["metrics"] for p in partitions if "metrics" in p])
+        metrics["wall_seconds"] = round(time.perf_counter() - started, 3)
+        metrics["peak_rss_mb"] = max(peak_rss_mb(), peak_rss_mb(children=True))
+        result["metrics"] = metrics
+        if args.metrics_file:
+            write_prometheus(args.metrics_file, "ingest_api", metrics, success=not failed)
+
+        return result, 1 if failed else 0
 
     except Exception as e:
         logger.exception("Ingestion failed")
@@ -343,8 +2460,23 @@ def main() -> None:
             "start_date": args.start_date,
             "end_date": args.end_date,
         }
-        print(json.dumps(result))
-        sys.exit(1)
+        if args.metrics_file:
+            write_prometheus(
+                args.metrics_file,
+                "ingest_api",
+                {"wall_seconds": round(time.perf_counter() - started, 3)},
+                success=False,
+            )
+        return result, 1
+
+
+def main() -> None:
+    """Point d'entrée principal."""
+    result, exit_code = run()
+
+    # Sortie standard = JSON pour l'orchestrateur
+    print(json.dumps(result))
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Profil d'un dataset ou d'une période à partir des sidecars de profil.
+
+`validate_data.py --sidecar` écrit à côté de chaque fichier Parquet un
+sidecar `<fichier>.profile.json` (comptes, nulls, moments, sketches de
+quantiles, de cardinalité et de valeurs fréquentes). Ce script fusionne
+ces sidecars par partition puis sur toute la période, sans relire les
+fichiers de données, et compare chaque partition à la précédente (dérive).
+
+Usage:
+    python merge_profiles.py --date 2024-01-31
+    python merge_profiles.py --start-date 2024-01-01 --end-date 2024-01-31
+    python merge_profiles.py --all --fail-on-drift
+
+Exit codes:
+    0 = profil produit, 1 = dérive au-delà des seuils (avec --fail-on-drift),
+    2 = erreur (aucun sidecar exploitable)
+"""
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from compact_bronze import DEFAULT_INPUT_DIR, find_partitions, list_data_files
+from ingest_api import expand_dates
+from pipeline_logging import setup_logging
+from sketches import ColumnSketch
+from validate_data import read_sidecar, sketch_profile
+
+# =============================================================================
+# Configuration du logging
+# =============================================================================
+
+logger = setup_logging("merge_profiles")
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+# Seuils d'alerte de dérive d'une partition par rapport à la précédente
+DRIFT_THRESHOLDS = {
+    "row_count_change_pct": 50.0,  # variation du nombre de lignes (%)
+    "null_rate_delta_pct": 5.0,  # variation du taux de nulls (points de %)
+    "mean_shift_std": 1.0,  # déplacement de la moyenne (en écarts-types précédents)
+    "median_shift_iqr": 1.0,  # déplacement de la médiane (en écarts interquartiles précédents)
+    "distinct_ratio": 2.0,  # cardinalité multipliée ou divisée par plus que ce facteur
+}
+
+
+# =============================================================================
+# Fusion des sidecars
+# =============================================================================
+
+
+def merge_sketches(
+    target: dict[str, ColumnSketch],
+    sketches: dict[str, ColumnSketch],
+) -> None:
+    """Fusionne des sketches par colonne dans `target` (colonnes réunies)."""
+    for col, sketch in sketches.items():
+        if col in target:
+            target[col].merge(sketch)
+        else:
+            target[col] = sketch
+
+
+def load_partition(partition_dir: Path) -> dict[str, Any]:
+    """
+    Fusionne les sidecars des fichiers d'une partition.
+
+    Returns:
+        Dict avec 'partition', 'files', 'row_count', 'dtypes', 'sketches' et
+        'missing_sidecars' (fichiers sans sidecar à jour, non profilés)
+    """
+    partition: dict[str, Any] = {
+        "partition": partition_dir.name,
+        "files": 0,
+        "row_count": 0,
+        "dtypes": {},
+        "sketches": {},
+        "missing_sidecars": [],
+    }
+    for path in list_data_files(partition_dir):
+        cached = read_sidecar(path)
+        if cached is None:
+            partition["missing_sidecars"].append(str(path))
+            continue
+        row_count, dtypes, sketches = cached
+        partition["files"] += 1
+        partition["row_count"] += row_count
+        partition["dtypes"] = {**dtypes, **partition["dtypes"]}
+        merge_sketches(partition["sketches"], sketches)
+    return partition
+
+
+# =============================================================================
+# Dérive
+# =============================================================================
+
+
+def _null_rate(profile: dict[str, Any], col: str) -> float:
+    if not profile["row_count"]:
+        return 0.0
+    return profile["null_counts"][col] / profile["row_count"] * 100
+
+
+def column_drift(previous: dict[str, Any], current: dict[str, Any], col: str) -> dict[str, Any]:
+    """Indicateurs de dérive d'une colonne présente dans les deux profils."""
+    drift: dict[str, Any] = {
+        "null_rate_delta_pct": round(_null_rate(current, col) - _null_rate(previous, col), 3),
+    }
+
+    before = previous["distinct_counts"][col]["estimate"]
+    after = current["distinct_counts"][col]["estimate"]
+    drift["distinct_ratio"] = round(after / before, 3) if before else None
+
+    prev_stats = previous.get("numeric_stats", {}).get(col)
+    cur_stats = current.get("numeric_stats", {}).get(col)
+    if prev_stats and cur_stats and prev_stats["count"] and cur_stats["count"]:
+        std = prev_stats["std"]
+        drift["mean_shift_std"] = (
+            round((cur_stats["mean"] - prev_stats["mean"]) / std, 3) if std else None
+        )
+        iqr = prev_stats["75%"] - prev_stats["25%"]
+        drift["median_shift_iqr"] = (
+            round((cur_stats["50%"] - prev_stats["50%"]) / iqr, 3) if iqr else None
+        )
+    return drift
+
+
+def drift_report(
+    previous: dict[str, Any],
+    current: dict[str, Any],
+    thresholds: dict[str, float] = DRIFT_THRESHOLDS,
+) -> dict[str, Any]:
+    """
+    Compare le profil d'une partition à celui de la partition précédente.
+
+    Returns:
+        Dict avec 'row_count_change_pct', 'columns_added', 'columns_removed',
+        'columns' (indicateurs par colonne) et 'alerts' (seuils dépassés)
+    """
+    alerts = []
+    before, after = previous["row_count"], current["row_count"]
+    row_change = round((after - before) / before * 100, 3) if before else None
+    if row_change is not None and abs(row_change) > thresholds["row_count_change_pct"]:
+        alerts.append(f"Row count changed by {row_change}% ({before} -> {after})")
+
+    added = [col for col in current["columns"] if col not in previous["columns"]]
+    removed = [col for col in previous["columns"] if col not in current["columns"]]
+    if added:
+        alerts.append(f"Columns added: {added}")
+    if removed:
+        alerts.append(f"Columns removed: {removed}")
+
+    columns = {}
+    for col in current["columns"]:
+        if col not in previous["columns"]:
+            continue
+        drift = column_drift(previous, current, col)
+        columns[col] = drift
+
+        if abs(drift["null_rate_delta_pct"]) > thresholds["null_rate_delta_pct"]:
+            alerts.append(f"Column '{col}' null rate changed by {drift['null_rate_delta_pct']} points")
+        ratio = drift["distinct_ratio"]
+        limit = thresholds["distinct_ratio"]
+        if ratio is not None and (ratio > limit or ratio < 1 / limit):
+            alerts.append(f"Column '{col}' distinct count changed by a factor of {ratio}")
+        for key, label in (("mean_shift_std", "mean"), ("median_shift_iqr", "median")):
+            shift = drift.get(key)
+            if shift is not None and abs(shift) > thresholds[key]:
+                alerts.append(f"Column '{col}' {label} shifted by {shift} ({key})")
+
+    return {
+        "row_count_change_pct": row_change,
+        "columns_added": added,
+        "columns_removed": removed,
+        "columns": columns,
+        "alerts": alerts,
+    }
+
+
+# =============================================================================
+# Profil de la période
+# =============================================================================
+
+
+def merge_profiles(
+    input_dir: str,
+    dates: list[str] | None = None,
+    thresholds: dict[str, float] = DRIFT_THRESHOLDS,
+) -> dict[str, Any]:
+    """
+    Profil fusionné des partitions demandées et dérive partition par partition.
+
+    La première partition demandée est comparée à la partition existante
+    qui la précède (hors période), si elle a des sidecars.
+    """
+    all_partitions = find_partitions(input_dir)
+    selected = find_partitions(input_dir, dates) if dates is not None else all_partitions
+    logger.info("Merging profiles of %d partitions", len(selected))
+
+    merged_sketches: dict[str, ColumnSketch] = {}
+    merged_dtypes: dict[str, str] = {}
+    merged_rows = 0
+    missing: list[str] = []
+    partitions = []
+    drift = []
+    previous_profile = None
+
+    first = all_partitions.index(selected[0]) if selected else 0
+    if first > 0:
+        loaded = load_partition(all_partitions[first - 1])
+        if loaded["files"]:
+            previous_profile = sketch_profile(loaded["row_count"], loaded["dtypes"], loaded["sketches"])
+            previous_name = loaded["partition"]
+
+    for partition_dir in selected:
+        loaded = load_partition(partition_dir)
+        missing.extend(loaded["missing_sidecars"])
+        summary = {
+            "partition": loaded["partition"],
+            "files_profiled": loaded["files"],
+            "missing_sidecars": len(loaded["missing_sidecars"]),
+            "row_count": loaded["row_count"],
+        }
+        partitions.append(summary)
+        if not loaded["files"]:
+            logger.warning("No up-to-date sidecar in %s", loaded["partition"])
+            continue
+
+        # Profil de la partition avant fusion (les sketches sont fusionnés en place)
+        profile = sketch_profile(loaded["row_count"], loaded["dtypes"], loaded["sketches"])
+        if previous_profile is not None:
+            report = drift_report(previous_profile, profile, thresholds)
+            drift.append({"partition": loaded["partition"], "previous": previous_name, **report})
+            for alert in report["alerts"]:
+                logger.warning("%s: %s", loaded["partition"], alert)
+        previous_profile, previous_name = profile, loaded["partition"]
+
+        merged_rows += loaded["row_count"]
+        merged_dtypes = {**loaded["dtypes"], **merged_dtypes}
+        merge_sketches(merged_sketches, loaded["sketches"])
+
+    return {
+        "partitions_count": len(partitions),
+        "partitions": partitions,
+        "missing_sidecars": missing,
+        "profile": sketch_profile(merged_rows, merged_dtypes, merged_sketches) if merged_sketches else None,
+        "drift": drift,
+        "drift_alerts": sum(len(d["alerts"]) for d in drift),
+    }
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse les arguments CLI."""
+    parser = argparse.ArgumentParser(
+        description="Profil d'un dataset ou d'une période à partir des sidecars de profil",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemples:
+  python merge_profiles.py --date 2024-01-31
+  python merge_profiles.py --start-date 2024-01-01 --end-date 2024-01-31
+  python merge_profiles.py --all --fail-on-drift
+
+Les sidecars sont écrits par `validate_data.py --sidecar` ; les fichiers
+sans sidecar à jour sont listés dans 'missing_sidecars' et ignorés.
+        """,
+    )
+
+    parser.add_argument(
+        "--input-dir",
+        default=DEFAULT_INPUT_DIR,
+        help=f"Racine de la couche bronze (default: {DEFAULT_INPUT_DIR})",
+    )
+    parser.add_argument("--date", help="Partition à profiler (YYYY-MM-DD)")
+    parser.add_argument("--start-date", help="Date de début (YYYY-MM-DD)")
+    parser.add_argument("--end-date", help="Date de fin (YYYY-MM-DD)")
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Profiler toutes les partitions",
+    )
+    parser.add_argument(
+        "--fail-on-drift",
+        action="store_true",
+        help="Code de sortie 1 si une dérive dépasse les seuils",
+    )
+
+    args = parser.parse_args()
+
+    if args.all and (args.date or args.start_date or args.end_date):
+        parser.error("--all cannot be combined with --date or --start-date/--end-date")
+    if args.date:
+        if args.start_date or args.end_date:
+            parser.error("--date cannot be combined with --start-date/--end-date")
+        args.start_date = args.end_date = args.date
+    elif not args.all and not (args.start_date and args.end_date):
+        parser.error("one of --date, --start-date/--end-date or --all is required")
+
+    return args
+
+
+def main() -> None:
+    """Point d'entrée principal."""
+    args = parse_args()
+
+    try:
+        dates = None if args.all else expand_dates(args.start_date, args.end_date)
+        report = merge_profiles(args.input_dir, dates)
+    except Exception as e:
+        logger.exception("Profile merge failed")
+        print(json.dumps({"status": "error", "error": str(e)}))
+        sys.exit(2)
+
+    if report["profile"] is None:
+        result = {
+            "status": "error",
+            "error": f"No up-to-date profile sidecar under {args.input_dir}",
+            **report,
+        }
+        print(json.dumps(result, indent=2))
+        sys.exit(2)
+
+    result = {
+        "status": "partial" if report["missing_sidecars"] else "success",
+        **report,
+        "merged_at": datetime.utcnow().isoformat(),
+    }
+    print(json.dumps(result, indent=2))
+
+    if args.fail_on_drift and report["drift_alerts"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Logging structuré partagé par les scripts du pipeline.
+
+Les logs sont écrits en JSON (une ligne par message) sur stderr. Le
+formatage et l'écriture sont faits par un thread d'écoute
+(`QueueListener`) : le thread qui logge ne fait que déposer le record
+dans une file. Les champs passés via `extra=` sont inclus dans le JSON.
+
+`setup_logging` est idempotent : l'appeler plusieurs fois (import dans
+Airflow, appels successifs) n'ajoute pas de handler en double.
+
+Usage:
+    from pipeline_logging import setup_logging
+
+    logger = setup_logging("ingest_api")
+    logger.info("Fetched %d records", count, extra={"url": url})
+"""
+import atexit
+import json
+import logging
+import multiprocessing.util
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributs standard d'un LogRecord : tout le reste vient de `extra=`
+_RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", (), None))
+) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formateur JSON pour logs structurés, champs `extra` inclus."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_entry = {
+            # Horodatage de l'appel, pas de l'écriture différée
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "function": record.funcName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in log_entry:
+                log_entry[key] = value
+        if record.exc_info:
+            log_entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log_entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Ne laisse passer qu'un message sur `every` (les WARNING et plus
+    passent toujours).
+
+    Destiné aux loggers des messages par page : le coût d'un message
+    filtré se limite à la création du record, le message n'est jamais
+    formaté.
+    """
+
+    def __init__(self, every: int) -> None:
+        super().__init__()
+        self.every = max(int(every), 1)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.every == 1:
+            return True
+        with self._lock:
+            self._count += 1
+            keep = self._count % self.every == 1
+        if keep:
+            record.sampled_every = self.every
+        return keep
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler qui transmet le record tel quel.
+
+    `QueueHandler.prepare` formate le message sur le thread appelant (pour
+    pouvoir pickler le record) ; la file est ici en mémoire, le formatage
+    est donc laissé au thread d'écoute.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_lock = threading.Lock()
+_handler: _DeferredQueueHandler | None = None
+_listener: QueueListener | None = None
+
+
+def _start_listener() -> None:
+    """Démarre le thread d'écoute qui formate et écrit sur stderr."""
+    global _listener
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(JsonFormatter())
+    _listener = QueueListener(_handler.queue, stream_handler)
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    """Vide la file et arrête le thread d'écoute."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_after_fork() -> None:
+    """
+    Dans un processus enfant (ProcessPoolExecutor), le thread d'écoute du
+    parent n'existe pas : nouvelle file, nouveau thread, vidés à la sortie
+    du worker.
+    """
+    global _listener
+    if _handler is None:
+        return
+    _listener = None
+    _handler.queue = queue.SimpleQueue()
+    _start_listener()
+    # Les workers multiprocessing sortent par os._exit : atexit ne tourne pas
+    multiprocessing.util.Finalize(None, _stop_listener, exitpriority=100)
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
+atexit.register(_stop_listener)
+
+
+def setup_logging(
+    name: str,
+    level: str = "INFO",
+    sample: dict[str, int] | None = None,
+) -> logging.Logger:
+    """
+    Configure le logger `name` (idempotent).
+
+    Args:
+        name: Nom du logger (nom du script)
+        level: Niveau de log
+        sample: Échantillonnage par logger, ex. {"ingest_api.pages": 10}
+            pour ne garder qu'un message par page sur 10
+
+    Returns:
+        Le logger configuré
+    """
+    global _handler
+    with _lock:
+        if _handler is None:
+            _handler = _DeferredQueueHandler(queue.SimpleQueue())
+            _start_listener()
+
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        if _handler not in logger.handlers:
+            logger.addHandler(_handler)
+
+        for sampled_name, every in (sample or {}).items():
+            set_sampling(sampled_name, every)
+
+    return logger
+
+
+def set_sampling(name: str, every: int) -> None:
+    """Remplace l'échantillonnage du logger `name` (1 = tout garder)."""
+    sampled = logging.getLogger(name)
+    for existing in [f for f in sampled.filters if isinstance(f, SamplingFilter)]:
+        sampled.removeFilter(existing)
+    if every > 1:
+        sampled.addFilter(SamplingFilter(every))
@@ -0,0 +1,183 @@
+"""
+Métriques d'exécution partagées par les scripts du pipeline.
+
+Chaque étape (fetch, transform, write, read, validate...) est chronométrée
+dans un bloc `with metrics.stage("fetch"):` : temps mur, temps CPU et
+compteurs (enregistrements, octets, requêtes, retries). Le résultat est
+ajouté au JSON renvoyé à l'orchestrateur et peut être écrit au format
+Prometheus pour le textfile collector de node_exporter.
+
+Les temps CPU sont ceux du processus (`time.process_time`), threads
+compris : en mode streaming, les étapes qui se recouvrent se partagent le
+même temps CPU.
+
+Usage:
+    from pipeline_metrics import PipelineMetrics
+
+    metrics = PipelineMetrics()
+    with metrics.stage("fetch"):
+        data = fetch()
+    metrics.add("fetch", records=len(data))
+    result["metrics"] = metrics.snapshot()
+"""
+import os
+import resource
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+
+class PipelineMetrics:
+    """Temps et compteurs par étape, cumulés (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stages: dict[str, dict[str, float]] = {}
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Chronomètre un bloc ; les passages successifs sont cumulés."""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            self.add(
+                name,
+                wall_seconds=time.perf_counter() - wall,
+                cpu_seconds=time.process_time() - cpu,
+            )
+
+    def add(self, name: str, **counters: float) -> None:
+        """Ajoute des compteurs à une étape (records, bytes, requests, retries...)."""
+        with self._lock:
+            stage = self._stages.setdefault(name, {"wall_seconds": 0.0, "cpu_seconds": 0.0})
+            for key, value in counters.items():
+                stage[key] = stage.get(key, 0) + value
+
+    def snapshot(self) -> dict[str, Any]:
+        """Métriques du run : totaux, pic mémoire et détail par étape."""
+        with self._lock:
+            stages = {name: dict(values) for name, values in self._stages.items()}
+        return {
+            "wall_seconds": round(time.perf_counter() - self._started, 3),
+            "cpu_seconds": round(time.process_time() - self._cpu_started, 3),
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": {name: _finalize_stage(values) for name, values in stages.items()},
+        }
+
+
+def _finalize_stage(values: dict[str, float]) -> dict[str, Any]:
+    """Arrondit les temps et calcule le débit de l'étape."""
+    stage: dict[str, Any] = {
+        key: round(value, 3) if isinstance(value, float) else value
+        for key, value in values.items()
+    }
+    wall = values.get("wall_seconds", 0.0)
+    if "records" in values and wall > 0:
+        stage["records_per_second"] = round(values["records"] / wall, 1)
+    if "bytes" in values and wall > 0:
+        stage["mb_per_second"] = round(values["bytes"] / wall / 1024 / 1024, 3)
+    return stage
+
+
+def peak_rss_mb(children: bool = False) -> float:
+    """Pic de mémoire résidente du processus (ou du plus gros enfant)."""
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss est en kilo-octets sous Linux, en octets sous macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(usage.ru_maxrss / divisor, 1)
+
+
+def merge_metrics(snapshots: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Agrège les métriques de plusieurs partitions.
+
+    Temps et compteurs sont additionnés, le pic mémoire est le maximum ;
+    les débits sont recalculés sur les totaux.
+    """
+    stages: dict[str, dict[str, float]] = {}
+    for snapshot in snapshots:
+        for name, values in snapshot.get("stages", {}).items():
+            merged = stages.setdefault(name, {})
+            for key, value in values.items():
+                if key not in ("records_per_second", "mb_per_second"):
+                    merged[key] = merged.get(key, 0) + value
+    return {
+        "wall_seconds": round(sum(s.get("wall_seconds", 0) for s in snapshots), 3),
+        "cpu_seconds": round(sum(s.get("cpu_seconds", 0) for s in snapshots), 3),
+        "peak_rss_mb": max((s.get("peak_rss_mb", 0) for s in snapshots), default=0),
+        "stages": {name: _finalize_stage(values) for name, values in stages.items()},
+    }
+
+
+def write_prometheus(
+    path: str,
+    job: str,
+    metrics: dict[str, Any],
+    success: bool,
+    labels: dict[str, str] | None = None,
+) -> None:
+    """
+    Écrit les métriques au format texte Prometheus (textfile collector).
+
+    Le fichier est écrit sous un nom temporaire puis renommé : node_exporter
+    ne lit jamais un fichier partiel.
+    """
+    base = {"job": job, **(labels or {})}
+    lines: list[str] = []
+
+    def gauge(name: str, help_text: str, samples: list[tuple[dict[str, str], float]]) -> None:
+        lines.append(f"# HELP pipeline_{name} {help_text}")
+        lines.append(f"# TYPE pipeline_{name} gauge")
+        for extra, value in samples:
+            lines.append(f"pipeline_{name}{{{_labels({**base, **extra})}}} {value}")
+
+    gauge("run_success", "1 si le dernier run a réussi", [({}, int(success))])
+    gauge("run_timestamp_seconds", "Fin du dernier run (epoch)", [({}, round(time.time(), 3))])
+    gauge("run_wall_seconds", "Durée du run", [({}, metrics.get("wall_seconds", 0))])
+    gauge("run_cpu_seconds", "Temps CPU du run", [({}, metrics.get("cpu_seconds", 0))])
+    gauge(
+        "peak_rss_bytes",
+        "Pic de mémoire résidente",
+        [({}, int(metrics.get("peak_rss_mb", 0) * 1024 * 1024))],
+    )
+
+    stages = metrics.get("stages", {})
+    for key, help_text in (
+        ("wall_seconds", "Temps mur cumulé par étape"),
+        ("cpu_seconds", "Temps CPU cumulé par étape"),
+        ("records", "Enregistrements traités par étape"),
+        ("bytes", "Octets lus, téléchargés ou écrits par étape"),
+        ("cached_bytes", "Octets servis par le cache HTTP par étape"),
+        ("records_per_second", "Débit par étape"),
+        ("requests", "Requêtes HTTP par étape"),
+        ("retries", "Retries par étape"),
+    ):
+        samples = [
+            ({"stage": name}, values[key]) for name, values in stages.items() if key in values
+        ]
+        if samples:
+            gauge(f"stage_{key}", help_text, samples)
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f".{target.name}.tmp")
+    tmp_path.write_text("\n".join(lines) + "\n")
+    os.replace(tmp_path, target)
+
+
+def _labels(labels: dict[str, str]) -> str:
+    """Formate des labels Prometheus (valeurs échappées)."""
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def _escape(value: Any) -> str:
+    """Échappe une valeur de label (antislash, guillemet, retour ligne)."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
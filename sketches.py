@@ -0,0 +1,485 @@
+"""
+Sketches fusionnables pour le profilage approché de gros volumes.
+
+Chaque sketch se met à jour lot par lot (tableaux numpy, Series pandas ou
+tableaux Arrow), tient en mémoire bornée quel que soit le nombre de lignes,
+et se fusionne avec un sketch du même type (`merge`) : le sketch de deux
+partitions est celui de leur union. Chaque estimation est accompagnée de
+sa borne d'erreur.
+
+- `HyperLogLog` : nombre de valeurs distinctes (erreur relative ~1.04/√m)
+- `KLLSketch` : quantiles (erreur de rang normalisée ~2.3/k^0.97)
+- `MisraGries` : valeurs les plus fréquentes (sous-estimation ≤ n/(k+1))
+- `Moments` : count, moyenne, écart-type, min et max exacts
+
+Usage:
+    from sketches import HyperLogLog, hash_values
+
+    hll = HyperLogLog()
+    for batch in batches:
+        hll.update(hash_values(batch["id"].dropna()))
+    hll.estimate(), hll.relative_error
+"""
+import base64
+import math
+import zlib
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+DEFAULT_HLL_PRECISION = 14
+DEFAULT_KLL_K = 200
+DEFAULT_TOP_K = 20
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """Finaliseur splitmix64 : répartit les bits de chaque entier 64 bits."""
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+_POWERS = np.ones(1, dtype=np.uint64)
+
+
+def _hash_strings(array: pa.Array) -> np.ndarray:
+    """
+    Hash de chaînes Arrow (sans null) calculé sur les buffers, sans passer
+    par des objets Python : polynôme des octets modulo 2^64, puis splitmix64.
+    """
+    global _POWERS
+    array = array.cast(pa.large_binary())
+    offsets = np.frombuffer(array.buffers()[1], dtype=np.int64)[array.offset : array.offset + len(array) + 1]
+    data = np.frombuffer(array.buffers()[2], dtype=np.uint8)[offsets[0] : offsets[-1]]
+    starts = offsets[:-1] - offsets[0]
+    lengths = np.diff(offsets)
+
+    longest = int(lengths.max(initial=0))
+    if longest > len(_POWERS):
+        _POWERS = np.cumprod(np.full(longest, 1099511628211, dtype=np.uint64))
+        _POWERS = np.concatenate([np.ones(1, dtype=np.uint64), _POWERS[:-1]])
+
+    hashes = np.zeros(len(array), dtype=np.uint64)
+    if len(data):
+        positions = np.arange(len(data)) - np.repeat(starts, lengths)
+        terms = (data.astype(np.uint64) + np.uint64(1)) * _POWERS[positions]
+        non_empty = lengths > 0
+        hashes[non_empty] = np.add.reduceat(terms, starts[non_empty])
+    return _mix64(hashes ^ lengths.astype(np.uint64))
+
+
+def hash_values(values: pd.Series) -> np.ndarray:
+    """
+    Hash 64 bits des valeurs d'une colonne (sans null).
+
+    Les numériques (et booléens) sont hashés en float64, 0.0 et -0.0
+    confondus : une même valeur a le même hash d'un lot à l'autre, que le
+    lot contienne des nulls (colonne entière en float) ou non. Chaînes et
+    dates sont hashées de façon vectorisée, le reste par pandas.
+    """
+    inferred = pd.api.types.infer_dtype(values, skipna=False) if values.dtype == object else None
+    with np.errstate(over="ignore"):
+        # Booléens d'un lot avec nulls : dtype object, même hash que sans null
+        if values.dtype.kind in "iufb" or (len(values) and inferred == "boolean"):
+            return _mix64((values.to_numpy(dtype=np.float64) + 0.0).view(np.uint64))
+        if values.dtype.kind in "mM" and isinstance(values.dtype, np.dtype):
+            return _mix64(values.to_numpy().view(np.uint64))
+        if isinstance(values.dtype, pd.StringDtype) or (len(values) and inferred == "string"):
+            return _hash_strings(pa.array(values, type=pa.large_string()))
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+def hash_array(array: pa.Array | pa.ChunkedArray) -> np.ndarray:
+    """
+    Comme `hash_values`, pour un tableau Arrow (sans null) : mêmes hashs
+    que pour la colonne convertie par pandas, sans la convertir (sauf
+    types rares : dictionnaires, dates avec fuseau, décimaux...).
+    """
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    kind = array.type
+    with np.errstate(over="ignore"):
+        if pa.types.is_integer(kind) or pa.types.is_floating(kind) or pa.types.is_boolean(kind):
+            numbers = array.to_numpy(zero_copy_only=False).astype(np.float64)
+            return _mix64((numbers + 0.0).view(np.uint64))
+        if (pa.types.is_timestamp(kind) and kind.tz is None) or pa.types.is_duration(kind):
+            return _mix64(array.cast(pa.int64()).to_numpy().view(np.uint64))
+        if pa.types.is_string(kind) or pa.types.is_large_string(kind):
+            return _hash_strings(array)
+    return hash_values(array.to_pandas())
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """
+    Nombre de bits significatifs de chaque entier 64 bits (non nul).
+
+    Via l'exposant flottant : l'arrondi en float64 ne fausse le résultat
+    que pour ~2^-53 des valeurs, négligeable pour un estimateur.
+    """
+    return np.frexp(values.astype(np.float64))[1]
+
+
+class HyperLogLog:
+    """Estimateur du nombre de valeurs distinctes (2^precision registres)."""
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION) -> None:
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        """Erreur relative standard de l'estimation."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def update(self, hashes: np.ndarray) -> None:
+        """Ajoute des valeurs (hashs 64 bits, voir `hash_values`)."""
+        if len(hashes) == 0:
+            return
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        # Bit sentinelle : le rang est borné à 64 - precision + 1
+        rest = (hashes << p) | (np.uint64(1) << (p - np.uint64(1)))
+        np.maximum.at(self.registers, index, (65 - _bit_length(rest)).astype(np.uint8))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Fusionne un sketch de même précision."""
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def to_dict(self) -> dict[str, Any]:
+        """État sérialisable en JSON (registres compressés)."""
+        return {
+            "precision": self.precision,
+            "registers": base64.b64encode(zlib.compress(self.registers.tobytes())).decode(),
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict[str, Any]) -> "HyperLogLog":
+        sketch = cls(state["precision"])
+        registers = zlib.decompress(base64.b64decode(state["registers"]))
+        sketch.registers = np.frombuffer(registers, dtype=np.uint8).copy()
+        return sketch
+
+    def estimate(self) -> int:
+        """Nombre estimé de valeurs distinctes."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        empty = int(np.count_nonzero(self.registers == 0))
+        # Petites cardinalités : comptage linéaire des registres vides
+        if estimate <= 2.5 * m and empty:
+            estimate = m * math.log(m / empty)
+        return int(round(estimate))
+
+
+class KLLSketch:
+    """
+    Sketch de quantiles KLL.
+
+    Les valeurs sont gardées dans des compacteurs de poids 2^niveau ; un
+    compacteur plein est trié et n'en garde qu'une valeur sur deux (au
+    hasard : les paires ou les impaires), promue au niveau supérieur.
+    """
+
+    def __init__(self, k: int = DEFAULT_KLL_K, seed: int = 0) -> None:
+        self.k = k
+        self.n = 0
+        self.levels: list[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def rank_error(self) -> float:
+        """Erreur de rang normalisée des quantiles (~99 % de confiance)."""
+        return 2.296 / self.k**0.9723
+
+    def update(self, values: np.ndarray) -> None:
+        """Ajoute des valeurs numériques (sans NaN)."""
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], np.asarray(values, dtype=np.float64)])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> None:
+        """Fusionne un autre sketch (niveau par niveau)."""
+        self.n += other.n
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+
+    def to_dict(self) -> dict[str, Any]:
+        """État sérialisable en JSON (valeurs retenues par niveau)."""
+        return {"k": self.k, "n": self.n, "levels": [level.tolist() for level in self.levels]}
+
+    @classmethod
+    def from_dict(cls, state: dict[str, Any]) -> "KLLSketch":
+        sketch = cls(state["k"])
+        sketch.n = state["n"]
+        sketch.levels = [np.asarray(level, dtype=np.float64) for level in state["levels"]]
+        return sketch
+
+    def quantiles(self, fractions: list[float]) -> list[float | None]:
+        """Valeurs estimées aux rangs demandés (fractions entre 0 et 1)."""
+        items = np.concatenate(self.levels)
+        if len(items) == 0:
+            return [None for _ in fractions]
+        weights = np.concatenate(
+            [np.full(len(level), 2.0**height) for height, level in enumerate(self.levels)]
+        )
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, [q * cumulative[-1] for q in fractions])
+        return [float(items[min(i, len(items) - 1)]) for i in positions]
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 8)
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(self.levels[level])
+                # Nombre impair : la plus grande valeur reste à ce niveau
+                self.levels[level] = items[len(items) - len(items) % 2 :]
+                items = items[: len(items) - len(items) % 2]
+                promoted = items[self._rng.integers(2) :: 2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+
+class MisraGries:
+    """
+    Valeurs fréquentes (résumé de Misra-Gries, k compteurs).
+
+    Les compteurs sont indexés par hash de valeur (voir `hash_values`), la
+    valeur elle-même n'est gardée que pour les compteurs retenus. Les
+    comptes sont sous-estimés d'au plus `max_error` (≤ n/(k+1)) : une
+    valeur présente dans plus de n/(k+1) lignes est toujours retenue.
+    """
+
+    def __init__(self, k: int = DEFAULT_TOP_K) -> None:
+        self.k = k
+        self.n = 0
+        self.max_error = 0
+        self.counters = pd.Series(dtype="int64")
+        self.values: dict[int, Any] = {}
+
+    def update(self, hashes: np.ndarray, values: pd.Series) -> None:
+        """Ajoute des valeurs non nulles et leurs hashs (mêmes positions)."""
+        keys, counts = np.unique(hashes, return_counts=True)
+        self.update_counts(keys, counts, hashes, values)
+
+    def update_counts(
+        self,
+        keys: np.ndarray,
+        counts: np.ndarray,
+        hashes: np.ndarray,
+        values: pd.Series | pa.Array,
+    ) -> None:
+        """Comme `update`, avec les comptes par hash déjà calculés."""
+        if len(keys) == 0:
+            return
+        self.n += int(counts.sum())
+        batch, error = self._reduce(pd.Series(counts, index=keys))
+        for key in batch.index:
+            if key not in self.values:
+                position = int(np.flatnonzero(hashes == key)[0])
+                if isinstance(values, pd.Series):
+                    self.values[key] = values.iloc[position]
+                else:
+                    self.values[key] = values[position].as_py()
+        self._merge_counts(batch, error)
+
+    def merge(self, other: "MisraGries") -> None:
+        """Fusionne un autre résumé (les erreurs s'additionnent)."""
+        self.n += other.n
+        for key, value in other.values.items():
+            self.values.setdefault(key, value)
+        self._merge_counts(other.counters, other.max_error)
+
+    def to_dict(self, encode_value: Any = None) -> dict[str, Any]:
+        """
+        État sérialisable en JSON.
+
+        Args:
+            encode_value: Conversion des valeurs retenues en types JSON
+                (par défaut : scalaires numpy en types Python)
+        """
+        encode_value = encode_value or (lambda value: value.item() if hasattr(value, "item") else value)
+        return {
+            "k": self.k,
+            "n": self.n,
+            "max_error": self.max_error,
+            "counters": [
+                [int(key), int(count), encode_value(self.values[key])]
+                for key, count in self.counters.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict[str, Any]) -> "MisraGries":
+        sketch = cls(state["k"])
+        sketch.n = state["n"]
+        sketch.max_error = state["max_error"]
+        keys = np.array([key for key, _, _ in state["counters"]], dtype=np.uint64)
+        sketch.counters = pd.Series(
+            [count for _, count, _ in state["counters"]], index=keys, dtype="int64"
+        )
+        sketch.values = {key: value for key, (_, _, value) in zip(keys, state["counters"])}
+        return sketch
+
+    def top(self) -> list[tuple[Any, int]]:
+        """(valeur, compte estimé), du plus fréquent au moins fréquent."""
+        counters = self.counters.sort_values(ascending=False, kind="stable")
+        return [(self.values[key], int(count)) for key, count in counters.items()]
+
+    def _reduce(self, counts: pd.Series) -> tuple[pd.Series, int]:
+        """Garde k compteurs : tous sont diminués du (k+1)-ième plus grand."""
+        if len(counts) <= self.k:
+            return counts, 0
+        position = len(counts) - self.k - 1
+        cut = int(np.partition(counts.to_numpy(), position)[position])
+        return counts[counts > cut] - cut, cut
+
+    def _merge_counts(self, counts: pd.Series, error: int) -> None:
+        combined = counts if self.counters.empty else self.counters.add(counts, fill_value=0)
+        combined, cut = self._reduce(combined.astype("int64"))
+        self.counters = combined
+        self.max_error += error + cut
+        self.values = {key: self.values[key] for key in combined.index}
+
+
+class Moments:
+    """Count, moyenne, variance (algorithme parallèle de Chan), min et max."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def update(self, values: np.ndarray) -> None:
+        """Ajoute des valeurs numériques (sans NaN)."""
+        if len(values) == 0:
+            return
+        values = np.asarray(values, dtype=np.float64)
+        mean = float(values.mean())
+        self._combine(len(values), mean, float(((values - mean) ** 2).sum()))
+        self.min = float(values.min()) if self.min is None else min(self.min, float(values.min()))
+        self.max = float(values.max()) if self.max is None else max(self.max, float(values.max()))
+
+    def merge(self, other: "Moments") -> None:
+        """Fusionne les moments d'un autre ensemble de valeurs."""
+        if other.count == 0:
+            return
+        self._combine(other.count, other.mean, other.m2)
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"count": self.count, "mean": self.mean, "m2": self.m2, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, state: dict[str, Any]) -> "Moments":
+        moments = cls()
+        moments.count, moments.mean, moments.m2 = state["count"], state["mean"], state["m2"]
+        moments.min, moments.max = state["min"], state["max"]
+        return moments
+
+    @property
+    def std(self) -> float | None:
+        """Écart-type d'échantillon (ddof=1, comme `describe`)."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else None
+
+    def _combine(self, count: int, mean: float, m2: float) -> None:
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+
+class ColumnSketch:
+    """
+    Profil approché d'une colonne : nulls et moments exacts, sketches de
+    cardinalité, de valeurs fréquentes et (colonnes numériques) de quantiles.
+    """
+
+    def __init__(self, numeric: bool, top_k: int = DEFAULT_TOP_K) -> None:
+        self.numeric = numeric
+        self.nulls = 0
+        self.distinct = HyperLogLog()
+        self.top_values = MisraGries(top_k)
+        self.quantiles = KLLSketch() if numeric else None
+        self.moments = Moments() if numeric else None
+
+    def update(self, series: pd.Series) -> None:
+        """Ajoute un lot de valeurs de la colonne."""
+        values = series[series.notna()]
+        self.nulls += len(series) - len(values)
+        hashes = hash_values(values)
+        keys, counts = np.unique(hashes, return_counts=True)
+        self.distinct.update(keys)
+        self.top_values.update_counts(keys, counts, hashes, values)
+        if self.numeric:
+            numbers = values.to_numpy(dtype=np.float64)
+            self.quantiles.update(numbers)
+            self.moments.update(numbers)
+
+    def update_arrow(self, array: pa.Array) -> None:
+        """
+        Comme `update`, pour un lot Arrow tel que pandas le verrait (entiers
+        avec nulls déjà en float64) : mêmes sketches, sans conversion pandas.
+        """
+        values = array.filter(pc.invert(pc.is_null(array, nan_is_null=True)))
+        self.nulls += len(array) - len(values)
+        hashes = hash_array(values)
+        keys, counts = np.unique(hashes, return_counts=True)
+        self.distinct.update(keys)
+        self.top_values.update_counts(keys, counts, hashes, values)
+        if self.numeric:
+            numbers = values.to_numpy(zero_copy_only=False).astype(np.float64)
+            self.quantiles.update(numbers)
+            self.moments.update(numbers)
+
+    def merge(self, other: "ColumnSketch") -> None:
+        """Fusionne le profil de la même colonne sur d'autres lignes."""
+        self.nulls += other.nulls
+        self.distinct.merge(other.distinct)
+        self.top_values.merge(other.top_values)
+        if self.numeric and other.numeric:
+            self.quantiles.merge(other.quantiles)
+            self.moments.merge(other.moments)
+
+    def to_dict(self, encode_value: Any = None) -> dict[str, Any]:
+        """État sérialisable en JSON (voir `to_dict` de chaque sketch)."""
+        state: dict[str, Any] = {
+            "numeric": self.numeric,
+            "nulls": self.nulls,
+            "distinct": self.distinct.to_dict(),
+            "top_values": self.top_values.to_dict(encode_value),
+        }
+        if self.numeric:
+            state["quantiles"] = self.quantiles.to_dict()
+            state["moments"] = self.moments.to_dict()
+        return state
+
+    @classmethod
+    def from_dict(cls, state: dict[str, Any]) -> "ColumnSketch":
+        sketch = cls(state["numeric"], state["top_values"]["k"])
+        sketch.nulls = state["nulls"]
+        sketch.distinct = HyperLogLog.from_dict(state["distinct"])
+        sketch.top_values = MisraGries.from_dict(state["top_values"])
+        if sketch.numeric:
+            sketch.quantiles = KLLSketch.from_dict(state["quantiles"])
+            sketch.moments = Moments.from_dict(state["moments"])
+        return sketch
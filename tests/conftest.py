@@ -0,0 +1,5 @@
+"""Configuration pytest : les scripts du dépôt sont importés comme modules."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,41 @@
+"""Compaction d'une partition bronze pendant que l'ingestion écrit."""
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+import compact_bronze
+from ingest_api import transform_to_table, write_parquet
+
+
+def records(first: int, last: int) -> list[dict]:
+    return [
+        {"id": i, "userId": i % 10 + 1, "title": f"title {i}", "body": "x"}
+        for i in range(first, last + 1)
+    ]
+
+
+def test_file_written_during_compaction_is_kept(tmp_path, monkeypatch):
+    """Un fichier publié juste avant l'échange survit à la compaction."""
+    for first in (1, 101):
+        write_parquet(transform_to_table(records(first, first + 99)), str(tmp_path), "2024-01-01")
+    partition_dir = tmp_path / "partition_date=2024-01-01"
+
+    rename = compact_bronze.os.rename
+    late: list[str] = []
+
+    def ingest_then_rename(src, dst):
+        # Une ingestion publie un delta juste avant que la partition soit déplacée
+        if src == partition_dir and not late:
+            late.append(write_parquet(transform_to_table(records(201, 250)), str(tmp_path), "2024-01-01"))
+        rename(src, dst)
+
+    monkeypatch.setattr(compact_bronze.os, "rename", ingest_then_rename)
+    result = compact_bronze.compact_partition(partition_dir)
+    monkeypatch.undo()
+
+    assert result["status"] == "compacted"
+    files = compact_bronze.list_data_files(partition_dir)
+    ids = sorted(i for path in files for i in pq.read_table(path)["id"].to_pylist())
+    assert ids == list(range(1, 251))
+    assert any(path.name == Path(late[0]).name for path in files)
+    assert not (tmp_path / ".partition_date=2024-01-01.old").exists()
@@ -0,0 +1,46 @@
+"""Comptage des doublons par lots (--chunked) : mêmes résultats que pandas après débordement."""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from validate_data import ArrowDistinctCounter, DistinctCounter, arrow_column
+
+BATCH_SIZE = 1000
+
+
+def columns() -> dict[str, pd.Series]:
+    rng = np.random.default_rng(0)
+    n = 20_000
+    floats = rng.integers(0, 5000, n).astype(float)
+    floats[rng.random(n) < 0.05] = np.nan
+    floats[:4] = [0.0, -0.0, np.nan, -0.0]
+    text = pd.Series(rng.integers(0, 8000, n)).map("value {}".format)
+    text[rng.random(n) < 0.05] = None
+    flags = pd.Series(rng.random(n) < 0.5, dtype=object)
+    flags[rng.random(n) < 0.01] = None
+    return {
+        "int": pd.Series(rng.integers(0, 12_000, n)),
+        "float": pd.Series(floats),
+        "str": text.astype("str"),
+        "bool": flags,
+    }
+
+
+@pytest.mark.parametrize("name", ["int", "float", "str", "bool"])
+@pytest.mark.parametrize("counter_class", [DistinctCounter, ArrowDistinctCounter])
+def test_spilled_count_matches_pandas(name, counter_class):
+    """Budget minuscule : le compteur déborde sur disque et reste exact."""
+    series = columns()[name]
+    counter = counter_class(name, memory_budget_mb=1e-5, expected_rows=len(series))
+    try:
+        for start in range(0, len(series), BATCH_SIZE):
+            batch = series.iloc[start : start + BATCH_SIZE]
+            if counter_class is ArrowDistinctCounter:
+                counter.add(arrow_column(pa.Array.from_pandas(batch), as_float=name == "float"))
+            else:
+                counter.add(batch)
+        assert counter.spilled
+        assert counter.count() == int(series.duplicated().sum())
+    finally:
+        counter.close()
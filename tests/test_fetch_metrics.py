@@ -0,0 +1,59 @@
+"""Métriques de l'étape fetch : octets reçus sur le réseau, pas décompressés."""
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+import ingest_api
+from pipeline_metrics import PipelineMetrics
+
+BODY = json.dumps([{"id": i, "title": "t" * 50} for i in range(500)]).encode()
+GZIPPED = gzip.compress(BODY)
+
+
+class GzipHandler(BaseHTTPRequestHandler):
+    """Corps gzip, avec Content-Length (`/length`) ou en chunked (`/chunked`)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Encoding", "gzip")
+        if self.path == "/chunked":
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(GZIPPED), 500):
+                chunk = GZIPPED[start:start + 500]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(GZIPPED)))
+            self.end_headers()
+            self.wfile.write(GZIPPED)
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GzipHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("path", ["/length", "/chunked"])
+def test_fetch_bytes_count_compressed_body(api, path):
+    metrics = PipelineMetrics()
+    session = ingest_api.create_session(metrics=metrics)
+
+    response = session.get(api + path)
+
+    assert response.content == BODY
+    assert metrics.snapshot()["stages"]["fetch"]["bytes"] == len(GZIPPED)
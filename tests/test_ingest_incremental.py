@@ -0,0 +1,137 @@
+"""Ingestion incrémentale (--state-file) : aucun delta ne doit être perdu."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+import pyarrow.parquet as pq
+import pytest
+
+import ingest_api
+
+
+class PostsHandler(BaseHTTPRequestHandler):
+    """`GET /posts?_page=N&_limit=M` sur `server.records` enregistrements."""
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        query = parse_qs(urlparse(self.path).query)
+        page = int(query.get("_page", ["1"])[0])
+        limit = int(query.get("_limit", ["10"])[0])
+        first = (page - 1) * limit + 1
+        last = min(page * limit, self.server.records)
+        body = json.dumps(
+            [
+                {"id": i, "userId": i % 10 + 1, "title": f"title {i}", "body": "x"}
+                for i in range(first, last + 1)
+            ]
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PostsHandler)
+    server.records = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def partition_ids(output_dir: str) -> list[int]:
+    files = sorted((Path(output_dir) / "partition_date=2024-01-01").glob("*.parquet"))
+    return sorted(i for path in files for i in pq.read_table(path)["id"].to_pylist())
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_two_incremental_runs_keep_every_row(api, tmp_path, stream):
+    """Deux runs dans la même seconde écrivent deux fichiers distincts."""
+    url = f"http://127.0.0.1:{api.server_address[1]}/posts"
+    options = {
+        "output_dir": str(tmp_path / "bronze"),
+        "partition_date": "2024-01-01",
+        "state_file": str(tmp_path / "state.json"),
+        "stream": stream,
+    }
+
+    api.records = 200
+    first = ingest_api.ingest(url, **options)
+    api.records = 1050
+    second = ingest_api.ingest(url, **options)
+
+    assert first["output_file"] != second["output_file"]
+    assert partition_ids(options["output_dir"]) == list(range(1, 1051))
+    assert second["watermark"]["last_id"] == 1050
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_colliding_output_is_not_overwritten(api, tmp_path, monkeypatch, stream):
+    """Un nom de fichier déjà pris fait échouer le run sans avancer le watermark."""
+    url = f"http://127.0.0.1:{api.server_address[1]}/posts"
+    state_file = str(tmp_path / "state.json")
+    target = tmp_path / "bronze" / "partition_date=2024-01-01" / "data_fixed.parquet"
+    target.parent.mkdir(parents=True)
+    monkeypatch.setattr(ingest_api, "_output_filepath", lambda *_: target)
+    options = {
+        "output_dir": str(tmp_path / "bronze"),
+        "partition_date": "2024-01-01",
+        "state_file": state_file,
+        "stream": stream,
+    }
+
+    api.records = 200
+    ingest_api.ingest(url, **options)
+    api.records = 1050
+    with pytest.raises(FileExistsError):
+        ingest_api.ingest(url, **options)
+
+    assert pq.read_table(target)["id"].to_pylist() == list(range(1, 201))
+    assert ingest_api.load_state(state_file)["streams"][url]["last_id"] == 200
+    assert [p.name for p in target.parent.iterdir()] == ["data_fixed.parquet"]
+
+
+def test_stream_checkpoints_survive_a_crash(api, tmp_path, monkeypatch):
+    """Un crash en cours de run garde les fichiers publiés et leur watermark."""
+    url = f"http://127.0.0.1:{api.server_address[1]}/posts"
+    state_file = str(tmp_path / "state.json")
+    options = {
+        "output_dir": str(tmp_path / "bronze"),
+        "partition_date": "2024-01-01",
+        "state_file": state_file,
+        "stream": True,
+        "page_size": 10,
+        "checkpoint_row_groups": 2,
+    }
+    transform = ingest_api.transform_to_table
+    calls = []
+
+    def crash_on_fifth_page(data, *args, **kwargs):
+        calls.append(len(data))
+        if len(calls) == 5:
+            raise RuntimeError("crash")
+        return transform(data, *args, **kwargs)
+
+    api.records = 100
+    monkeypatch.setattr(ingest_api, "transform_to_table", crash_on_fifth_page)
+    with pytest.raises(RuntimeError):
+        ingest_api.ingest(url, **options)
+
+    watermark = ingest_api.load_state(state_file)["streams"][url]
+    assert (watermark["offset"], watermark["last_id"]) == (40, 40)
+    assert partition_ids(options["output_dir"]) == list(range(1, 41))
+
+    monkeypatch.setattr(ingest_api, "transform_to_table", transform)
+    result = ingest_api.ingest(url, **options)
+
+    assert partition_ids(options["output_dir"]) == list(range(1, 101))
+    assert result["watermark"]["offset"] == 100
@@ -0,0 +1,80 @@
+"""Quarantaine (--quarantine-dir) : séparation des lignes et chemins de sortie."""
+import json
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+import validate_data
+
+RULES = {"not_null_columns": ["id"], "unique_columns": ["id"], "value_ranges": {"userId": [1, 10]}}
+
+
+def write_partition(root, rows: int, offset: int = 0) -> None:
+    partition = root / "partition_date=2024-01-01"
+    partition.mkdir(parents=True)
+    df = pd.DataFrame({"id": range(offset, offset + rows), "userId": [5] * rows})
+    df.to_parquet(partition / "data.parquet", index=False)
+
+
+def run(tmp_path, *argv: str) -> tuple[dict, int]:
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps(RULES))
+    return validate_data.run(
+        [*argv, "--rules-file", str(rules_file), "--workers", "1", "--no-cache"]
+    )
+
+
+def test_rows_are_split_with_failed_rules(tmp_path):
+    """Lignes en échec en quarantaine avec leurs règles, les autres conservées."""
+    path = tmp_path / "data.parquet"
+    df = pd.DataFrame({"id": [1.0, 2.0, 2.0, None, 3.0], "userId": [5, 5, 20, 5, 5]})
+    df.to_parquet(path, index=False)
+
+    result, exit_code = run(
+        tmp_path, "--input-file", str(path), "--quarantine-dir", str(tmp_path / "q"),
+        "--max-quarantine-pct", "50",
+    )
+
+    report = result["quarantine"]
+    assert exit_code == 0 and report["rows"] == 2 and report["passing_rows"] == 3
+    assert pq.read_table(report["passing_file"])["id"].to_pylist() == [1.0, 2.0, 3.0]
+    quarantined = pq.read_table(report["quarantine_file"]).to_pylist()
+    assert [row["_failed_rules"] for row in quarantined] == [
+        ["unique_columns:id", "value_ranges:userId"],
+        ["not_null_columns:id"],
+    ]
+
+
+def test_same_partition_from_several_roots_does_not_collide(tmp_path):
+    """Deux racines avec la même partition : deux sorties distinctes, aucune perdue."""
+    write_partition(tmp_path / "ds" / "A", rows=50)
+    write_partition(tmp_path / "ds" / "B", rows=7, offset=1000)
+
+    result, exit_code = run(
+        tmp_path,
+        "--input-file", str(tmp_path / "ds" / "A"), str(tmp_path / "ds" / "B"),
+        "--quarantine-dir", str(tmp_path / "q"),
+    )
+
+    assert exit_code == 0
+    reports = [partition["quarantine"] for partition in result["partitions"]]
+    outputs = [report["passing_file"] for report in reports]
+    assert len(set(outputs)) == 2
+    assert sorted(pq.read_metadata(path).num_rows for path in outputs) == [7, 50]
+    assert all("/A/" in path or "/B/" in path for path in outputs)
+
+
+def test_colliding_outputs_fail(tmp_path):
+    """La même partition désignée deux fois n'écrase pas sa propre sortie."""
+    write_partition(tmp_path / "ds", rows=10)
+    partition = tmp_path / "ds" / "partition_date=2024-01-01"
+
+    result, exit_code = run(
+        tmp_path,
+        "--input-file", str(partition), str(partition / ".." / partition.name),
+        "--quarantine-dir", str(tmp_path / "q"),
+    )
+
+    assert exit_code == 2
+    assert "collide" in result["error"]
+    assert not (tmp_path / "q").exists()
@@ -0,0 +1,50 @@
+"""Cache des résultats de validation : invalidation quand un fichier change."""
+import os
+
+import pandas as pd
+
+import validate_data
+
+
+def write(path, ids: list[int]) -> None:
+    df = pd.DataFrame({"id": ids, "_ingested_at": ["2024-01-01T00:00:00"] * len(ids)})
+    df.to_parquet(path, index=False)
+
+
+def validate(path, cache_dir, *argv: str) -> tuple[dict, int]:
+    return validate_data.run(["--input-file", str(path), "--cache-dir", str(cache_dir), *argv])
+
+
+def test_cache_hit_then_miss_after_file_change(tmp_path):
+    """Un fichier réécrit n'est jamais servi depuis le cache."""
+    path = tmp_path / "data.parquet"
+    write(path, list(range(20)))
+
+    first, _ = validate(path, tmp_path / "cache")
+    second, _ = validate(path, tmp_path / "cache")
+    assert not first["cache"]["hit"]
+    assert second["cache"]["hit"] and second["validation"] == "passed"
+
+    write(path, list(range(19)) + [0])
+    third, exit_code = validate(path, tmp_path / "cache")
+    assert not third["cache"]["hit"]
+    assert exit_code == 1 and third["errors"] == ["Column 'id' has 1 duplicate values"]
+
+
+def test_content_key_survives_touch(tmp_path):
+    """Clé par contenu : un fichier seulement touché reste un hit, un contenu modifié non."""
+    path = tmp_path / "data.parquet"
+    write(path, list(range(20)))
+
+    validate(path, tmp_path / "cache", "--cache-key", "content")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    touched, _ = validate(path, tmp_path / "cache", "--cache-key", "content")
+    assert touched["cache"]["hit"]
+
+    mtime_key, _ = validate(path, tmp_path / "cache")
+    assert not mtime_key["cache"]["hit"]
+
+    write(path, list(range(21)))
+    changed, _ = validate(path, tmp_path / "cache", "--cache-key", "content")
+    assert not changed["cache"]["hit"] and changed["rows"] == 21
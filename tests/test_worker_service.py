@@ -0,0 +1,62 @@
+"""Service de workers : même résultat que la CLI lancée depuis le répertoire du client."""
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+import worker_client
+from worker_service import WorkerHTTPServer, WorkerService
+
+
+@pytest.fixture
+def service_url(tmp_path, monkeypatch):
+    # Le service tourne dans un autre répertoire que le client
+    service_dir = tmp_path / "service"
+    service_dir.mkdir()
+    monkeypatch.chdir(service_dir)
+    service = WorkerService(workers=1, max_queue=1)
+    # Worker du pool démarré (forké) dans le répertoire du service
+    service.executor.submit(os.getcwd).result()
+    server = WorkerHTTPServer(("127.0.0.1", 0), service, token=None)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    service.shutdown()
+
+
+def test_relative_input_resolves_in_client_directory(tmp_path, monkeypatch, service_url):
+    """`--input-file ds` désigne le dossier `ds` du client, pas celui du service."""
+    client_dir = tmp_path / "client"
+    for day in ("2024-01-01", "2024-01-02"):
+        partition = client_dir / "ds" / f"partition_date={day}"
+        partition.mkdir(parents=True)
+        pd.DataFrame({"id": [1, 2], "_ingested_at": ["2024-01-01T00:00:00"] * 2}).to_parquet(
+            partition / "data.parquet", index=False
+        )
+    monkeypatch.chdir(client_dir)
+
+    body, exit_code = worker_client.submit(
+        service_url, "validate", ["--input-file", "ds", "--workers", "2", "--no-cache"], 60, None
+    )
+
+    result = json.loads(body)
+    assert exit_code == 0, result
+    assert result["partitions_count"] == 2 and result["validation"] == "passed"
+
+
+def test_request_without_cwd_is_rejected(service_url):
+    request = urllib.request.Request(
+        f"{service_url}/jobs/validate",
+        data=json.dumps({"args": ["--input-file", "ds"]}).encode(),
+        method="POST",
+    )
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(request, timeout=10)
+    assert error.value.code == 400
+    assert "cwd" in json.loads(error.value.read())["error"]
@@ -3,7 +3,9 @@
 Validation des données ingérées.
 
 Ce script valide les fichiers Parquet selon des règles configurables
-et renvoie un code de sortie approprié pour l'orchestration.
+et renvoie un code de sortie approprié pour l'orchestration. Seules les
+colonnes citées par les règles sont lues, et seulement quand les
+statistiques du footer Parquet ne suffisent pas à conclure.
 
 Usage:
     python validate_data.py --input-file data/bronze/partition_date=2024-01-01/data.parquet
@@ -15,48 +17,35 @@ Exit codes:
     2 - Erreur d'exécution (fichier non trouvé, etc.)
 """
 import argparse
+import glob
+import hashlib
 import json
-import logging
+import math
+import os
 import sys
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from pipeline_logging import setup_logging
+from pipeline_metrics import PipelineMetrics, merge_metrics, peak_rss_mb, write_prometheus
+from sketches import ColumnSketch, hash_array
 
 # =============================================================================
 # Configuration du logging
 # =============================================================================
 
-
-class JsonFormatter(logging.Formatter):
-    """Formateur JSON pour logs structurés."""
-
-    def format(self, record: logging.LogRecord) -> str:
-        log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "level": record.levelname,
-            "logger": record.name,
-            "message": record.getMessage(),
-        }
-        if record.exc_info:
-            log_entry["exception"] = self.formatException(record.exc_info)
-        return json.dumps(log_entry)
-
-
-def setup_logging(level: str = "INFO") -> logging.Logger:
-    """Configure le logging."""
-    logger = logging.getLogger("validate_data")
-    logger.setLevel(level)
-
-    handler = logging.StreamHandler(sys.stderr)
-    handler.setFormatter(JsonFormatter())
-    logger.addHandler(handler)
-
-    return logger
-
-
-logger = setup_logging()
+logger = setup_logging("validate_data")
 
 # =============================================================================
 # Règles de validation par défaut
@@ -73,17 +62,116 @@ DEFAULT_RULES: dict[str, Any] = {
 
 
 # =============================================================================
-# Fonctions de validation
+# Plan de validation
 # =============================================================================
+#
+# Les règles sont compilées en un plan de statistiques par colonne (nulls,
+# dépassements de plage, doublons). Chaque colonne est parcourue une seule
+# fois pour calculer toutes ses statistiques, puis toutes les règles sont
+# évaluées à partir de ces statistiques, sans relire les données.
 
 
-def validate_required_columns(
-    df: pd.DataFrame,
-    required_columns: list[str],
-) -> list[str]:
+def compile_plan(
+    rules: dict[str, Any],
+    profile_columns: list[str] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Compile les règles en statistiques à calculer par colonne.
+
+    Args:
+        rules: Dictionnaire des règles de validation
+        profile_columns: Colonnes dont le profil demande le nombre de nulls
+
+    Returns:
+        {colonne: {"nulls": bool, "ranges": [(min, max), ...], "duplicates": bool}}
+    """
+    plan: dict[str, dict[str, Any]] = {}
+
+    def spec(col: str) -> dict[str, Any]:
+        return plan.setdefault(col, {"nulls": False, "ranges": [], "duplicates": False})
+
+    for col in rules.get("not_null_columns", []):
+        spec(col)["nulls"] = True
+    for col in rules.get("max_null_percentage", {}):
+        spec(col)["nulls"] = True
+    for col in profile_columns or []:
+        spec(col)["nulls"] = True
+    for col in rules.get("unique_columns", []):
+        spec(col)["duplicates"] = True
+    for col, (min_val, max_val) in rules.get("value_ranges", {}).items():
+        bounds = (min_val, max_val)
+        if bounds not in spec(col)["ranges"]:
+            spec(col)["ranges"].append(bounds)
+
+    return plan
+
+
+def compute_column_stats(series: pd.Series, spec: dict[str, Any]) -> dict[str, Any]:
+    """
+    Calcule en une passe les statistiques d'une colonne demandées par le plan.
+
+    Le masque des nulls est calculé une fois et partagé entre le comptage
+    des nulls et les contrôles de plage (qui ignorent les nulls).
+    """
+    stats: dict[str, Any] = {}
+    mask = series.isna() if spec["nulls"] or spec["ranges"] else None
+
+    if spec["nulls"]:
+        stats["null_count"] = int(mask.sum())
+
+    if spec["ranges"]:
+        valid_values = series[~mask]
+        stats["out_of_range"] = {}
+        if len(valid_values) == 0:
+            for bounds in spec["ranges"]:
+                stats["out_of_range"][bounds] = 0
+        else:
+            low, high = valid_values.min(), valid_values.max()
+            for min_val, max_val in spec["ranges"]:
+                # Bornes respectées par le min et le max : aucune valeur hors plage
+                if low >= min_val and high <= max_val:
+                    count = 0
+                else:
+                    count = int(((valid_values < min_val) | (valid_values > max_val)).sum())
+                stats["out_of_range"][(min_val, max_val)] = count
+
+    if spec["duplicates"]:
+        stats["duplicates"] = int(series.duplicated().sum())
+
+    return stats
+
+
+def collect_stats(df: pd.DataFrame | pa.Table, plan: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """
+    Exécute le plan sur un DataFrame (ou une table Arrow, voir
+    `collect_arrow_stats`).
+
+    Returns:
+        Dict avec 'rows', 'columns' et 'column_stats' (colonnes présentes
+        seulement)
+    """
+    if isinstance(df, pa.Table):
+        return collect_arrow_stats(df, plan)
+    return {
+        "rows": len(df),
+        "columns": list(df.columns),
+        "column_stats": {
+            col: compute_column_stats(df[col], spec)
+            for col, spec in plan.items()
+            if col in df.columns
+        },
+    }
+
+
+# =============================================================================
+# Règles de validation
+# =============================================================================
+
+
+def check_required_columns(stats: dict[str, Any], required_columns: list[str]) -> list[str]:
     """Vérifie que toutes les colonnes requises sont présentes."""
     errors = []
-    missing = set(required_columns) - set(df.columns)
+    missing = set(required_columns) - set(stats["columns"])
 
     if missing:
         errors.append(f"Missing required columns: {sorted(missing)}")
@@ -91,91 +179,80 @@ def validate_required_columns(
     return errors
 
 
-def validate_not_null(
-    df: pd.DataFrame,
-    not_null_columns: list[str],
-) -> list[str]:
+def check_not_null(stats: dict[str, Any], not_null_columns: list[str]) -> list[str]:
     """Vérifie qu'il n'y a pas de valeurs nulles dans les colonnes spécifiées."""
     errors = []
 
     for col in not_null_columns:
-        if col not in df.columns:
+        if col not in stats["column_stats"]:
             continue
 
-        null_count = df[col].isna().sum()
+        null_count = stats["column_stats"][col]["null_count"]
         if null_count > 0:
             errors.append(f"Column '{col}' has {null_count} null values")
 
     return errors
 
 
-def validate_unique(
-    df: pd.DataFrame,
-    unique_columns: list[str],
-) -> list[str]:
+def check_unique(stats: dict[str, Any], unique_columns: list[str]) -> list[str]:
     """Vérifie l'unicité des valeurs dans les colonnes spécifiées."""
     errors = []
 
     for col in unique_columns:
-        if col not in df.columns:
+        if col not in stats["column_stats"]:
             continue
 
-        duplicates = df[col].duplicated().sum()
+        duplicates = stats["column_stats"][col]["duplicates"]
         if duplicates > 0:
             errors.append(f"Column '{col}' has {duplicates} duplicate values")
 
     return errors
 
 
-def validate_value_ranges(
-    df: pd.DataFrame,
+def check_value_ranges(
+    stats: dict[str, Any],
     value_ranges: dict[str, tuple[float, float]],
 ) -> list[str]:
-    """Vérifie que les valeurs sont dans les ranges spécifiés."""
+    """Vérifie que les valeurs sont dans les ranges spécifiés (nulls ignorés)."""
     errors = []
 
     for col, (min_val, max_val) in value_ranges.items():
-        if col not in df.columns:
+        if col not in stats["column_stats"]:
             continue
 
-        # Ignorer les nulls pour le range check
-        valid_values = df[col].dropna()
-
-        out_of_range = valid_values[(valid_values < min_val) | (valid_values > max_val)]
-        if len(out_of_range) > 0:
+        out_of_range = stats["column_stats"][col]["out_of_range"][(min_val, max_val)]
+        if out_of_range > 0:
             errors.append(
-                f"Column '{col}' has {len(out_of_range)} values "
+                f"Column '{col}' has {out_of_range} values "
                 f"out of range [{min_val}, {max_val}]"
             )
 
     return errors
 
 
-def validate_min_rows(
-    df: pd.DataFrame,
-    min_rows: int,
-) -> list[str]:
+def check_min_rows(stats: dict[str, Any], min_rows: int) -> list[str]:
     """Vérifie le nombre minimum de lignes."""
     errors = []
 
-    if len(df) < min_rows:
-        errors.append(f"Expected at least {min_rows} rows, got {len(df)}")
+    if stats["rows"] < min_rows:
+        errors.append(f"Expected at least {min_rows} rows, got {stats['rows']}")
 
     return errors
 
 
-def validate_max_null_percentage(
-    df: pd.DataFrame,
+def check_max_null_percentage(
+    stats: dict[str, Any],
     max_null_percentage: dict[str, float],
 ) -> list[str]:
     """Vérifie le pourcentage maximum de nulls par colonne."""
     errors = []
 
     for col, max_pct in max_null_percentage.items():
-        if col not in df.columns:
+        # Fichier vide : pourcentage indéfini, la règle ne s'applique pas
+        if col not in stats["column_stats"] or stats["rows"] == 0:
             continue
 
-        null_pct = (df[col].isna().sum() / len(df)) * 100
+        null_pct = (stats["column_stats"][col]["null_count"] / stats["rows"]) * 100
         if null_pct > max_pct:
             errors.append(
                 f"Column '{col}' has {null_pct:.1f}% null values "
@@ -185,62 +262,789 @@ def validate_max_null_percentage(
     return errors
 
 
-def validate(df: pd.DataFrame, rules: dict[str, Any]) -> list[str]:
+# Ordre d'évaluation des règles (et donc des messages d'erreur)
+RULE_CHECKS = [
+    ("required_columns", check_required_columns, []),
+    ("not_null_columns", check_not_null, []),
+    ("unique_columns", check_unique, []),
+    ("value_ranges", check_value_ranges, {}),
+    ("min_rows", check_min_rows, 0),
+    ("max_null_percentage", check_max_null_percentage, {}),
+]
+
+
+def evaluate_rules(stats: dict[str, Any], rules: dict[str, Any]) -> list[str]:
+    """Évalue toutes les règles à partir des statistiques collectées."""
+    errors = []
+    for name, check, default in RULE_CHECKS:
+        errors.extend(check(stats, rules.get(name, default)))
+    return errors
+
+
+# Ordre du mode strict : métadonnées d'abord, unicité (la plus coûteuse) en dernier
+STRICT_RULE_ORDER = [
+    "required_columns",
+    "min_rows",
+    "not_null_columns",
+    "max_null_percentage",
+    "value_ranges",
+    "unique_columns",
+]
+
+
+def strict_steps(rules: dict[str, Any]) -> list[tuple[str, Any]]:
+    """Découpe les règles en contrôles unitaires (une colonne), du moins coûteux au plus coûteux."""
+    steps: list[tuple[str, Any]] = []
+    for name in STRICT_RULE_ORDER:
+        if name not in rules:
+            continue
+        value = rules[name]
+        if name in ("not_null_columns", "unique_columns"):
+            steps.extend((name, [col]) for col in value)
+        elif name in ("max_null_percentage", "value_ranges"):
+            steps.extend((name, {col: col_value}) for col, col_value in value.items())
+        else:
+            steps.append((name, value))
+    return steps
+
+
+def pending_plan(
+    plan: dict[str, dict[str, Any]],
+    stats: dict[str, Any],
+) -> dict[str, dict[str, Any]]:
+    """Retire du plan les statistiques déjà collectées."""
+    pending = {}
+    for col, spec in plan.items():
+        known = stats["column_stats"].get(col, {})
+        remaining = {
+            "nulls": spec["nulls"] and "null_count" not in known,
+            "ranges": [b for b in spec["ranges"] if b not in known.get("out_of_range", {})],
+            "duplicates": spec["duplicates"] and "duplicates" not in known,
+        }
+        if remaining["nulls"] or remaining["ranges"] or remaining["duplicates"]:
+            pending[col] = remaining
+    return pending
+
+
+def evaluate_strict(
+    collect: Callable[[dict[str, dict[str, Any]]], dict[str, Any]],
+    rules: dict[str, Any],
+) -> tuple[dict[str, Any], list[str], list[str]]:
+    """
+    Évalue les règles du moins coûteux au plus coûteux et s'arrête au
+    premier échec.
+
+    Les statistiques sont collectées à la demande, contrôle par contrôle :
+    une colonne requise manquante échoue sans qu'aucune donnée soit lue.
+
+    Args:
+        collect: Calcule les statistiques d'un plan (format de `collect_stats`)
+        rules: Dictionnaire des règles de validation
+
+    Returns:
+        (statistiques collectées, erreurs du premier contrôle en échec,
+        règles évaluées)
+    """
+    checks = {name: check for name, check, _ in RULE_CHECKS}
+    stats = collect({})
+    evaluated: list[str] = []
+
+    for name, value in strict_steps(rules):
+        plan = pending_plan(compile_plan({name: value}), stats)
+        if plan:
+            for col, col_stats in collect(plan)["column_stats"].items():
+                known = stats["column_stats"].setdefault(col, {})
+                known.update({k: v for k, v in col_stats.items() if k != "out_of_range"})
+                known.setdefault("out_of_range", {}).update(col_stats.get("out_of_range", {}))
+
+        if name not in evaluated:
+            evaluated.append(name)
+        errors = checks[name](stats, value)
+        if errors:
+            return stats, errors, evaluated
+
+    return stats, [], evaluated
+
+
+def validate_required_columns(
+    df: pd.DataFrame,
+    required_columns: list[str],
+) -> list[str]:
+    """Vérifie que toutes les colonnes requises sont présentes."""
+    return check_required_columns(collect_stats(df, {}), required_columns)
+
+
+def validate_not_null(
+    df: pd.DataFrame,
+    not_null_columns: list[str],
+) -> list[str]:
+    """Vérifie qu'il n'y a pas de valeurs nulles dans les colonnes spécifiées."""
+    plan = compile_plan({"not_null_columns": not_null_columns})
+    return check_not_null(collect_stats(df, plan), not_null_columns)
+
+
+def validate_unique(
+    df: pd.DataFrame,
+    unique_columns: list[str],
+) -> list[str]:
+    """Vérifie l'unicité des valeurs dans les colonnes spécifiées."""
+    plan = compile_plan({"unique_columns": unique_columns})
+    return check_unique(collect_stats(df, plan), unique_columns)
+
+
+def validate_value_ranges(
+    df: pd.DataFrame,
+    value_ranges: dict[str, tuple[float, float]],
+) -> list[str]:
+    """Vérifie que les valeurs sont dans les ranges spécifiés."""
+    plan = compile_plan({"value_ranges": value_ranges})
+    return check_value_ranges(collect_stats(df, plan), value_ranges)
+
+
+def validate_min_rows(
+    df: pd.DataFrame,
+    min_rows: int,
+) -> list[str]:
+    """Vérifie le nombre minimum de lignes."""
+    return check_min_rows(collect_stats(df, {}), min_rows)
+
+
+def validate_max_null_percentage(
+    df: pd.DataFrame,
+    max_null_percentage: dict[str, float],
+) -> list[str]:
+    """Vérifie le pourcentage maximum de nulls par colonne."""
+    plan = compile_plan({"max_null_percentage": max_null_percentage})
+    return check_max_null_percentage(collect_stats(df, plan), max_null_percentage)
+
+
+def validate(df: pd.DataFrame | pa.Table, rules: dict[str, Any]) -> list[str]:
     """
     Applique toutes les règles de validation.
 
+    Les règles sont compilées en un plan de statistiques par colonne,
+    calculées en une passe, puis évaluées (voir `compile_plan`).
+
     Args:
-        df: DataFrame à valider
+        df: DataFrame à valider, ou table Arrow (mêmes erreurs, sans
+            conversion pandas)
         rules: Dictionnaire des règles de validation
 
     Returns:
         Liste des erreurs trouvées (vide si tout est OK)
     """
-    errors = []
+    return evaluate_rules(collect_stats(df, compile_plan(rules)), rules)
 
-    # Colonnes requises
-    errors.extend(
-        validate_required_columns(
-            df, rules.get("required_columns", [])
-        )
-    )
 
-    # Pas de nulls
-    errors.extend(
-        validate_not_null(
-            df, rules.get("not_null_columns", [])
-        )
-    )
+# =============================================================================
+# Moteur Arrow (sans conversion pandas)
+# =============================================================================
+#
+# Le moteur arrow calcule les mêmes statistiques directement sur les
+# tableaux Arrow lus du Parquet (kernels pyarrow.compute, numpy sur les
+# buffers) : les colonnes texte ne sont jamais matérialisées en objets
+# Python. Les résultats sont ceux de pandas : les colonnes sont d'abord
+# ramenées aux valeurs que pandas verrait (`arrow_column`), NaN et null
+# sont des nulls, 0.0 et -0.0 sont égaux.
+
+ENGINES = ("pandas", "arrow")
+DEFAULT_ENGINE = "pandas"
+
+
+def arrow_column(
+    array: pa.Array | pa.ChunkedArray,
+    as_float: bool | None = None,
+) -> pa.Array | pa.ChunkedArray:
+    """
+    Colonne Arrow avec les valeurs de la colonne pandas correspondante.
+
+    Dictionnaires décodés ; entiers convertis en float64 comme par pandas
+    si la colonne a des nulls (ou si `as_float` l'impose : lots d'une table
+    dont la colonne entière serait convertie).
+    """
+    if pa.types.is_dictionary(array.type):
+        array = array.cast(array.type.value_type)
+    if as_float is None:
+        as_float = array.null_count > 0
+    if pa.types.is_integer(array.type) and as_float:
+        array = pc.cast(array, pa.float64(), safe=False)
+    return array
+
+
+def arrow_null_mask(array: pa.Array | pa.ChunkedArray) -> pa.Array | pa.ChunkedArray:
+    """Masque des nulls au sens de pandas (NaN compris)."""
+    return pc.is_null(array, nan_is_null=True)
+
+
+def arrow_distinct_count(values: pa.Array | pa.ChunkedArray) -> int:
+    """
+    Nombre de valeurs distinctes (sans null ni NaN) : tri numpy sur les
+    buffers pour les types à largeur fixe (0.0 et -0.0 égaux), table de
+    hachage Arrow pour les autres (chaînes...).
+    """
+    kind = values.type
+    if (
+        pa.types.is_integer(kind)
+        or pa.types.is_floating(kind)
+        or pa.types.is_boolean(kind)
+        or pa.types.is_temporal(kind)
+    ):
+        ordered = np.sort(values.to_numpy())
+        return int(len(ordered) > 0) + int(np.count_nonzero(ordered[1:] != ordered[:-1]))
+    return len(pc.unique(values))
+
+
+def arrow_range_mask(
+    array: pa.Array | pa.ChunkedArray,
+    min_val: Any,
+    max_val: Any,
+) -> pa.Array | pa.ChunkedArray:
+    """
+    Masque des valeurs hors de [min_val, max_val], comparées comme par
+    numpy : bornes converties au type de la colonne, entiers comparés en
+    float64 à une borne flottante. Nulls et NaN ne sont jamais hors plage.
+    """
+    if pa.types.is_boolean(array.type):
+        array = array.cast(pa.int8())
+    if pa.types.is_integer(array.type) and (isinstance(min_val, float) or isinstance(max_val, float)):
+        array = pc.cast(array, pa.float64(), safe=False)
+    if pa.types.is_floating(array.type):
+        min_val, max_val = (pa.scalar(float(bound), type=array.type) for bound in (min_val, max_val))
+    return pc.fill_null(pc.or_(pc.less(array, min_val), pc.greater(array, max_val)), False)
+
+
+def arrow_out_of_range(array: pa.Array | pa.ChunkedArray, min_val: Any, max_val: Any) -> int:
+    """Nombre de valeurs hors de [min_val, max_val] (voir `arrow_range_mask`)."""
+    return pc.sum(arrow_range_mask(array, min_val, max_val)).as_py() or 0
+
+
+def arrow_duplicate_mask(array: pa.Array | pa.ChunkedArray) -> np.ndarray:
+    """
+    Masque des doublons comme `Series.duplicated()` : première occurrence
+    conservée, nulls et NaN égaux entre eux, 0.0 et -0.0 égaux.
+    """
+    nulls = arrow_null_mask(array)
+    if pa.types.is_floating(array.type):
+        array = pc.add(array, pa.scalar(0.0, type=array.type))
+    array = pc.if_else(nulls, pa.scalar(None, type=array.type), array)
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    codes = array.dictionary_encode(null_encoding="encode").indices.to_numpy()
+    duplicates = np.ones(len(codes), dtype=bool)
+    duplicates[np.unique(codes, return_index=True)[1]] = False
+    return duplicates
+
+
+def compute_arrow_column_stats(
+    array: pa.Array | pa.ChunkedArray,
+    spec: dict[str, Any],
+) -> dict[str, Any]:
+    """
+    Comme `compute_column_stats`, sur une colonne Arrow (voir `arrow_column`).
+    """
+    stats: dict[str, Any] = {}
+    mask = arrow_null_mask(array) if spec["nulls"] or spec["duplicates"] else None
+
+    if spec["nulls"]:
+        stats["null_count"] = pc.sum(mask).as_py() or 0
+
+    if spec["ranges"]:
+        stats["out_of_range"] = {
+            (min_val, max_val): arrow_out_of_range(array, min_val, max_val)
+            for min_val, max_val in spec["ranges"]
+        }
+
+    if spec["duplicates"]:
+        nulls = stats.get("null_count", pc.sum(mask).as_py() or 0)
+        valid = array.filter(pc.invert(mask)) if nulls else array
+        # Les nulls sont égaux entre eux (une seule valeur distincte)
+        stats["duplicates"] = len(array) - arrow_distinct_count(valid) - (nulls > 0)
+
+    return stats
+
+
+def collect_arrow_stats(table: pa.Table, plan: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Comme `collect_stats`, sur une table Arrow."""
+    columns = pandas_columns(table.schema)
+    return {
+        "rows": table.num_rows,
+        "columns": columns,
+        "column_stats": {
+            col: compute_arrow_column_stats(arrow_column(table.column(col)), spec)
+            for col, spec in plan.items()
+            if col in columns
+        },
+    }
 
-    # Unicité
-    errors.extend(
-        validate_unique(
-            df, rules.get("unique_columns", [])
-        )
-    )
 
-    # Ranges de valeurs
-    errors.extend(
-        validate_value_ranges(
-            df, rules.get("value_ranges", {})
+# =============================================================================
+# Validation par lots (mémoire bornée)
+# =============================================================================
+#
+# Les colonnes sont lues par lots (RecordBatch) ; les compteurs de nulls et
+# de dépassements de plage s'additionnent d'un lot à l'autre. L'unicité
+# demande de garder les valeurs vues : au-delà du budget mémoire, elles
+# sont réparties par hash dans des fichiers sur disque.
+
+DEFAULT_BATCH_SIZE = 64 * 1024
+DEFAULT_MEMORY_BUDGET_MB = 256
+MAX_SPILL_PARTITIONS = 1024
+
+
+class DistinctCounter:
+    """
+    Compte les doublons d'une colonne lue par lots, à mémoire bornée.
+
+    Chaque lot est dédupliqué localement ; ses valeurs distinctes restent
+    en mémoire tant qu'elles tiennent dans le budget, puis sont réparties
+    par hash dans des fichiers Arrow IPC. Une valeur ne se trouve que dans
+    une partition : les doublons se comptent partition par partition.
+
+    Même résultat que `Series.duplicated().sum()` sur la colonne entière :
+    les nulls sont égaux entre eux, 0.0 et -0.0 aussi.
+    """
+
+    def __init__(self, name: str, memory_budget_mb: float, expected_rows: int) -> None:
+        self.name = name
+        self.budget = memory_budget_mb * 1024 * 1024
+        self.expected_rows = expected_rows
+        self.nulls = 0
+        self.duplicates = 0
+        self.spilled = False
+        self._rows = 0
+        self._chunks: list[pd.Series] = []
+        self._bytes = 0
+        self._partitions = 0
+        self._spill_dir: tempfile.TemporaryDirectory | None = None
+        self._writers: dict[int, pa.ipc.RecordBatchStreamWriter] = {}
+        self._schema: pa.Schema | None = None
+
+    def add(self, series: pd.Series) -> None:
+        """Ajoute un lot de valeurs de la colonne."""
+        mask = series.isna()
+        self.nulls += int(mask.sum())
+        values = series[~mask]
+        if values.dtype.kind == "f":
+            values = values + 0.0  # -0.0 -> 0.0
+        elif values.dtype.kind == "b":
+            values = values.astype(object)  # même type que les lots avec nulls
+        unique = values.drop_duplicates().reset_index(drop=True)
+        self.duplicates += len(values) - len(unique)
+        self._rows += len(values)
+
+        if self.spilled:
+            self._spill(unique)
+            return
+
+        self._chunks.append(unique)
+        self._bytes += unique.memory_usage(deep=True, index=False)
+        if self._bytes > self.budget:
+            self._start_spill()
+
+    def count(self) -> int:
+        """Nombre de doublons de la colonne (nulls compris)."""
+        duplicates = self.duplicates + max(self.nulls - 1, 0)
+        if not self.spilled:
+            if self._chunks:
+                duplicates += int(pd.concat(self._chunks, ignore_index=True).duplicated().sum())
+            return duplicates
+
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+        for path in sorted(Path(self._spill_dir.name).glob("*.arrow")):
+            with pa.memory_map(str(path)) as source:
+                values = pa.ipc.open_stream(source).read_all().column(0).to_pandas()
+            duplicates += int(values.duplicated().sum())
+        return duplicates
+
+    def close(self) -> None:
+        """Supprime les fichiers de débordement."""
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+        if self._spill_dir is not None:
+            self._spill_dir.cleanup()
+            self._spill_dir = None
+
+    def _start_spill(self) -> None:
+        """Passe sur disque : partitions dimensionnées pour tenir dans le budget."""
+        bytes_per_value = self._bytes / max(self._rows, 1)
+        expected_bytes = bytes_per_value * max(self.expected_rows, self._rows)
+        self._partitions = min(
+            max(2 * math.ceil(expected_bytes / self.budget), 2),
+            MAX_SPILL_PARTITIONS,
         )
+        self._spill_dir = tempfile.TemporaryDirectory(prefix="validate_spill_")
+        self.spilled = True
+        logger.info(
+            "Unique check on %s exceeds memory budget, spilling to disk",
+            self.name,
+            extra={"partitions": self._partitions, "spill_dir": self._spill_dir.name},
+        )
+        chunks, self._chunks, self._bytes = self._chunks, [], 0
+        for chunk in chunks:
+            self._spill(chunk)
+
+    def _spill(self, values: pd.Series) -> None:
+        """Écrit chaque valeur dans la partition de son hash."""
+        if len(values) == 0:
+            return
+        array = pa.Array.from_pandas(values)
+        if self._schema is None:
+            self._schema = pa.schema([("value", array.type)])
+        elif array.type != self._schema.field(0).type:
+            array = array.cast(self._schema.field(0).type)
+
+        partition_ids = pd.util.hash_pandas_object(values, index=False).to_numpy() % self._partitions
+        for partition in np.unique(partition_ids):
+            writer = self._writers.get(partition)
+            if writer is None:
+                path = Path(self._spill_dir.name) / f"part_{partition:05d}.arrow"
+                writer = pa.ipc.new_stream(str(path), self._schema)
+                self._writers[partition] = writer
+            selected = array.filter(pa.array(partition_ids == partition))
+            writer.write_batch(pa.record_batch([selected], schema=self._schema))
+
+
+class ArrowDistinctCounter(DistinctCounter):
+    """
+    `DistinctCounter` pour le moteur arrow : lots Arrow (voir `arrow_column`)
+    dédupliqués par les kernels Arrow, répartis par hash vectorisé (voir
+    `sketches.hash_array`). Même résultat, sans conversion pandas.
+    """
+
+    def add(self, array: pa.Array) -> None:
+        """Ajoute un lot de valeurs de la colonne."""
+        mask = arrow_null_mask(array)
+        values = array.filter(pc.invert(mask))
+        self.nulls += len(array) - len(values)
+        if pa.types.is_floating(values.type):
+            values = pc.add(values, 0.0)  # -0.0 -> 0.0
+        if self._schema is None:
+            self._schema = pa.schema([("value", values.type)])
+        elif values.type != self._schema.field(0).type:
+            values = values.cast(self._schema.field(0).type)
+        unique = pc.unique(values)
+        self.duplicates += len(values) - len(unique)
+        self._rows += len(values)
+
+        if self.spilled:
+            self._spill(unique)
+            return
+
+        self._chunks.append(unique)
+        self._bytes += unique.nbytes
+        if self._bytes > self.budget:
+            self._start_spill()
+
+    def count(self) -> int:
+        """Nombre de doublons de la colonne (nulls compris)."""
+        duplicates = self.duplicates + max(self.nulls - 1, 0)
+        if not self.spilled:
+            if self._chunks:
+                values = pa.chunked_array(self._chunks, type=self._schema.field(0).type)
+                duplicates += len(values) - arrow_distinct_count(values)
+            return duplicates
+
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+        for path in sorted(Path(self._spill_dir.name).glob("*.arrow")):
+            with pa.memory_map(str(path)) as source:
+                values = pa.ipc.open_stream(source).read_all().column(0)
+            duplicates += len(values) - arrow_distinct_count(values)
+        return duplicates
+
+    def _spill(self, values: pa.Array) -> None:
+        """Écrit chaque valeur dans la partition de son hash."""
+        if len(values) == 0:
+            return
+        partition_ids = hash_array(values) % np.uint64(self._partitions)
+        for partition in np.unique(partition_ids):
+            writer = self._writers.get(partition)
+            if writer is None:
+                path = Path(self._spill_dir.name) / f"part_{partition:05d}.arrow"
+                writer = pa.ipc.new_stream(str(path), self._schema)
+                self._writers[partition] = writer
+            selected = values.filter(pa.array(partition_ids == partition))
+            writer.write_batch(pa.record_batch([selected], schema=self._schema))
+
+
+def column_null_count(parquet_file: pq.ParquetFile, name: str) -> int:
+    """Nombre de nulls d'une colonne : footer, ou lecture de la colonne seule."""
+    chunk_stats = footer_statistics(parquet_file.metadata, name)
+    if chunk_stats is not None:
+        return sum(s.null_count for s in chunk_stats)
+    return sum(
+        batch.column(0).null_count for batch in parquet_file.iter_batches(columns=[name])
     )
 
-    # Minimum de lignes
-    errors.extend(
-        validate_min_rows(
-            df, rules.get("min_rows", 0)
+
+def collect_batched_stats(
+    parquet_files: list[pq.ParquetFile],
+    plan: dict[str, dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+    engine: str = DEFAULT_ENGINE,
+) -> dict[str, dict[str, Any]]:
+    """
+    Exécute le plan lot par lot sur les colonnes d'un ou plusieurs fichiers
+    Parquet (les fichiers d'une partition forment une seule table).
+
+    Les résultats sont identiques à `collect_stats` sur la table entière :
+    une colonne entière avec nulls (ou flottante dans un autre fichier) est
+    convertie en float64 par pandas, les lots de ces colonnes le sont donc
+    aussi, même sans null. Avec `engine='arrow'`, les lots ne sont pas
+    convertis en DataFrame.
+
+    Returns:
+        Statistiques par colonne, au format de `collect_stats`
+    """
+    columns = list(plan)
+    as_float = set()
+    for col in columns:
+        types = [f.schema_arrow.field(col).type for f in parquet_files]
+        if any(pa.types.is_integer(t) for t in types) and (
+            not all(pa.types.is_integer(t) for t in types)
+            or sum(column_null_count(f, col) for f in parquet_files) > 0
+        ):
+            as_float.add(col)
+
+    column_stats: dict[str, dict[str, Any]] = {}
+    for col, spec in plan.items():
+        column_stats[col] = {}
+        if spec["nulls"]:
+            column_stats[col]["null_count"] = 0
+        if spec["ranges"]:
+            column_stats[col]["out_of_range"] = {bounds: 0 for bounds in spec["ranges"]}
+
+    unique_columns = [col for col, spec in plan.items() if spec["duplicates"]]
+    counter_class = ArrowDistinctCounter if engine == "arrow" else DistinctCounter
+    counters = {
+        col: counter_class(
+            col,
+            memory_budget_mb / len(unique_columns),
+            sum(f.metadata.num_rows for f in parquet_files),
         )
-    )
+        for col in unique_columns
+    }
+    try:
+        for batch in (
+            batch
+            for parquet_file in parquet_files
+            for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+        ):
+            df = batch.to_pandas() if engine == "pandas" else None
+            for col, spec in plan.items():
+                if df is None:
+                    values = arrow_column(batch.column(col), as_float=col in as_float)
+                    batch_stats = compute_arrow_column_stats(values, {**spec, "duplicates": False})
+                else:
+                    values = df[col]
+                    if col in as_float and isinstance(values.dtype, np.dtype):
+                        values = values.astype("float64")
+                    batch_stats = compute_column_stats(values, {**spec, "duplicates": False})
+
+                if spec["nulls"]:
+                    column_stats[col]["null_count"] += batch_stats["null_count"]
+                for bounds, count in batch_stats.get("out_of_range", {}).items():
+                    column_stats[col]["out_of_range"][bounds] += count
+                if col in counters:
+                    counters[col].add(values)
+
+        for col, counter in counters.items():
+            column_stats[col]["duplicates"] = counter.count()
+    finally:
+        for counter in counters.values():
+            counter.close()
+
+    return column_stats
 
-    # Pourcentage max de nulls
-    errors.extend(
-        validate_max_null_percentage(
-            df, rules.get("max_null_percentage", {})
+
+# =============================================================================
+# Lecture Parquet (statistiques du footer, projection)
+# =============================================================================
+#
+# Le footer Parquet contient le nombre de lignes, le schéma et, par row
+# group, le nombre de nulls et le min/max de chaque colonne. Quand ces
+# statistiques suffisent à conclure, la colonne n'est pas lue ; sinon seule
+# la colonne est décodée (jamais les colonnes absentes des règles).
+
+
+def pandas_columns(schema: pa.Schema) -> list[str]:
+    """Colonnes telles que pandas les expose (colonnes d'index exclues)."""
+    return list(schema.empty_table().to_pandas().columns)
+
+
+def column_chunks(metadata: pq.FileMetaData, name: str) -> list[Any]:
+    """Métadonnées de la colonne `name` dans chaque row group."""
+    chunks = []
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        chunks.extend(
+            row_group.column(j)
+            for j in range(row_group.num_columns)
+            if row_group.column(j).path_in_schema == name
         )
-    )
+    return chunks
+
+
+def footer_statistics(metadata: pq.FileMetaData, name: str) -> list[Any] | None:
+    """Statistiques de la colonne par row group ; None si l'une manque."""
+    chunks = column_chunks(metadata, name)
+    if len(chunks) != metadata.num_row_groups:
+        return None
+    if any(c.statistics is None or not c.statistics.has_null_count for c in chunks):
+        return None
+    return [c.statistics for c in chunks]
 
-    return errors
+
+def footer_column_stats(
+    metadata: pq.FileMetaData,
+    field: pa.Field,
+    spec: dict[str, Any],
+) -> dict[str, Any] | None:
+    """
+    Statistiques d'une colonne calculées depuis le footer.
+
+    Limité aux colonnes numériques (pas de troncature des min/max). Pour les
+    flottants, le footer ne compte pas les NaN (nulls pour pandas) : seuls
+    les contrôles de plage « tout est dans la plage » sont concluants.
+
+    Returns:
+        Les statistiques demandées par `spec`, ou None si le footer ne
+        permet pas de conclure (la colonne doit alors être lue)
+    """
+    floating = pa.types.is_floating(field.type)
+    if spec["duplicates"] or not (pa.types.is_integer(field.type) or floating):
+        return None
+    if spec["nulls"] and floating:
+        return None
+
+    chunk_stats = footer_statistics(metadata, field.name)
+    if chunk_stats is None:
+        return None
+
+    stats: dict[str, Any] = {}
+    if spec["nulls"]:
+        stats["null_count"] = sum(s.null_count for s in chunk_stats)
+
+    if spec["ranges"]:
+        stats["out_of_range"] = {}
+        for min_val, max_val in spec["ranges"]:
+            count = 0
+            for s in chunk_stats:
+                if s.num_values == 0:
+                    continue
+                if not s.has_min_max:
+                    return None
+                if s.min >= min_val and s.max <= max_val:
+                    continue
+                # Row group entièrement hors plage (nombre de NaN inconnu en flottant)
+                if (s.min > max_val or s.max < min_val) and not floating:
+                    count += s.num_values
+                    continue
+                return None
+            stats["out_of_range"][(min_val, max_val)] = count
+
+    return stats
+
+
+def merge_column_stats(file_stats: list[dict[str, Any]]) -> dict[str, Any]:
+    """Additionne les statistiques (nulls, dépassements) de plusieurs fichiers."""
+    merged: dict[str, Any] = {}
+    for col_stats in file_stats:
+        if "null_count" in col_stats:
+            merged["null_count"] = merged.get("null_count", 0) + col_stats["null_count"]
+        for bounds, count in col_stats.get("out_of_range", {}).items():
+            out_of_range = merged.setdefault("out_of_range", {})
+            out_of_range[bounds] = out_of_range.get(bounds, 0) + count
+    return merged
+
+
+def collect_parquet_stats(
+    paths: Path | list[Path],
+    plan: dict[str, dict[str, Any]],
+    use_footer: bool = True,
+    batch_size: int | None = None,
+    memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+    engine: str = DEFAULT_ENGINE,
+) -> tuple[dict[str, Any], list[str], int]:
+    """
+    Exécute le plan sur un fichier Parquet sans le charger entièrement.
+
+    Lignes et colonnes viennent du footer ; chaque colonne du plan est
+    résolue par ses statistiques de footer si elles sont concluantes, sinon
+    lue seule (ou par lots si `batch_size` est donné).
+
+    Plusieurs fichiers (ceux d'une partition) sont validés comme une seule
+    table : l'unicité est vérifiée entre fichiers, seules les colonnes
+    présentes dans tous les fichiers comptent, et la lecture se fait par lots.
+
+    Args:
+        paths: Fichier Parquet, ou fichiers d'une partition
+        plan: Plan compilé par `compile_plan`
+        use_footer: Utiliser les statistiques du footer (sinon tout est lu)
+        batch_size: Lecture par lots de cette taille (mémoire bornée)
+        memory_budget_mb: Budget mémoire des contrôles d'unicité par lots
+        engine: 'pandas' ou 'arrow' (colonnes lues sans conversion pandas)
+
+    Returns:
+        (statistiques au format de `collect_stats`, colonnes lues,
+        octets compressés lus)
+    """
+    paths = [paths] if isinstance(paths, (str, Path)) else list(paths)
+    parquet_files = [pq.ParquetFile(path) for path in paths]
+    columns = pandas_columns(parquet_files[0].schema_arrow)
+    for parquet_file in parquet_files[1:]:
+        present = set(pandas_columns(parquet_file.schema_arrow))
+        columns = [col for col in columns if col in present]
+
+    stats: dict[str, Any] = {
+        "rows": sum(f.metadata.num_rows for f in parquet_files),
+        "columns": columns,
+        "column_stats": {},
+    }
+    to_read = []
+    for col, spec in plan.items():
+        if col not in columns:
+            continue
+        file_stats = [
+            footer_column_stats(f.metadata, f.schema_arrow.field(col), spec) if use_footer else None
+            for f in parquet_files
+        ]
+        if any(col_stats is None for col_stats in file_stats):
+            to_read.append(col)
+        else:
+            stats["column_stats"][col] = merge_column_stats(file_stats)
+
+    bytes_read = 0
+    if to_read:
+        read_plan = {col: plan[col] for col in to_read}
+        if batch_size or len(parquet_files) > 1:
+            stats["column_stats"].update(
+                collect_batched_stats(
+                    parquet_files,
+                    read_plan,
+                    batch_size or DEFAULT_BATCH_SIZE,
+                    memory_budget_mb,
+                    engine,
+                )
+            )
+        else:
+            if engine == "arrow":
+                data = pq.read_table(paths[0], columns=to_read)
+            else:
+                data = pd.read_parquet(paths[0], columns=to_read)
+            stats["column_stats"].update(collect_stats(data, read_plan)["column_stats"])
+        for parquet_file in parquet_files:
+            for col in to_read:
+                bytes_read += sum(
+                    c.total_compressed_size for c in column_chunks(parquet_file.metadata, col)
+                )
+
+    return stats, to_read, bytes_read
 
 
 def get_data_profile(df: pd.DataFrame) -> dict[str, Any]:
@@ -269,14 +1073,877 @@ def get_data_profile(df: pd.DataFrame) -> dict[str, Any]:
     return profile
 
 
+def pandas_dtypes(table: pa.Table) -> dict[str, str]:
+    """
+    Dtypes de la table une fois convertie par pandas, sans la convertir :
+    conversion d'une table vide, puis entiers avec nulls en float64 et
+    booléens avec nulls en object, comme pandas.
+    """
+    dtypes = {}
+    for col, dtype in table.schema.empty_table().to_pandas().dtypes.items():
+        if isinstance(dtype, np.dtype) and dtype.kind in "iub" and table.column(col).null_count:
+            dtype = np.dtype("float64") if dtype.kind in "iu" else np.dtype(object)
+        dtypes[col] = str(dtype)
+    return dtypes
+
+
+def describe_array(array: pa.ChunkedArray) -> dict[str, float]:
+    """
+    Statistiques de `Series.describe()` d'une colonne numérique Arrow (voir
+    `arrow_column`), calculées par numpy comme pandas (mêmes arrondis).
+    """
+    values = array.to_numpy()
+    floating = values.dtype.kind == "f"
+    mask = np.isnan(values) if floating else np.zeros(len(values), dtype=bool)
+    count = len(values) - int(mask.sum())
+    if count == 0:
+        return {"count": 0.0, **dict.fromkeys(["mean", "std", "min", "25%", "50%", "75%", "max"], math.nan)}
+
+    # Moyenne et variance (deux passes) : formules de pandas.core.nanops
+    floats = np.where(mask, 0, values) if floating else values.astype("f8")
+    mean = floats.sum(dtype=values.dtype if floating else np.float64) / count
+    std = math.nan
+    if count > 1:
+        squares = (floats.sum(dtype=np.float64) / count - floats) ** 2
+        np.putmask(squares, mask, 0)
+        variance = squares.sum(dtype=np.float64) / (count - 1)
+        std = float(np.sqrt(variance.astype(values.dtype) if floating else variance))
+
+    valid = values[~mask]
+    q25, q50, q75 = np.percentile(valid, [25.0, 50.0, 75.0], method="linear")
+    return {
+        "count": float(count),
+        "mean": float(mean),
+        "std": std,
+        "min": float(valid.min()),
+        "25%": float(q25),
+        "50%": float(q50),
+        "75%": float(q75),
+        "max": float(valid.max()),
+    }
+
+
+def get_arrow_profile(table: pa.Table) -> dict[str, Any]:
+    """
+    Profil de `get_data_profile` calculé sur une table Arrow, sans
+    conversion pandas (mêmes valeurs et dtypes).
+    """
+    columns = pandas_columns(table.schema)
+    arrays = {col: arrow_column(table.column(col)) for col in columns}
+    profile: dict[str, Any] = {
+        "row_count": table.num_rows,
+        "column_count": len(columns),
+        "columns": columns,
+        "null_counts": {col: pc.sum(arrow_null_mask(array)).as_py() or 0 for col, array in arrays.items()},
+        "dtypes": pandas_dtypes(table),
+    }
+
+    # Stats numériques
+    numeric_cols = [
+        col
+        for col, array in arrays.items()
+        if pa.types.is_integer(array.type) or pa.types.is_floating(array.type)
+    ]
+    if numeric_cols:
+        profile["numeric_stats"] = {col: describe_array(arrays[col]) for col in numeric_cols}
+
+    return profile
+
+
+def sketch_columns(
+    path: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    engine: str = DEFAULT_ENGINE,
+) -> tuple[int, dict[str, str], dict[str, ColumnSketch]]:
+    """
+    Calcule les sketches de chaque colonne en une passe par lots.
+
+    Returns:
+        (nombre de lignes, dtypes pandas, sketches par colonne)
+    """
+    parquet_file = pq.ParquetFile(path)
+    dtypes = parquet_file.schema_arrow.empty_table().to_pandas().dtypes
+    sketches = {
+        col: ColumnSketch(
+            numeric=pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+        )
+        for col, dtype in dtypes.items()
+    }
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        if engine == "arrow":
+            for col, sketch in sketches.items():
+                column = batch.column(col)
+                # Catégories pandas hashées comme telles (voir `hash_array`)
+                if not pa.types.is_dictionary(column.type):
+                    column = arrow_column(column)
+                sketch.update_arrow(column)
+            continue
+        df = batch.to_pandas()
+        for col, sketch in sketches.items():
+            sketch.update(df[col])
+    return (
+        parquet_file.metadata.num_rows,
+        {col: str(dtype) for col, dtype in dtypes.items()},
+        sketches,
+    )
+
+
+def json_value(value: Any) -> Any:
+    """Valeur sérialisable en JSON (scalaires numpy, timestamps...)."""
+    if hasattr(value, "item"):
+        value = value.item()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def sketch_profile(
+    row_count: int,
+    dtypes: dict[str, str],
+    sketches: dict[str, ColumnSketch],
+) -> dict[str, Any]:
+    """
+    Profil approché au format de `get_data_profile`, bornes d'erreur incluses.
+
+    Nulls, count, moyenne, écart-type, min et max sont exacts ; les quantiles
+    (erreur de rang), les cardinalités (erreur relative) et les valeurs
+    fréquentes (sous-estimation maximale des comptes) sont approchés.
+    """
+    profile: dict[str, Any] = {
+        "mode": "approx",
+        "row_count": row_count,
+        "column_count": len(dtypes),
+        "columns": list(dtypes),
+        "null_counts": {col: sketch.nulls for col, sketch in sketches.items()},
+        "dtypes": dict(dtypes),
+    }
+
+    numeric_stats = {}
+    rank_error = None
+    for col, sketch in sketches.items():
+        if not sketch.numeric:
+            continue
+        moments = sketch.moments
+        q25, q50, q75 = sketch.quantiles.quantiles([0.25, 0.5, 0.75])
+        numeric_stats[col] = {
+            "count": float(moments.count),
+            "mean": moments.mean if moments.count else None,
+            "std": moments.std,
+            "min": moments.min,
+            "25%": q25,
+            "50%": q50,
+            "75%": q75,
+            "max": moments.max,
+        }
+        rank_error = sketch.quantiles.rank_error
+    if numeric_stats:
+        profile["numeric_stats"] = numeric_stats
+        profile["quantile_rank_error"] = round(rank_error, 5)
+
+    profile["distinct_counts"] = {
+        col: {
+            "estimate": sketch.distinct.estimate(),
+            "relative_error": round(sketch.distinct.relative_error, 5),
+        }
+        for col, sketch in sketches.items()
+    }
+    profile["top_values"] = {
+        col: {
+            "values": [
+                {"value": json_value(value), "count": count}
+                for value, count in sketch.top_values.top()
+            ],
+            "max_count_error": sketch.top_values.max_error,
+        }
+        for col, sketch in sketches.items()
+    }
+    return profile
+
+
+def get_approx_profile(
+    path: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    engine: str = DEFAULT_ENGINE,
+) -> dict[str, Any]:
+    """
+    Profil approché d'un fichier Parquet, en une passe à mémoire bornée.
+
+    Pas de tri exact pour les quantiles (`describe`) : sketches KLL,
+    HyperLogLog et Misra-Gries (voir `sketches.py`). Un sidecar à jour
+    (voir `profile_file`) évite de relire le fichier.
+    """
+    row_count, dtypes, sketches, _ = profile_file(path, batch_size, engine=engine)
+    return sketch_profile(row_count, dtypes, sketches)
+
+
+# =============================================================================
+# Sidecars de profil
+# =============================================================================
+
+SIDECAR_SUFFIX = ".profile.json"
+SIDECAR_VERSION = 1
+
+
+def file_fingerprint(path: Path) -> dict[str, int]:
+    """Empreinte d'un fichier (taille, date de modification), sans le lire."""
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def sidecar_path(path: Path) -> Path:
+    """Sidecar de profil d'un fichier : `data_x.parquet.profile.json`."""
+    return path.with_name(path.name + SIDECAR_SUFFIX)
+
+
+def write_sidecar(
+    path: Path,
+    row_count: int,
+    dtypes: dict[str, str],
+    sketches: dict[str, ColumnSketch],
+) -> Path:
+    """
+    Écrit le sidecar de profil à côté du fichier Parquet.
+
+    Le sidecar contient les sketches sérialisés (fusionnables, voir
+    `merge_profiles.py`) et l'empreinte du fichier : il est ignoré dès que
+    le fichier est réécrit. Écriture atomique (nom temporaire puis rename).
+    """
+    state = {
+        "version": SIDECAR_VERSION,
+        "file": path.name,
+        "fingerprint": file_fingerprint(path),
+        "created_at": datetime.utcnow().isoformat(),
+        "row_count": row_count,
+        "dtypes": dtypes,
+        "columns": {col: sketch.to_dict(json_value) for col, sketch in sketches.items()},
+    }
+    target = sidecar_path(path)
+    tmp_path = target.with_name(f".{target.name}.tmp")
+    tmp_path.write_text(json.dumps(state))
+    os.replace(tmp_path, target)
+    return target
+
+
+def read_sidecar(path: Path) -> tuple[int, dict[str, str], dict[str, ColumnSketch]] | None:
+    """
+    Sketches du sidecar d'un fichier Parquet, sans lire le fichier.
+
+    Returns:
+        (nombre de lignes, dtypes, sketches par colonne), ou None si le
+        sidecar est absent, illisible ou périmé (empreinte différente)
+    """
+    target = sidecar_path(path)
+    try:
+        state = json.loads(target.read_text())
+        if state.get("version") != SIDECAR_VERSION or state.get("fingerprint") != file_fingerprint(path):
+            return None
+        sketches = {col: ColumnSketch.from_dict(s) for col, s in state["columns"].items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return state["row_count"], state["dtypes"], sketches
+
+
+def profile_file(
+    path: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    write: bool = False,
+    engine: str = DEFAULT_ENGINE,
+) -> tuple[int, dict[str, str], dict[str, ColumnSketch], bool]:
+    """
+    Sketches d'un fichier : depuis son sidecar s'il est à jour, sinon en une
+    passe (et écriture du sidecar si `write`).
+
+    Returns:
+        (nombre de lignes, dtypes, sketches, sidecar réutilisé ou non)
+    """
+    cached = read_sidecar(path)
+    if cached is not None:
+        return (*cached, True)
+    row_count, dtypes, sketches = sketch_columns(path, batch_size, engine)
+    if write:
+        write_sidecar(path, row_count, dtypes, sketches)
+    return row_count, dtypes, sketches, False
+
+
+# =============================================================================
+# Quarantaine des lignes en échec
+# =============================================================================
+#
+# Avec un répertoire de quarantaine, les règles ligne à ligne (not_null,
+# unique, value_ranges) donnent un masque par ligne au lieu d'un compte :
+# les lignes en échec sont écrites dans un Parquet de quarantaine, avec la
+# liste des règles non respectées, et les autres dans un Parquet de lignes
+# conservées, dans la lecture même de la validation. La partition reste
+# valide tant que la part de lignes en quarantaine ne dépasse pas le seuil ;
+# les règles de table (colonnes requises, nombre de lignes, % de nulls)
+# portent sur les lignes conservées. Les masques sont calculés sur la table
+# Arrow, avec les résultats de pandas (voir `arrow_column`).
+
+ROW_RULES = ("not_null_columns", "unique_columns", "value_ranges")
+FAILED_RULES_COLUMN = "_failed_rules"
+DEFAULT_MAX_QUARANTINE_PCT = 0.0
+
+
+def row_rule_masks(
+    table: pa.Table,
+    rules: dict[str, Any],
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, np.ndarray]]:
+    """
+    Évalue les règles ligne à ligne sur une table.
+
+    Returns:
+        (statistiques de la table, statistiques des lignes conservées,
+        masques des lignes en échec par règle `<règle>:<colonne>`)
+    """
+    columns = pandas_columns(table.schema)
+    column_stats: dict[str, dict[str, Any]] = {}
+    null_masks: dict[str, np.ndarray] = {}
+    failed: dict[str, dict[str, np.ndarray]] = {name: {} for name in ROW_RULES}
+
+    for col, spec in compile_plan(rules).items():
+        if col not in columns:
+            continue
+        array = arrow_column(table.column(col))
+        stats: dict[str, Any] = column_stats.setdefault(col, {})
+        if spec["nulls"]:
+            null_masks[col] = arrow_null_mask(array).to_numpy()
+            stats["null_count"] = int(null_masks[col].sum())
+        if spec["ranges"]:
+            stats["out_of_range"] = {}
+            for min_val, max_val in spec["ranges"]:
+                outside = arrow_range_mask(array, min_val, max_val).to_numpy()
+                stats["out_of_range"][(min_val, max_val)] = int(outside.sum())
+                failed["value_ranges"][col] = outside
+        if spec["duplicates"]:
+            failed["unique_columns"][col] = arrow_duplicate_mask(array)
+            stats["duplicates"] = int(failed["unique_columns"][col].sum())
+
+    for col in rules.get("not_null_columns", []):
+        if col in null_masks:
+            failed["not_null_columns"][col] = null_masks[col]
+
+    masks = {f"{name}:{col}": mask for name in ROW_RULES for col, mask in failed[name].items()}
+    quarantined = np.zeros(table.num_rows, dtype=bool)
+    for mask in masks.values():
+        quarantined |= mask
+    table_stats = {"rows": table.num_rows, "columns": columns, "column_stats": column_stats}
+    passing_stats = {
+        "rows": table.num_rows - int(quarantined.sum()),
+        "columns": columns,
+        "column_stats": {
+            col: {"null_count": int((mask & ~quarantined).sum())} for col, mask in null_masks.items()
+        },
+    }
+    return table_stats, passing_stats, masks
+
+
+def input_root(files: list[Path]) -> Path:
+    """Dossier commun aux partitions des fichiers validés."""
+    return Path(os.path.commonpath([partition_of(path.resolve()).parent for path in files]))
+
+
+def quarantine_paths(
+    quarantine_dir: str,
+    files: list[Path],
+    root: Path | None = None,
+) -> tuple[Path, Path]:
+    """
+    Sorties d'un fichier ou d'une partition : `<dir>/passing/<partition>/`
+    et `<dir>/quarantine/<partition>/`, sous le nom du fichier (ou
+    `data.parquet` pour une partition de plusieurs fichiers).
+
+    `<partition>` est le chemin de la partition relatif à `root` (par
+    défaut, son dossier parent) : des partitions de même nom venant de
+    racines différentes ont des sorties distinctes.
+    """
+    name = files[0].name if len(files) == 1 else "data.parquet"
+    partition_dir = partition_of(files[0].resolve())
+    partition = partition_dir.relative_to(root or partition_dir.parent)
+    base = Path(quarantine_dir)
+    return base / "passing" / partition / name, base / "quarantine" / partition / name
+
+
+def write_parquet(table: pa.Table, path: Path) -> int:
+    """Écrit une table Parquet (nom temporaire puis rename) ; renvoie sa taille."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+    return path.stat().st_size
+
+
+def quarantine_files(
+    files: list[Path],
+    rules: dict[str, Any],
+    metrics: PipelineMetrics,
+    quarantine_dir: str,
+    max_quarantine_pct: float = DEFAULT_MAX_QUARANTINE_PCT,
+    quarantine_root: str | None = None,
+) -> tuple[dict[str, Any], list[str], dict[str, Any]]:
+    """
+    Valide un fichier (ou une partition) et sépare les lignes en échec.
+
+    Les fichiers sont lus une seule fois, toutes colonnes. Les lignes qui
+    violent une règle ligne à ligne vont en quarantaine avec la colonne
+    `_failed_rules` (ex. `["not_null_columns:id", "unique_columns:id"]`) ;
+    pour l'unicité, la première occurrence d'une valeur est conservée. Un
+    fichier de quarantaine d'un run précédent est supprimé s'il n'y a plus
+    de ligne en échec.
+
+    Returns:
+        (statistiques de la table, erreurs, rapport de quarantaine)
+    """
+    with metrics.stage("read"):
+        table = pa.concat_tables([pq.read_table(path) for path in files], promote_options="default")
+    metrics.add("read", records=table.num_rows, bytes=sum(path.stat().st_size for path in files))
+
+    with metrics.stage("validate"):
+        stats, passing_stats, failed = row_rule_masks(table, rules)
+        # Violations ligne à ligne : rapportées, mais ce sont les lignes qui échouent
+        violations = evaluate_rules(stats, {name: rules[name] for name in ROW_RULES if name in rules})
+        errors = evaluate_rules(passing_stats, {k: v for k, v in rules.items() if k not in ROW_RULES})
+        quarantined = np.zeros(table.num_rows, dtype=bool)
+        for mask in failed.values():
+            quarantined |= mask
+        count = int(quarantined.sum())
+        pct = count / table.num_rows * 100 if table.num_rows else 0.0
+        if pct > max_quarantine_pct:
+            errors.append(
+                f"Quarantined {count} of {table.num_rows} rows ({pct:.2f}%, "
+                f"max allowed: {max_quarantine_pct}%)"
+            )
+    metrics.add("validate", records=table.num_rows)
+
+    root = Path(quarantine_root) if quarantine_root else None
+    passing_path, quarantine_path = quarantine_paths(quarantine_dir, files, root)
+    with metrics.stage("quarantine"):
+        written = write_parquet(table.filter(pa.array(~quarantined)), passing_path)
+        if count:
+            # Règles en échec de chaque ligne : liste construite depuis la matrice lignes x règles
+            labels = pa.array(list(failed))
+            matrix = np.column_stack(list(failed.values()))[quarantined]
+            _, rule_index = np.nonzero(matrix)
+            offsets = np.concatenate(([0], np.cumsum(matrix.sum(axis=1)))).astype(np.int32)
+            rows = table.filter(pa.array(quarantined))
+            if FAILED_RULES_COLUMN in rows.column_names:
+                rows = rows.drop_columns([FAILED_RULES_COLUMN])
+            rows = rows.append_column(
+                FAILED_RULES_COLUMN,
+                pa.ListArray.from_arrays(pa.array(offsets), labels.take(rule_index)),
+            )
+            written += write_parquet(rows, quarantine_path)
+        else:
+            quarantine_path.unlink(missing_ok=True)
+    metrics.add("quarantine", records=count, bytes=written)
+
+    if count:
+        logger.warning(
+            "Quarantined %d of %d rows",
+            count,
+            table.num_rows,
+            extra={"quarantine_file": str(quarantine_path)},
+        )
+    report = {
+        "rows": count,
+        "passing_rows": table.num_rows - count,
+        "percentage": round(pct, 3),
+        "max_percentage": max_quarantine_pct,
+        "rules": {label: int(mask.sum()) for label, mask in failed.items() if mask.any()},
+        "violations": violations,
+        "passing_file": str(passing_path),
+        "quarantine_file": str(quarantine_path) if count else None,
+    }
+    return stats, errors, report
+
+
+# =============================================================================
+# Datasets partitionnés
+# =============================================================================
+
+PARTITION_PREFIX = "partition_date="
+DEFAULT_WORKERS = 4
+
+
+def is_visible(path: Path, root: Path | None = None) -> bool:
+    """Fichier de données visible (ni fichier ni dossier caché/temporaire)."""
+    parts = path.relative_to(root).parts if root else (path.parent.name, path.name)
+    return not any(part.startswith((".", "_")) for part in parts)
+
+
+def discover_files(inputs: list[str]) -> list[Path]:
+    """
+    Fichiers Parquet désignés par des chemins de fichiers, des racines de
+    dataset (parcourues récursivement) ou des globs.
+    """
+    files: set[Path] = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            files.update(
+                candidate
+                for candidate in path.rglob("*.parquet")
+                if candidate.is_file() and is_visible(candidate, path)
+            )
+        elif path.is_file():
+            files.add(path)
+        else:
+            files.update(
+                Path(match)
+                for match in glob.glob(item, recursive=True)
+                if Path(match).is_file() and is_visible(Path(match))
+            )
+    return sorted(files)
+
+
+def partition_of(path: Path) -> Path:
+    """Dossier de la partition Hive d'un fichier (à défaut, son dossier)."""
+    return next(
+        (parent for parent in path.parents if parent.name.startswith(PARTITION_PREFIX)),
+        path.parent,
+    )
+
+
+def group_partitions(files: list[Path]) -> dict[str, list[Path]]:
+    """
+    Regroupe les fichiers par partition Hive (`partition_date=...`).
+
+    Un fichier hors d'une partition forme sa propre partition avec les
+    fichiers de son dossier.
+    """
+    partitions: dict[str, list[Path]] = {}
+    for path in files:
+        partitions.setdefault(str(partition_of(path)), []).append(path)
+    return dict(sorted(partitions.items()))
+
+
+def check_files(
+    files: list[Path],
+    rules: dict[str, Any],
+    metrics: PipelineMetrics,
+    use_footer: bool = True,
+    batch_size: int | None = None,
+    memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+    strict: bool = False,
+    engine: str = DEFAULT_ENGINE,
+    quarantine_dir: str | None = None,
+    max_quarantine_pct: float = DEFAULT_MAX_QUARANTINE_PCT,
+    quarantine_root: str | None = None,
+) -> tuple[dict[str, Any], list[str], list[str]]:
+    """
+    Valide un fichier, ou les fichiers d'une partition comme une seule table.
+
+    Avec `quarantine_dir`, les lignes en échec sont séparées des autres
+    (voir `quarantine_files`, sorties relatives à `quarantine_root`) et le
+    rapport est dans `stats['quarantine']`.
+
+    Returns:
+        (statistiques collectées, erreurs, règles évaluées)
+    """
+    if quarantine_dir is not None:
+        stats, errors, report = quarantine_files(
+            files, rules, metrics, quarantine_dir, max_quarantine_pct, quarantine_root
+        )
+        return {**stats, "quarantine": report}, errors, [name for name, _, _ in RULE_CHECKS if name in rules]
+
+    columns_read: list[str] = []
+
+    def collect(plan: dict[str, dict[str, Any]]) -> dict[str, Any]:
+        # Footer d'abord, puis seules les colonnes non résolues sont lues
+        with metrics.stage("read"):
+            stats, read, bytes_read = collect_parquet_stats(
+                files, plan, use_footer, batch_size, memory_budget_mb, engine
+            )
+        metrics.add("read", bytes=bytes_read)
+        columns_read.extend(col for col in read if col not in columns_read)
+        return stats
+
+    if strict:
+        stats, errors, evaluated = evaluate_strict(collect, rules)
+    else:
+        stats = collect(compile_plan(rules))
+        with metrics.stage("validate"):
+            errors = evaluate_rules(stats, rules)
+        evaluated = [name for name, _, _ in RULE_CHECKS if name in rules]
+    metrics.add("read", records=stats["rows"])
+    metrics.add("validate", records=stats["rows"])
+
+    logger.info(
+        "Read %d of %d columns",
+        len(columns_read),
+        len(stats["columns"]),
+        extra={"columns_read": columns_read, "files": len(files)},
+    )
+    return stats, errors, evaluated
+
+
+def validate_partition(
+    options: dict[str, Any],
+    partition: str,
+    files: list[Path],
+    sidecars: bool = False,
+) -> dict[str, Any]:
+    """
+    Valide une partition (exécuté dans un worker du pool).
+
+    Args:
+        options: Arguments nommés de `check_files` (dont 'rules')
+        partition: Dossier de la partition
+        files: Fichiers Parquet de la partition
+        sidecars: Écrire le sidecar de profil des fichiers qui n'en ont pas
+            de à jour
+
+    Returns:
+        Dict avec 'partition', 'files', 'rows', 'validation', 'errors',
+        'error_count', 'metrics' (ou 'status' et 'error' en cas d'échec)
+    """
+    metrics = PipelineMetrics()
+    written = 0
+    try:
+        stats, errors, evaluated = check_files(files, metrics=metrics, **options)
+        if sidecars:
+            with metrics.stage("profile"):
+                batch_size = options.get("batch_size") or DEFAULT_BATCH_SIZE
+                engine = options.get("engine", DEFAULT_ENGINE)
+                for path in files:
+                    *_, reused = profile_file(path, batch_size, write=True, engine=engine)
+                    written += not reused
+    except Exception as e:
+        logger.exception("Validation failed for partition %s", partition)
+        return {
+            "partition": partition,
+            "files": [str(path) for path in files],
+            "status": "error",
+            "error": str(e),
+        }
+
+    if errors:
+        logger.warning("Partition %s failed with %d errors", partition, len(errors))
+    result = {
+        "partition": partition,
+        "files": [str(path) for path in files],
+        "rows": stats["rows"],
+        "columns": stats["columns"],
+        "validation": "passed" if not errors else "failed",
+        "errors": errors,
+        "error_count": len(errors),
+        "metrics": metrics.snapshot(),
+    }
+    if options.get("strict"):
+        result["rules_evaluated"] = evaluated
+    if "quarantine" in stats:
+        result["quarantine"] = stats["quarantine"]
+    if sidecars:
+        result["sidecars"] = {"written": written, "reused": len(files) - written}
+    return result
+
+
+def is_failure(result: dict[str, Any]) -> bool:
+    """Partition en échec (règles non respectées ou erreur d'exécution)."""
+    return result.get("validation") == "failed" or result.get("status") == "error"
+
+
+def skipped_partition(partition: str, files: list[Path]) -> dict[str, Any]:
+    """Partition non validée (mode strict, après un premier échec)."""
+    return {"partition": partition, "files": [str(path) for path in files], "status": "skipped"}
+
+
+def validate_dataset(
+    options: dict[str, Any],
+    partitions: dict[str, list[Path]],
+    workers: int = DEFAULT_WORKERS,
+    fail_fast: bool = False,
+    sidecars: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Valide chaque partition du dataset.
+
+    Avec workers > 1, les partitions sont réparties sur un pool de
+    processus ; les résultats sont renvoyés dans l'ordre des partitions.
+    Avec `fail_fast`, les partitions pas encore commencées après un premier
+    échec ne sont pas validées (statut 'skipped'). Avec `sidecars`, chaque
+    partition écrit aussi les sidecars de profil de ses fichiers.
+    """
+    results: list[dict[str, Any]] = []
+    if workers <= 1 or len(partitions) <= 1:
+        for name, files in partitions.items():
+            if fail_fast and any(is_failure(r) for r in results):
+                results.append(skipped_partition(name, files))
+            else:
+                results.append(validate_partition(options, name, files, sidecars))
+        return results
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(partitions))) as executor:
+        futures = {
+            name: executor.submit(validate_partition, options, name, files, sidecars)
+            for name, files in partitions.items()
+        }
+        for name, future in futures.items():
+            if future.cancelled():
+                results.append(skipped_partition(name, partitions[name]))
+                continue
+            results.append(future.result())
+            if fail_fast and is_failure(results[-1]):
+                for pending in futures.values():
+                    pending.cancel()
+        return results
+
+
+# =============================================================================
+# Cache des résultats de validation
+# =============================================================================
+
+# Les reruns (retries Airflow, relances de DAG) revalident des fichiers
+# inchangés : le résultat JSON et le code de sortie sont mis en cache sous
+# une clé qui couvre tout ce dont ils dépendent (fichiers, règles, options,
+# version du code et des bibliothèques).
+
+DEFAULT_CACHE_DIR = "./.validation_cache"
+DEFAULT_CACHE_MAX_MB = 64
+CACHE_KEY_MODES = ("mtime", "content")
+
+# Options sans effet sur le résultat, exclues de la clé (les règles y
+# entrent par leur contenu, pas par le chemin du fichier)
+CACHE_IGNORED_ARGS = frozenset(
+    {
+        "rules_file",
+        "workers",
+        "memory_budget_mb",
+        "no_footer_stats",
+        "metrics_file",
+        "no_cache",
+        "cache_dir",
+        "cache_max_mb",
+        "cache_key",
+    }
+)
+
+
+def tool_version() -> str:
+    """
+    Version du validateur : empreinte du code (ce module et `sketches.py`)
+    et versions de pandas/pyarrow, qui fixent dtypes et messages.
+    """
+    digest = hashlib.sha256()
+    for module_file in (__file__, sys.modules[ColumnSketch.__module__].__file__):
+        digest.update(Path(module_file).read_bytes())
+    return f"{digest.hexdigest()[:12]}-pandas{pd.__version__}-pyarrow{pa.__version__}"
+
+
+def cache_key(
+    args: argparse.Namespace,
+    rules: dict[str, Any],
+    files: list[Path],
+    mode: str = "mtime",
+) -> str:
+    """
+    Clé de cache d'un run : chemins, taille et date de modification (ou
+    contenu, `mode='content'`) des fichiers, règles normalisées, options
+    de la CLI et version du validateur.
+    """
+    if mode == "content":
+        fingerprints = []
+        for path in files:
+            with open(path, "rb") as f:
+                fingerprints.append(hashlib.file_digest(f, "sha256").hexdigest())
+    else:
+        fingerprints = [file_fingerprint(path) for path in files]
+    key = {
+        "files": [[str(path.resolve()), fp] for path, fp in zip(files, fingerprints)],
+        "rules": json.dumps(rules, sort_keys=True),
+        "options": {k: v for k, v in sorted(vars(args).items()) if k not in CACHE_IGNORED_ARGS},
+        "version": tool_version(),
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def outputs_present(args: argparse.Namespace, files: list[Path], result: dict[str, Any]) -> bool:
+    """Fichiers écrits par le run en cache (sidecars, quarantaine) encore présents."""
+    if args.sidecar and any(read_sidecar(path) is None for path in files):
+        return False
+    reports = [result.get("quarantine")] + [p.get("quarantine") for p in result.get("partitions", [])]
+    outputs = [
+        output
+        for report in reports
+        if report
+        for output in (report["passing_file"], report["quarantine_file"])
+        if output
+    ]
+    return all(Path(output).is_file() for output in outputs)
+
+
+class ValidationCache:
+    """
+    Cache disque des résultats de validation.
+
+    Une entrée `<clé>.json` par run (résultat et code de sortie). La date
+    de modification du fichier sert d'horodatage de dernier accès pour
+    l'éviction LRU. Écritures atomiques (fichier temporaire + rename) :
+    plusieurs runs peuvent partager le même répertoire.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def lookup(self, key: str) -> tuple[dict[str, Any], int] | None:
+        """Résultat et code de sortie en cache, ou None si absent."""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text())
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry["result"], entry["exit_code"]
+
+    def store(self, key: str, result: dict[str, Any], exit_code: int) -> None:
+        """Enregistre le résultat d'un run."""
+        path = self._path(key)
+        entry = {"stored_at": time.time(), "exit_code": exit_code, "result": result}
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(json.dumps(entry))
+        os.replace(tmp_path, path)
+
+    def evict(self) -> int:
+        """
+        Supprime les entrées les moins récemment utilisées jusqu'à repasser
+        sous `max_bytes`.
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+
 # =============================================================================
 # CLI
 # =============================================================================
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse les arguments CLI."""
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse les arguments CLI (`argv` par défaut : sys.argv[1:])."""
     parser = argparse.ArgumentParser(
+        prog=Path(__file__).name,
         description="Validation des données ingérées",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
@@ -284,6 +1951,14 @@ Exemples:
   python validate_data.py --input-file data.parquet
   python validate_data.py --input-file data.parquet --rules-file rules.json
   python validate_data.py --input-file data.parquet --profile
+  python validate_data.py --input-file big.parquet --profile --profile-mode approx
+  python validate_data.py --input-file big.parquet --chunked --memory-budget-mb 128
+  python validate_data.py --input-file data/bronze --sidecar
+  python validate_data.py --input-file data.parquet --no-cache
+  python validate_data.py --input-file data.parquet --profile --engine arrow
+  python validate_data.py --input-file data/bronze --workers 8
+  python validate_data.py --input-file data/bronze --quarantine-dir data/split --max-quarantine-pct 1
+  python validate_data.py --input-file 'data/bronze/partition_date=2024-01-*/*.parquet'
 
 Fichier de règles (JSON):
   {
@@ -300,7 +1975,11 @@ Fichier de règles (JSON):
     parser.add_argument(
         "--input-file",
         required=True,
-        help="Fichier Parquet à valider",
+        nargs="+",
+        help=(
+            "Fichier Parquet à valider, ou plusieurs fichiers, globs ou racines "
+            "de dataset (validés partition par partition)"
+        ),
     )
     parser.add_argument(
         "--rules-file",
@@ -311,84 +1990,317 @@ Fichier de règles (JSON):
         action="store_true",
         help="Inclure un profil des données dans le résultat",
     )
+    parser.add_argument(
+        "--profile-mode",
+        choices=["exact", "approx"],
+        default="exact",
+        help=(
+            "exact = describe() sur le fichier chargé ; approx = sketches en une "
+            "passe par lots, avec bornes d'erreur (default: exact)"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Partitions validées en parallèle pour un dataset (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help="Lecture par lots à mémoire bornée (fichiers plus gros que la mémoire)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Lignes par lot avec --chunked (default: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=float,
+        default=DEFAULT_MEMORY_BUDGET_MB,
+        help=(
+            "Mémoire des contrôles d'unicité avec --chunked, au-delà les valeurs "
+            f"sont écrites sur disque (default: {DEFAULT_MEMORY_BUDGET_MB})"
+        ),
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default=DEFAULT_ENGINE,
+        help=(
+            "Moteur de calcul : pandas, ou arrow (règles et profil calculés sur "
+            f"les tableaux Arrow, sans conversion en DataFrame) (default: {DEFAULT_ENGINE})"
+        ),
+    )
+    parser.add_argument(
+        "--no-footer-stats",
+        action="store_true",
+        help="Ignore les statistiques du footer Parquet (lit toutes les colonnes des règles)",
+    )
+    parser.add_argument(
+        "--sidecar",
+        action="store_true",
+        help=(
+            "Écrit à côté de chaque fichier un sidecar de profil (sketches "
+            "fusionnables par merge_profiles.py), réutilisé tant que le fichier "
+            "ne change pas"
+        ),
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Écrit les métriques du run au format Prometheus (textfile collector)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Revalide même si le résultat est en cache (et ne le met pas en cache)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.environ.get("VALIDATION_CACHE_DIR", DEFAULT_CACHE_DIR),
+        help=f"Répertoire du cache des résultats (default: $VALIDATION_CACHE_DIR ou {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_CACHE_MAX_MB,
+        help=f"Taille maximale du cache en Mo, éviction LRU (default: {DEFAULT_CACHE_MAX_MB})",
+    )
+    parser.add_argument(
+        "--cache-key",
+        choices=CACHE_KEY_MODES,
+        default="mtime",
+        help=(
+            "Empreinte des fichiers dans la clé de cache : mtime = taille et date "
+            "de modification, content = hash du contenu (default: mtime)"
+        ),
+    )
     parser.add_argument(
         "--strict",
         action="store_true",
-        help="Mode strict: échoue dès la première erreur",
+        help=(
+            "Mode strict: règles évaluées de la moins coûteuse à la plus coûteuse, "
+            "arrêt à la première erreur (rapport partiel)"
+        ),
+    )
+    parser.add_argument(
+        "--quarantine-dir",
+        help=(
+            "Écrit les lignes en échec (not_null, unique, value_ranges) dans "
+            "<dir>/quarantine/<partition>/ avec la colonne _failed_rules, et les "
+            "autres dans <dir>/passing/<partition>/, dans la lecture de la validation"
+        ),
+    )
+    parser.add_argument(
+        "--max-quarantine-pct",
+        type=float,
+        default=DEFAULT_MAX_QUARANTINE_PCT,
+        help=(
+            "Part maximale de lignes en quarantaine (en %%) pour que la partition "
+            f"reste valide, avec --quarantine-dir (default: {DEFAULT_MAX_QUARANTINE_PCT})"
+        ),
     )
 
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.batch_size < 1 or args.memory_budget_mb <= 0 or args.workers < 1 or args.cache_max_mb <= 0:
+        parser.error("--batch-size, --memory-budget-mb, --workers and --cache-max-mb must be positive")
+    if args.chunked and args.profile and args.profile_mode == "exact":
+        parser.error("--profile-mode exact reads the whole file and cannot be combined with --chunked")
+    if not 0 <= args.max_quarantine_pct <= 100:
+        parser.error("--max-quarantine-pct must be between 0 and 100")
+    if args.quarantine_dir and (
+        args.chunked or args.strict or (args.profile and args.profile_mode == "exact")
+    ):
+        parser.error(
+            "--quarantine-dir reads each partition once, whole, with every rule: "
+            "it cannot be combined with --chunked, --strict or --profile-mode exact"
+        )
+    return args
 
 
-def main() -> None:
-    """Point d'entrée principal."""
-    args = parse_args()
+def run(argv: list[str] | None = None) -> tuple[dict[str, Any], int]:
+    """
+    Exécute une validation avec les arguments de la CLI.
 
-    # Vérifier que le fichier existe
-    input_path = Path(args.input_file)
-    if not input_path.exists():
-        logger.error(f"File not found: {input_path}")
+    Utilisé par `main` et par le service de workers (`worker_service.py`),
+    qui garde les modules chargés entre les jobs. Sauf `--no-cache`, un run
+    identique sur des fichiers inchangés est servi depuis le cache.
+
+    Returns:
+        (résultat JSON, code de sortie 0/1/2)
+    """
+    args = parse_args(argv)
+    metrics = PipelineMetrics()
+
+    # Un seul fichier : rapport par fichier ; sinon dataset partitionné
+    single_file = len(args.input_file) == 1 and Path(args.input_file[0]).is_file()
+    input_path = Path(args.input_file[0])
+    files = [input_path] if single_file else discover_files(args.input_file)
+    if not files:
+        logger.error("File not found: %s", " ".join(args.input_file))
         result = {
             "status": "error",
-            "error": f"File not found: {input_path}",
-            "file": str(input_path),
+            "error": f"File not found: {' '.join(args.input_file)}",
+            "file": " ".join(args.input_file),
         }
-        print(json.dumps(result, indent=2))
-        sys.exit(2)
+        return result, 2
+    if args.profile and not single_file:
+        return {"status": "error", "error": "--profile requires a single input file"}, 2
 
     # Charger les règles
     if args.rules_file:
         try:
             with open(args.rules_file) as f:
                 rules = json.load(f)
-            logger.info(f"Loaded rules from {args.rules_file}")
+            logger.info("Loaded rules from %s", args.rules_file)
         except Exception as e:
-            logger.error(f"Failed to load rules: {e}")
+            logger.error("Failed to load rules: %s", e)
             result = {
                 "status": "error",
                 "error": f"Failed to load rules file: {e}",
             }
-            print(json.dumps(result, indent=2))
-            sys.exit(2)
+            return result, 2
     else:
         rules = DEFAULT_RULES
         logger.info("Using default validation rules")
 
-    try:
-        # Lire le fichier
-        logger.info(f"Reading file: {input_path}")
-        df = pd.read_parquet(input_path)
-        logger.info(f"Loaded {len(df)} rows, {len(df.columns)} columns")
+    options = {
+        "rules": rules,
+        "use_footer": not args.no_footer_stats,
+        "batch_size": args.batch_size if args.chunked else None,
+        "memory_budget_mb": args.memory_budget_mb,
+        "strict": args.strict,
+        "engine": args.engine,
+        "quarantine_dir": args.quarantine_dir,
+        "max_quarantine_pct": args.max_quarantine_pct,
+        "quarantine_root": None,
+    }
 
-        # Valider
-        errors = validate(df, rules)
+    # Une sortie de quarantaine par partition : deux partitions ne doivent
+    # jamais écrire le même fichier
+    if args.quarantine_dir:
+        root = input_root(files)
+        options["quarantine_root"] = str(root)
+        groups = [[input_path]] if single_file else list(group_partitions(files).values())
+        outputs = [quarantine_paths(args.quarantine_dir, group, root)[0] for group in groups]
+        collisions = sorted({str(path) for path in outputs if outputs.count(path) > 1})
+        if collisions:
+            return {"status": "error", "error": f"Quarantine outputs collide: {collisions}"}, 2
+
+    # Fichiers inchangés, mêmes règles et options : résultat du run précédent
+    cache = None
+    if not args.no_cache:
+        cache = ValidationCache(args.cache_dir, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+        key = cache_key(args, rules, files, args.cache_key)
+        cached = cache.lookup(key)
+        # Sidecars et fichiers de quarantaine font partie du résultat : ils doivent être encore là
+        if cached is not None and outputs_present(args, files, cached[0]):
+            result, exit_code = cached
+            logger.info("Validation result served from cache", extra={"cache_key": key})
+            result["cache"] = {"hit": True, "key": key}
+            result["metrics"] = metrics.snapshot()
+            if args.metrics_file:
+                write_prometheus(args.metrics_file, "validate_data", result["metrics"], success=exit_code == 0)
+            return result, exit_code
+
+    if single_file:
+        result, exit_code = run_file(args, options, input_path, metrics)
+    else:
+        result, exit_code = run_dataset(args, options, files)
+
+    # Les erreurs d'exécution (code 2) ne sont pas mises en cache
+    if cache is not None and exit_code != 2:
+        cache.store(key, result, exit_code)
+        result["cache"] = {"hit": False, "key": key, "evicted": cache.evict()}
+    return result, exit_code
+
+
+def run_file(
+    args: argparse.Namespace,
+    options: dict[str, Any],
+    input_path: Path,
+    metrics: PipelineMetrics,
+) -> tuple[dict[str, Any], int]:
+    """
+    Valide un seul fichier (et calcule son profil si demandé).
+
+    Returns:
+        (résultat JSON, code de sortie 0/1/2)
+    """
+    rules = options["rules"]
+    try:
+        df = None
+        if args.profile and args.profile_mode == "exact":
+            # Le profil exact porte sur toutes les colonnes : lecture complète
+            logger.info("Reading file: %s", input_path)
+            with metrics.stage("read"):
+                if args.engine == "arrow":
+                    df = pq.read_table(input_path)
+                else:
+                    df = pd.read_parquet(input_path)
+            metrics.add("read", records=len(df), bytes=input_path.stat().st_size)
+            with metrics.stage("validate"):
+                if args.strict:
+                    stats, errors, evaluated = evaluate_strict(
+                        lambda plan: collect_stats(df, plan), rules
+                    )
+                else:
+                    stats = collect_stats(df, compile_plan(rules))
+                    errors = evaluate_rules(stats, rules)
+            metrics.add("validate", records=stats["rows"])
+        else:
+            stats, errors, evaluated = check_files([input_path], metrics=metrics, **options)
+        logger.info("Loaded %d rows, %d columns", stats["rows"], len(stats["columns"]))
 
         # Construire le résultat
         result: dict[str, Any] = {
             "file": str(input_path),
-            "rows": len(df),
-            "columns": list(df.columns),
+            "rows": stats["rows"],
+            "columns": stats["columns"],
             "validation": "passed" if not errors else "failed",
             "errors": errors,
             "error_count": len(errors),
             "validated_at": datetime.utcnow().isoformat(),
             "rules_applied": list(rules.keys()),
         }
-
-        # Ajouter le profil si demandé
-        if args.profile:
-            result["profile"] = get_data_profile(df)
-
-        # Afficher le résultat
-        print(json.dumps(result, indent=2))
+        if args.strict:
+            # Rapport partiel : règles évaluées jusqu'au premier échec
+            result["strict"] = True
+            result["rules_evaluated"] = evaluated
+        if "quarantine" in stats:
+            result["quarantine"] = stats["quarantine"]
+
+        # Ajouter le profil si demandé, écrire le sidecar
+        if args.profile or args.sidecar:
+            with metrics.stage("profile"):
+                if args.profile and df is not None:
+                    if args.engine == "arrow":
+                        result["profile"] = get_arrow_profile(df)
+                    else:
+                        result["profile"] = get_data_profile(df)
+                if args.sidecar or df is None:
+                    row_count, dtypes, sketches, reused = profile_file(
+                        input_path, args.batch_size, write=args.sidecar, engine=args.engine
+                    )
+                    if args.profile and df is None:
+                        result["profile"] = sketch_profile(row_count, dtypes, sketches)
+                    if args.sidecar:
+                        result["sidecar"] = {"path": str(sidecar_path(input_path)), "reused": reused}
+            metrics.add("profile", records=stats["rows"])
+
+        result["metrics"] = metrics.snapshot()
+        if args.metrics_file:
+            write_prometheus(args.metrics_file, "validate_data", result["metrics"], success=not errors)
 
         # Code de sortie
         if errors:
-            logger.warning(f"Validation failed with {len(errors)} errors")
-            sys.exit(1)
+            logger.warning("Validation failed with %d errors", len(errors))
+            return result, 1
         else:
             logger.info("Validation passed")
-            sys.exit(0)
+            return result, 0
 
     except Exception as e:
         logger.exception("Validation failed with exception")
@@ -397,8 +2309,83 @@ def main() -> None:
             "error": str(e),
             "file": str(input_path),
         }
-        print(json.dumps(result, indent=2))
-        sys.exit(2)
+        return result, 2
+
+
+def run_dataset(
+    args: argparse.Namespace,
+    options: dict[str, Any],
+    files: list[Path],
+) -> tuple[dict[str, Any], int]:
+    """
+    Valide un dataset partition par partition et agrège les résultats.
+
+    Returns:
+        (rapport agrégé, code de sortie : 2 si une partition n'a pas pu
+        être validée, 1 si une partition a échoué, 0 sinon)
+    """
+    started = time.perf_counter()
+    partitions = group_partitions(files)
+    logger.info(
+        "Validating %d partitions (%d files)",
+        len(partitions),
+        len(files),
+        extra={"workers": args.workers},
+    )
+
+    results = validate_dataset(
+        options, partitions, args.workers, fail_fast=args.strict, sidecars=args.sidecar
+    )
+    crashed = [p["partition"] for p in results if p.get("status") == "error"]
+    failed = [p["partition"] for p in results if p.get("validation") == "failed"]
+    skipped = [p["partition"] for p in results if p.get("status") == "skipped"]
+
+    result: dict[str, Any] = {
+        "input": args.input_file,
+        "partitions_count": len(results),
+        "files_count": len(files),
+        "rows": sum(p.get("rows", 0) for p in results),
+        "validation": "passed" if not failed and not crashed else "failed",
+        "failed_partitions": failed + crashed,
+        "error_count": sum(p.get("error_count", 0) for p in results),
+        "partitions": results,
+        "validated_at": datetime.utcnow().isoformat(),
+        "rules_applied": list(options["rules"].keys()),
+    }
+    if args.strict:
+        result["strict"] = True
+        result["skipped_partitions"] = skipped
+    if args.quarantine_dir:
+        result["quarantined_rows"] = sum(p["quarantine"]["rows"] for p in results if "quarantine" in p)
+
+    # Étapes cumulées sur les partitions ; durée et pic mémoire du run
+    metrics = merge_metrics([p["metrics"] for p in results if "metrics" in p])
+    metrics["wall_seconds"] = round(time.perf_counter() - started, 3)
+    metrics["peak_rss_mb"] = max(peak_rss_mb(), peak_rss_mb(children=True))
+    result["metrics"] = metrics
+    if args.metrics_file:
+        write_prometheus(
+            args.metrics_file, "validate_data", metrics, success=not failed and not crashed
+        )
+
+    if crashed or failed:
+        logger.warning(
+            "Validation failed for %d of %d partitions",
+            len(failed) + len(crashed),
+            len(results),
+        )
+        return result, 2 if crashed else 1
+    logger.info("Validation passed for %d partitions", len(results))
+    return result, 0
+
+
+def main() -> None:
+    """Point d'entrée principal."""
+    result, exit_code = run()
+
+    # Afficher le résultat
+    print(json.dumps(result, indent=2))
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
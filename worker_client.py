@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Client léger du service de workers (`worker_service.py`).
+
+N'importe que la bibliothèque standard : il démarre en quelques
+millisecondes. Les arguments après le nom du job sont ceux de la CLI
+correspondante ; le client imprime le même JSON et sort avec le même code
+que `ingest_api.py` / `validate_data.py`. Le job s'exécute dans le
+répertoire courant du client : les chemins relatifs désignent les mêmes
+fichiers qu'en CLI.
+
+Usage:
+    python worker_client.py ingest --date 2024-01-01 --state-file state.json
+    python worker_client.py validate --input-file data.parquet --profile
+    python worker_client.py --fallback-local ingest --date 2024-01-01
+
+Exit codes:
+    Ceux du job, ou 2 si le service est injoignable (sans --fallback-local)
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+DEFAULT_URL = "http://127.0.0.1:8787"
+DEFAULT_TIMEOUT = 3600
+
+# Job -> script exécuté en repli local
+SCRIPTS = {
+    "ingest": "ingest_api.py",
+    "validate": "validate_data.py",
+}
+
+
+def submit(url: str, job: str, argv: list[str], timeout: float, token: str | None) -> tuple[str, int]:
+    """Envoie le job au service ; retourne (corps JSON, code de sortie)."""
+    request = urllib.request.Request(
+        f"{url.rstrip('/')}/jobs/{job}",
+        data=json.dumps({"args": argv, "cwd": os.getcwd()}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    if token:
+        request.add_header("X-Worker-Token", token)
+
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.read().decode(), int(response.headers.get("X-Exit-Code", 0))
+    except urllib.error.HTTPError as e:
+        # Erreur du service (saturé, requête invalide) : corps JSON, code 2
+        return e.read().decode(), 2
+
+
+def run_local(job: str, argv: list[str]) -> int:
+    """Repli : exécute la CLI dans un nouvel interpréteur (démarrage à froid)."""
+    script = Path(__file__).resolve().parent / SCRIPTS[job]
+    return subprocess.run([sys.executable, str(script), *argv]).returncode
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse les arguments CLI."""
+    parser = argparse.ArgumentParser(
+        description="Client du service de workers (ingestion, validation)",
+    )
+    parser.add_argument(
+        "--url",
+        default=os.environ.get("WORKER_URL", DEFAULT_URL),
+        help=f"URL du service (default: $WORKER_URL ou {DEFAULT_URL})",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Durée maximale d'un job en secondes (default: {DEFAULT_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--fallback-local",
+        action="store_true",
+        help="Exécute la CLI localement si le service est injoignable",
+    )
+    parser.add_argument("job", choices=sorted(SCRIPTS), help="Job à exécuter")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments de la CLI du job")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Point d'entrée principal."""
+    args = parse_args()
+    token = os.environ.get("WORKER_TOKEN")
+
+    try:
+        body, exit_code = submit(args.url, args.job, args.args, args.timeout, token)
+    except (urllib.error.URLError, ConnectionError) as e:
+        if args.fallback_local:
+            print(f"Worker service unreachable ({e}), running locally", file=sys.stderr)
+            sys.exit(run_local(args.job, args.args))
+        print(json.dumps({"status": "error", "error": f"Worker service unreachable: {e}"}))
+        sys.exit(2)
+
+    print(body)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
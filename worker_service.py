@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Service de workers chauds pour l'ingestion et la validation.
+
+Chaque tâche Airflow (BashOperator) ou déclenchement n8n lance un nouvel
+interpréteur qui réimporte pandas, pyarrow, requests et tenacity avant de
+travailler : pour une petite partition journalière, ce démarrage à froid
+domine la durée de la tâche. Ce service garde `ingest_api` et
+`validate_data` chargés et exécute les jobs sur un pool borné de
+processus (forkés depuis le service, donc déjà chauds).
+
+API HTTP (localhost par défaut) :
+    POST /jobs/ingest    {"args": ["--date", "2024-01-01", ...], "cwd": "/opt/pipeline"}
+    POST /jobs/validate  {"args": ["--input-file", "data.parquet"], "cwd": "/opt/pipeline"}
+    GET  /health
+
+`cwd` (chemin absolu, obligatoire) est le répertoire de travail du job :
+les chemins relatifs des arguments, et ceux par défaut (sortie, cache),
+sont résolus comme si la CLI avait été lancée depuis ce répertoire.
+
+La réponse d'un job est le JSON que la CLI aurait imprimé ; son code de
+sortie est dans l'en-tête `X-Exit-Code`. Client : `worker_client.py`.
+
+Usage:
+    python worker_service.py
+    python worker_service.py --port 8787 --workers 4 --max-queue 16
+    WORKER_TOKEN=secret python worker_service.py --host 0.0.0.0
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+# Import au démarrage du service : c'est ce coût que les jobs n'ont plus à payer
+import ingest_api
+import validate_data
+from pipeline_logging import setup_logging
+
+logger = setup_logging("worker_service")
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8787
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_QUEUE = 8
+MAX_REQUEST_BYTES = 1024 * 1024
+
+# Job -> (fonction run(argv), indentation JSON de la CLI)
+JOBS = {
+    "ingest": (ingest_api.run, None),
+    "validate": (validate_data.run, 2),
+}
+
+
+# =============================================================================
+# Exécution des jobs
+# =============================================================================
+
+
+def run_job(job: str, argv: list[str], cwd: str) -> tuple[dict[str, Any], int]:
+    """
+    Exécute un job dans un worker du pool, depuis le répertoire `cwd`.
+
+    Un worker n'exécute qu'un job à la fois : le changement de répertoire
+    ne concerne que ce job, le répertoire précédent est restauré ensuite.
+    Les erreurs d'arguments (argparse) deviennent un résultat d'erreur avec
+    le code de sortie 2, comme en CLI, au lieu de tuer le worker.
+    """
+    run, _ = JOBS[job]
+    stderr = io.StringIO()
+    previous = os.getcwd()
+    try:
+        os.chdir(cwd)
+    except OSError as e:
+        return {"status": "error", "error": f"Invalid working directory: {e}"}, 2
+    try:
+        with contextlib.redirect_stderr(stderr):
+            return run(argv)
+    except SystemExit as e:
+        message = stderr.getvalue().strip().splitlines()
+        return {"status": "error", "error": message[-1] if message else "invalid arguments"}, (
+            e.code if isinstance(e.code, int) else 2
+        )
+    finally:
+        os.chdir(previous)
+
+
+class WorkerService:
+    """Pool de processus borné : `workers` jobs en cours, `max_queue` en attente."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_queue: int = DEFAULT_MAX_QUEUE) -> None:
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self.running = 0
+        self.completed = 0
+        self.started_at = time.time()
+
+    def submit(self, job: str, argv: list[str], cwd: str) -> tuple[dict[str, Any], int] | None:
+        """Exécute un job et attend son résultat ; None si le service est saturé."""
+        if not self._slots.acquire(blocking=False):
+            return None
+        with self._lock:
+            self.running += 1
+        try:
+            return self.executor.submit(run_job, job, argv, cwd).result()
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+            self._slots.release()
+
+    def health(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "status": "ok",
+                "workers": self.workers,
+                "jobs_in_flight": self.running,
+                "jobs_completed": self.completed,
+                "uptime_seconds": round(time.time() - self.started_at, 1),
+                "pid": os.getpid(),
+            }
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+# =============================================================================
+# Serveur HTTP
+# =============================================================================
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """Routes /jobs/<job> et /health."""
+
+    protocol_version = "HTTP/1.1"
+    server: "WorkerHTTPServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s " + format, self.address_string(), *args)
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._reply(404, {"status": "error", "error": f"Unknown path: {self.path}"})
+            return
+        self._reply(200, self.server.service.health())
+
+    def do_POST(self) -> None:
+        token = self.server.token
+        if token and self.headers.get("X-Worker-Token") != token:
+            self._reply(401, {"status": "error", "error": "Invalid or missing X-Worker-Token"})
+            return
+
+        job = self.path.removeprefix("/jobs/")
+        if not self.path.startswith("/jobs/") or job not in JOBS:
+            self._reply(404, {"status": "error", "error": f"Unknown job: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length > MAX_REQUEST_BYTES:
+                raise ValueError("request body too large")
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            argv = payload.get("args", [])
+            if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+                raise ValueError("'args' must be a list of strings")
+            cwd = payload.get("cwd")
+            if not isinstance(cwd, str) or not os.path.isabs(cwd) or not os.path.isdir(cwd):
+                raise ValueError("'cwd' must be the absolute path of an existing directory")
+        except (ValueError, AttributeError) as e:
+            self._reply(400, {"status": "error", "error": f"Invalid request: {e}"})
+            return
+
+        logger.info("Job %s started", job, extra={"job_args": argv, "cwd": cwd})
+        started = time.perf_counter()
+        outcome = self.server.service.submit(job, argv, cwd)
+        if outcome is None:
+            self._reply(
+                503,
+                {"status": "error", "error": "Worker queue is full"},
+                headers={"Retry-After": "5"},
+            )
+            return
+
+        result, exit_code = outcome
+        logger.info(
+            "Job %s finished with exit code %d",
+            job,
+            exit_code,
+            extra={"duration_seconds": round(time.perf_counter() - started, 3)},
+        )
+        self._reply(200, result, indent=JOBS[job][1], headers={"X-Exit-Code": str(exit_code)})
+
+    def _reply(
+        self,
+        status: int,
+        body: dict[str, Any],
+        indent: int | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        content = json.dumps(body, indent=indent).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class WorkerHTTPServer(ThreadingHTTPServer):
+    """Serveur HTTP : un thread par requête, les jobs tournent dans le pool."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: WorkerService, token: str | None) -> None:
+        super().__init__(address, JobRequestHandler)
+        self.service = service
+        self.token = token
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse les arguments CLI."""
+    parser = argparse.ArgumentParser(
+        description="Service de workers chauds pour l'ingestion et la validation",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemples:
+  python worker_service.py
+  python worker_service.py --port 8787 --workers 4 --max-queue 16
+  curl -s -X POST localhost:8787/jobs/ingest -d '{"args": ["--date", "2024-01-01"], "cwd": "/opt/pipeline"}'
+        """,
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Adresse d'écoute (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Jobs exécutés en parallèle (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=DEFAULT_MAX_QUEUE,
+        help=f"Jobs en attente au-delà desquels le service répond 503 (default: {DEFAULT_MAX_QUEUE})",
+    )
+    parser.add_argument(
+        "--token",
+        default=os.environ.get("WORKER_TOKEN"),
+        help="Jeton exigé dans l'en-tête X-Worker-Token (default: $WORKER_TOKEN)",
+    )
+
+    args = parser.parse_args()
+    if args.workers < 1 or args.max_queue < 0:
+        parser.error("--workers must be >= 1 and --max-queue >= 0")
+    if args.host not in ("127.0.0.1", "localhost", "::1") and not args.token:
+        parser.error("a --token (or WORKER_TOKEN) is required when listening beyond localhost")
+    return args
+
+
+def main() -> None:
+    """Point d'entrée principal."""
+    args = parse_args()
+
+    service = WorkerService(args.workers, args.max_queue)
+    server = WorkerHTTPServer((args.host, args.port), service, args.token)
+    logger.info(
+        "Worker service listening on %s:%d",
+        args.host,
+        server.server_address[1],
+        extra={"workers": args.workers, "max_queue": args.max_queue},
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        logger.info("Worker service stopped")
+
+
+if __name__ == "__main__":
+    main()